@@ -1,13 +1,21 @@
 import streamlit as st
 import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
-import json
+
+from farming.charts import MAX_BARS, N_BINS, net_profit_figure
+from farming.config import FarmingParameters, load_config
+from farming.exact import exact_profit_distribution
+from farming.replay import ReplayLog
+from farming.simulation import season_outcomes, year_type_labels
+from farming.storage import SpillingHistory
+from farming.summary import SeasonSummary
+from farming.tables import season_history_window
+from farming.ui import paged_table, profile_payload, profile_section, profiling_panel, return_period_options, start_profiling
 
 st.set_page_config(
     page_title="Agricultural Insurance Simulation Game",
     page_icon="🌾",
 )
+start_profiling("The Farming Challenge")
 
 # Set up the Streamlit app
 st.title("Welcome to the Agricultural Insurance Simulation Game! 🌾")
@@ -83,51 +91,53 @@ with st.expander("**Click here to Read Instructions!**", expanded=False):
 
 # Initialize session state variables with default values if they don't exist
 # --- Default Parameters ---
-# Load configuration from JSON file
-def load_config(file_path="config.json"):
-    with open(file_path, "r") as file:
-        return json.load(file)
-
-# Load default parameters from the config file
-default_params = load_config()
+# Load default parameters from the config file (parsed once per process, cached until it changes)
+with profile_section("load_config"):
+    default_params = load_config()
 
 for key, value in default_params.items():
     if key not in st.session_state:
         st.session_state[key] = value
 
+# Parameters for this run, including derived constants such as the loan-inclusive seed cost
+params = FarmingParameters.from_mapping(st.session_state)
 
 # --- Farming Parameters ---
+# pandas and plotly are imported where first needed, so the header above reaches the browser before they load
+import pandas as pd
+
 # Load parameters into a DataFrame
-parameters_df = pd.DataFrame([
-    {
-        "Setting": "Traditional Seed Cost",
-        "Value": f"${st.session_state['traditional_seed_cost']}"
-    },
-    {
-        "Setting": "High Quality Seed Cost",
-        "Value": f"${st.session_state['high_quality_seed_cost']}"
-    },
-    {
-        "Setting": "Traditional Yield Revenue",
-        "Value": f"${st.session_state['traditional_yield_revenue']}"
-    },
-    {
-        "Setting": "High Quality Yield Revenue",
-        "Value": f"${st.session_state['high_quality_yield_revenue']}"
-    },
-    {
-        "Setting": "Insurance Payout",
-        "Value": f"${st.session_state['insurance_payout']}"
-    },
-    {
-        "Setting": "Insurance Premium",
-        "Value": f"${st.session_state['insurance_premium']}"
-    },
-    {
-        "Setting": "Loan Interest Rate (%)",
-        "Value": f"{st.session_state['loan_interest_rate']}%"
-    }
-])
+with profile_section("parameters_df"):
+    parameters_df = pd.DataFrame([
+        {
+            "Setting": "Traditional Seed Cost",
+            "Value": f"${st.session_state['traditional_seed_cost']}"
+        },
+        {
+            "Setting": "High Quality Seed Cost",
+            "Value": f"${st.session_state['high_quality_seed_cost']}"
+        },
+        {
+            "Setting": "Traditional Yield Revenue",
+            "Value": f"${st.session_state['traditional_yield_revenue']}"
+        },
+        {
+            "Setting": "High Quality Yield Revenue",
+            "Value": f"${st.session_state['high_quality_yield_revenue']}"
+        },
+        {
+            "Setting": "Insurance Payout",
+            "Value": f"${st.session_state['insurance_payout']}"
+        },
+        {
+            "Setting": "Insurance Premium",
+            "Value": f"${st.session_state['insurance_premium']}"
+        },
+        {
+            "Setting": "Loan Interest Rate (%)",
+            "Value": f"{st.session_state['loan_interest_rate']}%"
+        }
+    ])
 
 # User Instructions and Inputs
 with st.expander("**Click here to Make your Decisions!**", expanded=False):
@@ -142,9 +152,9 @@ with st.expander("**Click here to Make your Decisions!**", expanded=False):
         **Here are the current farming costs and revenues for your simulations:**  
     """)
 
-    # Convert parameters DataFrame to a markdown-styled table
-    styled_parameters = parameters_df.to_markdown(index=False, tablefmt="pretty")
-    st.markdown(f"```\n{styled_parameters}\n```")
+    # Show the parameters as a compact table
+    st.dataframe(parameters_df, hide_index=True)
+    profile_payload("parameters_df", parameters_df)
 
     # User inputs
     seed_type = st.selectbox(
@@ -187,18 +197,8 @@ with st.expander("**Click here to Make your Decisions!**", expanded=False):
 
     st.divider()
 
-    # Define return period options
-    return_period_options = [
-        ("Once in 2 years (50% chance per year)", 50),
-        ("Once in 5 years (20% chance per year)", 20),
-        ("Once in 10 years (10% chance per year)", 10),
-        ("Once in 20 years (5% chance per year)", 5),
-        ("Once in 50 years (2% chance per year)", 2),
-        ("Once in 100 years (1% chance per year)", 1)
-    ]
-
-    # Create a dictionary for easy lookup
-    return_period_dict = {label: prob for label, prob in return_period_options}
+    # Return period options, shared by every page, plus any local climate stations
+    return_period_dict = return_period_options()
 
     # Select return period
     selected_return_period = st.selectbox(
@@ -219,57 +219,48 @@ bad_year_probability = return_period_dict[selected_return_period] / 100
 normal_year_probability = 1 - bad_year_probability
 
 
-# Initialize session state to store simulation history
-if 'simulation_history' not in st.session_state:
-    st.session_state['simulation_history'] = []
+# Each session draws its weather from its own seeded generator and records every run,
+# so the whole history can be replayed from the seed
+if 'replay_log' not in st.session_state:
+    st.session_state['replay_log'] = ReplayLog()
 
-# Function to simulate a single season
-def simulate_season():
-    # Determine the type of year (Normal or Bad) based on probabilities
-    year_type = np.random.choice(
-        ["Normal", "Bad"],  # Possible outcomes
-        p=[normal_year_probability, bad_year_probability]  # Probabilities for each outcome
-    )
-
-    # Calculate costs and revenue based on the chosen seed type
-    if seed_type == "Traditional":
-        # For traditional seeds, cost is fixed, and revenue depends on the year type
-        costs = st.session_state['traditional_seed_cost']
-        revenue = st.session_state['traditional_yield_revenue'] if year_type == "Normal" else 0
-    else:
-        # For high-quality seeds, include the loan interest in the cost
-        costs = st.session_state['high_quality_seed_cost'] * (1 + st.session_state['loan_interest_rate'] / 100)
-        # Revenue depends on the year type
-        revenue = st.session_state['high_quality_yield_revenue'] if year_type == "Normal" else 0
+# Initialize session state to store simulation history (recent seasons in memory, older ones spilled to disk)
+# and the running totals behind the Farming Season Summary, rebuilding them from the log if needed
+if 'simulation_history' not in st.session_state or 'simulation_summary' not in st.session_state:
+    st.session_state['simulation_history'], st.session_state['simulation_summary'] = st.session_state['replay_log'].rebuild(SpillingHistory)
 
-    # Adjust costs and revenue if the year is "Bad" and insurance is purchased
-    if year_type == "Bad" and purchase_insurance:
-        revenue += st.session_state['insurance_payout']  # Add insurance payout to revenue
-        costs += insurance_premium  # Add insurance premium to costs
-    elif purchase_insurance:
-        costs += insurance_premium  # Add insurance premium even if the year is not "Bad"
-
-    # Calculate net profit
-    profit = revenue - costs
+# Function to simulate a batch of seasons (a single click is the N=1 case)
+def simulate_seasons_batch(n_seasons=1):
+    # Draw the type of every year (Normal or Bad) from the session's generator and
+    # calculate revenue, costs and net profit for all seasons at once
+    is_bad, revenue, costs, profit = st.session_state['replay_log'].run(
+        params, seed_type, purchase_insurance, bad_year_probability, n_seasons
+    )
 
     # Append results to simulation history
-    st.session_state['simulation_history'].append({
-        "Year Type": year_type,
-        "Revenue": round(revenue, 2),
-        "Costs": round(costs, 2),
-        "Net Profit": round(profit, 2)
-    })
+    st.session_state['simulation_history'].append(
+        year_type=is_bad.astype(np.uint8),
+        revenue=revenue,
+        costs=costs,
+        net_profit=profit
+    )
+
+    # Update the running summary with the new seasons only
+    st.session_state['simulation_summary'].update(is_bad, revenue, costs, profit)
 
     # Return the results of the simulation
-    return year_type, revenue, costs, profit
+    return is_bad, revenue, costs, profit
 
 st.info("""
-    **Run Simulation**: Click the 'Run Simulation' button to simulate the farming season and view your financial outcomes. Click it again and experience another season! 🌟
+    **Run Simulation**: Click the 'Run Simulation' button to simulate the farming season and view your financial outcomes. Click it again and experience another season! 🌟  
+    Want to see the long run? Increase **Seasons per Run** to simulate many seasons with a single click.
     """)
 
 # Function to reset simulation history
 def reset_simulation_history():
-    st.session_state['simulation_history'] = []
+    st.session_state['replay_log'] = ReplayLog()
+    st.session_state['simulation_history'] = SpillingHistory()
+    st.session_state['simulation_summary'] = SeasonSummary()
     if "simulation_result" in st.session_state:
         del st.session_state["simulation_result"]  # Clear the simulation result
     st.success("Simulation history has been reset. Start fresh and simulate again!")
@@ -282,39 +273,68 @@ with col3:
     if st.button("Reset Simulation", key="reset_button"):
         reset_simulation_history()
 
+# Number of seasons simulated per click
+with col2:
+    n_seasons = st.number_input(
+        "Seasons per Run",
+        min_value=1,
+        max_value=1_000_000,
+        value=1,
+        step=1,
+        key="seasons_per_run",
+        help="Simulate many farming seasons in one go. Each season's weather is drawn independently."
+    )
+
 # Place the "Run Simulation" button in the third column (right-aligned)
 with col1:
     if st.button("Run Simulation", key="run_button"):
-        year_type, revenue, costs, profit = simulate_season()
+        with profile_section("Simulation"):
+            is_bad, revenue, costs, profit = simulate_seasons_batch(int(n_seasons))
         st.session_state["simulation_result"] = {
-            "year_type": year_type,
-            "revenue": revenue,
-            "costs": costs,
-            "profit": profit
+            "seasons": len(is_bad),
+            "year_type": year_type_labels(is_bad[-1]).item(),
+            "revenue": revenue.sum(),
+            "costs": costs.sum(),
+            "profit": profit.sum(),
+            "profitable_seasons": int((profit >= 0).sum())
         }
 
 # Display the simulation outcome outside the columns
 if "simulation_result" in st.session_state:
     st.subheader("Simulation Outcome!")
     result = st.session_state["simulation_result"]
-    if result["profit"] < 0:
+    if result["seasons"] > 1:
+        outcome = (
+            f"You simulated {result['seasons']} seasons and made a profit in {result['profitable_seasons']} of them, "
+            f"for a total net profit of ${round(result['profit'], 2)}."
+        )
+        if result["profit"] < 0:
+            st.warning(f"Warning: {outcome} Try another strategy and see if it turns things around!")
+        else:
+            st.success(f"Success: {outcome} Run again to see if your strategy holds up!")
+    elif result["profit"] < 0:
         st.warning("Warning: You incurred a loss this season. Click 'Run Simulation' again to see if next season turns things around!")
     else:
         st.success("Success: You made a profit this season! Click 'Run Simulation' again to see how your strategy fares in the next season!")
 
 if st.session_state['simulation_history']:
-    history_df = pd.DataFrame(st.session_state['simulation_history'])
+    history = st.session_state['simulation_history']
 
     # --- Simulation Summary ---
-    total_revenue = history_df["Revenue"].sum()
-    total_costs = history_df["Costs"].sum()
-    total_net_profit = history_df["Net Profit"].sum()
+    summary = st.session_state['simulation_summary']
+    total_revenue = summary.total_revenue
+    total_costs = summary.total_costs
+    total_net_profit = summary.total_profit
 
     # --- Simulation Summary ---
     simulation_summary = pd.DataFrame([
         {"Metric": "💰 Total Revenue", "Value": f"${round(total_revenue, 2)}"},
         {"Metric": "💸 Total Costs", "Value": f"${round(total_costs, 2)}"},
-        {"Metric": "🏆 Net Profit", "Value": f"${round(total_net_profit, 2)}"}
+        {"Metric": "🏆 Net Profit", "Value": f"${round(total_net_profit, 2)}"},
+        {"Metric": "📊 Average Net Profit per Season", "Value": f"${round(summary.mean_profit, 2)}"},
+        {"Metric": "📉 Worst Season", "Value": f"${round(summary.min_profit, 2)}"},
+        {"Metric": "📈 Best Season", "Value": f"${round(summary.max_profit, 2)}"},
+        {"Metric": "🎢 Profit Standard Deviation", "Value": f"${round(summary.profit_std, 2)}"}
     ])
 
     # Style the summary as a visually engaging Markdown table
@@ -324,8 +344,66 @@ if st.session_state['simulation_history']:
     """)
 
     # Convert the summary DataFrame to a markdown-styled table
-    styled_summary = simulation_summary.to_markdown(index=False, tablefmt="pretty")
-    st.markdown(f"```\n{styled_summary}\n```")
+    with profile_section("Summary table"):
+        styled_summary = simulation_summary.to_markdown(index=False, tablefmt="pretty")
+        st.markdown(f"```\n{styled_summary}\n```")
+    profile_payload("Summary table", styled_summary)
+
+    # --- Exact Analysis ---
+    with st.expander("🧮 **Exact Analysis: What the Math Says**", expanded=False):
+        st.markdown("""
+            Every season's weather is independent, so the odds for your current strategy can be worked out exactly
+            without simulating a single season. Compare them with your simulated seasons to see how the two line up!
+        """)
+
+        exact_horizon = st.number_input(
+            "Number of seasons to analyse:",
+            min_value=1,
+            max_value=10_000_000,
+            value=100,
+            step=1,
+            key="exact_horizon"
+        )
+
+        # Net profit of the current strategy in a normal and a bad year
+        with profile_section("Exact analysis"):
+            normal_revenue, bad_revenue, strategy_cost = season_outcomes(params, seed_type, purchase_insurance)
+            normal_profit, bad_profit = normal_revenue - strategy_cost, bad_revenue - strategy_cost
+            exact_season = exact_profit_distribution(normal_profit, bad_profit, 1, bad_year_probability)
+            exact_horizon_result = exact_profit_distribution(normal_profit, bad_profit, exact_horizon, bad_year_probability)
+
+        exact_vs_simulated = pd.DataFrame([
+            {
+                "Metric": "📊 Average Net Profit per Season",
+                "Exact": f"${round(exact_season.mean, 2)}",
+                "Your Simulations": f"${round(summary.mean_profit, 2)}"
+            },
+            {
+                "Metric": "🎢 Profit Standard Deviation",
+                "Exact": f"${round(exact_season.std, 2)}",
+                "Your Simulations": f"${round(summary.profit_std, 2)}"
+            },
+            {
+                "Metric": "🌩️ Share of Bad Years",
+                "Exact": f"{bad_year_probability:.1%}",
+                "Your Simulations": f"{summary.year_type_counts['Bad'] / summary.seasons:.1%}"
+            }
+        ])
+        st.dataframe(exact_vs_simulated, hide_index=True)
+        st.caption("Your simulations may mix strategies and return periods; the exact column uses your current choices.")
+
+        st.markdown(f"**Over {exact_horizon} seasons with your current strategy:**")
+        exact_outlook = pd.DataFrame([
+            {"Metric": "🏆 Expected Net Profit", "Value": f"${round(exact_horizon_result.mean, 2)}"},
+            {"Metric": "🎢 Standard Deviation", "Value": f"${round(exact_horizon_result.std, 2)}"},
+            {"Metric": "📉 Bad Luck (5th percentile)", "Value": f"${round(exact_horizon_result.percentiles[5], 2)}"},
+            {"Metric": "⚖️ Typical Outcome (median)", "Value": f"${round(exact_horizon_result.percentiles[50], 2)}"},
+            {"Metric": "📈 Good Luck (95th percentile)", "Value": f"${round(exact_horizon_result.percentiles[95], 2)}"},
+            {"Metric": "😨 Chance of Ending With a Net Loss", "Value": f"{exact_horizon_result.prob_loss:.2%}"}
+        ])
+        st.dataframe(exact_outlook, hide_index=True)
+
+    import plotly.graph_objects as go
 
     # Define columns for the visualizations
     col1, col2 = st.columns(2)
@@ -342,16 +420,23 @@ if st.session_state['simulation_history']:
             )]
         )
         pie_fig.update_layout(title=" ", title_x=0.5, title_font=dict(size=16, family="Arial"))
-        st.plotly_chart(pie_fig)
+        with profile_section("Pie chart"):
+            st.plotly_chart(pie_fig)
+        profile_payload("Pie chart", pie_fig)
 
     # --- 2. Year Type Analysis (Bar Chart) ---
     with col2:
         st.subheader("Year Type Analysis")
-        year_counts = history_df["Year Type"].value_counts()
+        # Most frequent year type first, skipping types that never occurred
+        year_counts = sorted(
+            ((year_type, count) for year_type, count in summary.year_type_counts.items() if count),
+            key=lambda item: item[1],
+            reverse=True
+        )
         bar_fig = go.Figure(
             data=[go.Bar(
-                x=year_counts.index,
-                y=year_counts.values,
+                x=[year_type for year_type, _ in year_counts],
+                y=[count for _, count in year_counts],
                 marker=dict(color=["#FF6666", "#99CCFF"])  # Soft blue and red
             )]
         )
@@ -362,57 +447,67 @@ if st.session_state['simulation_history']:
             title_x=0.5,
             title_font=dict(size=16, family="Arial"),
         )
-        st.plotly_chart(bar_fig)
+        with profile_section("Year type chart"):
+            st.plotly_chart(bar_fig)
+        profile_payload("Year type chart", bar_fig)
 
     # --- 3. Net Profit Over Simulations (Bar Chart) ---
     st.subheader("Net Profit Over Farming Seasons")
-    colors = ['#99FF99' if x >= 0 else '#FF9999' for x in history_df["Net Profit"]]  # Green for profit, red for loss
-    net_profit_fig = go.Figure(
-        data=[go.Bar(
-            x=[f"Sim {i+1}" for i in range(len(history_df))],
-            y=history_df["Net Profit"],
-            marker=dict(color=colors),
-            text=history_df["Net Profit"],
-            textposition='auto'
-        )]
-    )
-    net_profit_fig.update_layout(
-        title=" ",
-        xaxis_title="Farming Season",
-        yaxis_title="Net Profit ($)",
-        title_x=0.5,
-        title_font=dict(size=16, family="Arial"),
-        shapes=[dict(type="line", x0=-0.5, x1=len(history_df)-0.5, y0=0, y1=0, line=dict(color="black", width=1, dash="dash"))]  # Reference line at 0
-    )
-    st.plotly_chart(net_profit_fig)
+    if len(history) > MAX_BARS:
+        st.caption(
+            f"Showing {len(history)} seasons grouped into {N_BINS} bins: the line is the average net profit "
+            "in each bin and the shaded band spans its best and worst season."
+        )
+    with profile_section("Net profit chart"):
+        net_profit_fig = net_profit_figure(history)
+        st.plotly_chart(net_profit_fig)
+    profile_payload("Net profit chart", net_profit_fig)
 
     # --- Simulation History ---
-    simulation_history = pd.DataFrame([
-        {
-            "Farming Season": f"Sim {index + 1}",
-            "Year Type": f"🌞 {row['Year Type']}" if row["Year Type"] == "Normal" else f"🌩️ {row['Year Type']}",
-            "Revenue ($)": round(row["Revenue"], 2),
-            "Costs ($)": round(row["Costs"], 2),
-            "Net Profit ($)": round(row["Net Profit"], 2),
-        }
-        for index, row in history_df.iterrows()
-    ])
-
-    # Add rank-like formatting with emojis for years
-    emoji_map = {"Normal": "🌞", "Bad": "🌩️"}  # Emojis for Year Types
-
-    # Reorder columns for better readability
-    simulation_history = simulation_history[["Farming Season", "Year Type", "Revenue ($)", "Costs ($)", "Net Profit ($)"]]
-
-    # Style the history table as a fun and visually engaging Markdown table
+    # Show the history one page at a time; only the visible rows are formatted
     st.subheader("🏆 🌟 Farming Season History 🌟")
     st.markdown("""
         **How did your strategies perform across different farming seasons?**  
     """)
 
-    # Convert the simulation history DataFrame to a markdown-styled table
-    styled_simulation_history = simulation_history.to_markdown(index=False, tablefmt="pretty")
-    st.markdown(f"```\n{styled_simulation_history}\n```")
+    with profile_section("History table"):
+        paged_table(
+            len(history),
+            lambda start, stop: season_history_window(history, start, stop),
+            key="history_page"
+        )
+
+# --- Replay ---
+with st.expander("🔁 **Save, Share and Replay Your Seasons**", expanded=False):
+    replay_log = st.session_state['replay_log']
+    st.markdown(f"""
+        Your weather comes from your own random seed, `{replay_log.seed}`. Together with the choices you made for
+        each run, it recreates every season exactly. Download your run log to share it, or load one to replay someone else's seasons.
+    """)
+
+    # The log is only serialized when the button is clicked, so reruns don't pay for the whole history
+    st.download_button(
+        "Download Run Log",
+        data=replay_log.to_json,
+        file_name="farming_run_log.json",
+        mime="application/json",
+        disabled=not replay_log.events
+    )
+
+    uploaded_log = st.file_uploader("Load a Run Log:", type="json")
+    if uploaded_log is not None and st.button("Replay Seasons", key="replay_button"):
+        try:
+            loaded_log = ReplayLog.from_json(uploaded_log.getvalue().decode("utf-8"))
+            loaded_history, loaded_summary = loaded_log.rebuild(SpillingHistory)
+        except (ValueError, KeyError, TypeError) as error:
+            st.error(f"That file is not a valid run log: {error}")
+        else:
+            st.session_state['replay_log'] = loaded_log
+            st.session_state['simulation_history'], st.session_state['simulation_summary'] = loaded_history, loaded_summary
+            st.session_state.pop("simulation_result", None)
+            st.rerun()
+
+profiling_panel()
 
 st.markdown(
     """
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for the simulation, aggregation and rendering hot paths.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
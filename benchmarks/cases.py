@@ -0,0 +1,182 @@
+"""Benchmark cases, one per hot path of the pages.
+
+Each case is a setup function taking the number of seasons and returning the
+zero-argument callable to time. Setup runs before every repeat and is not
+timed, so cases that append to a history always start from the same state.
+"""
+import numpy as np
+import pandas as pd
+
+from farming.charts import RaceChart, net_profit_figure
+from farming.config import FarmingParameters, load_config
+from farming.history import RACE_COLUMNS, SeasonHistory
+from farming.replay import ReplayLog
+from farming.simulation import PERSONAS, draw_bad_years, persona_profit_matrix
+from farming.storage import SpillingHistory
+from farming.summary import SeasonSummary
+from farming.tables import PAGE_SIZE, page_bounds, page_count, season_history_window
+
+BAD_YEAR_PROBABILITY = 0.1
+SEED = 20250101
+SEED_TYPE = "High Quality"
+INSURANCE = True
+
+
+def _params():
+    return FarmingParameters.from_mapping(load_config())
+
+
+def _season_history(n_seasons, history=None):
+    # Page 1 history holding n_seasons simulated seasons, plus its log and summary
+    log = ReplayLog(SEED)
+    history = history if history is not None else SeasonHistory()
+    summary = SeasonSummary()
+    is_bad, revenue, costs, profit = log.run(_params(), SEED_TYPE, INSURANCE, BAD_YEAR_PROBABILITY, n_seasons)
+    history.append(year_type=is_bad.astype(np.uint8), revenue=revenue, costs=costs, net_profit=profit)
+    summary.update(is_bad, revenue, costs, profit)
+    return log, history, summary
+
+
+def _race_history(n_seasons):
+    # Page 2 history: shared year types and each persona's net profit per season
+    rng = np.random.default_rng(SEED)
+    is_bad = draw_bad_years(n_seasons, BAD_YEAR_PROBABILITY, rng)
+    profits = persona_profit_matrix(_params(), is_bad)
+    history = SeasonHistory(RACE_COLUMNS)
+    history.append(
+        year_type=is_bad.astype(np.uint8),
+        **{persona["name"]: profits[:, index] for index, persona in enumerate(PERSONAS)},
+    )
+    return history
+
+
+def season_batch(n_seasons):
+    # One "Run Simulation" click with Seasons per Run = n_seasons
+    params = _params()
+    log, history, summary = ReplayLog(SEED), SeasonHistory(), SeasonSummary()
+
+    def run():
+        is_bad, revenue, costs, profit = log.run(params, SEED_TYPE, INSURANCE, BAD_YEAR_PROBABILITY, n_seasons)
+        history.append(year_type=is_bad.astype(np.uint8), revenue=revenue, costs=costs, net_profit=profit)
+        summary.update(is_bad, revenue, costs, profit)
+    return run
+
+
+def season_single(n_seasons):
+    # One single-season click on top of a history that already holds n_seasons
+    params = _params()
+    log, history, summary = _season_history(n_seasons, SpillingHistory())
+
+    def run():
+        is_bad, revenue, costs, profit = log.run(params, SEED_TYPE, INSURANCE, BAD_YEAR_PROBABILITY, 1)
+        history.append(year_type=is_bad.astype(np.uint8), revenue=revenue, costs=costs, net_profit=profit)
+        summary.update(is_bad, revenue, costs, profit)
+    return run
+
+
+def persona_batch(n_seasons):
+    # Every persona's profit for n_seasons shared weather draws
+    params = _params()
+    rng = np.random.default_rng(SEED)
+
+    def run():
+        persona_profit_matrix(params, draw_bad_years(n_seasons, BAD_YEAR_PROBABILITY, rng))
+    return run
+
+
+def persona_single(n_seasons):
+    # One page 2 click on top of a race that already holds n_seasons
+    params = _params()
+    rng = np.random.default_rng(SEED)
+    history = _race_history(n_seasons)
+
+    def run():
+        is_bad = draw_bad_years(1, BAD_YEAR_PROBABILITY, rng)
+        season_profits = persona_profit_matrix(params, is_bad)[0]
+        history.append(
+            year_type=int(is_bad[0]),
+            **{persona["name"]: profit for persona, profit in zip(PERSONAS, season_profits.tolist())},
+        )
+    return run
+
+
+def history_frame(n_seasons):
+    # History DataFrame construction and per-year-type aggregation
+    _, history, _ = _season_history(n_seasons)
+
+    def run():
+        frame = history.to_frame()
+        frame.groupby("year_type")[["revenue", "costs", "net_profit"]].agg(["sum", "mean", "min", "max"])
+    return run
+
+
+def history_table(n_seasons):
+    # Last page of the Farming Season History table
+    _, history, _ = _season_history(n_seasons)
+
+    def run():
+        start, stop = page_bounds(len(history), page_count(len(history), PAGE_SIZE), PAGE_SIZE)
+        season_history_window(history, start, stop)
+    return run
+
+
+def summary_markdown(n_seasons):
+    # Farming Season Summary table rendered with to_markdown
+    _, _, summary = _season_history(n_seasons)
+
+    def run():
+        table = pd.DataFrame([
+            {"Metric": "💰 Total Revenue", "Value": f"${round(summary.total_revenue, 2)}"},
+            {"Metric": "💸 Total Costs", "Value": f"${round(summary.total_costs, 2)}"},
+            {"Metric": "🏆 Net Profit", "Value": f"${round(summary.total_profit, 2)}"},
+            {"Metric": "📊 Average Net Profit per Season", "Value": f"${round(summary.mean_profit, 2)}"},
+            {"Metric": "📉 Worst Season", "Value": f"${round(summary.min_profit, 2)}"},
+            {"Metric": "📈 Best Season", "Value": f"${round(summary.max_profit, 2)}"},
+            {"Metric": "🎢 Profit Standard Deviation", "Value": f"${round(summary.profit_std, 2)}"},
+        ])
+        table.to_markdown(index=False, tablefmt="pretty")
+    return run
+
+
+def net_profit_chart(n_seasons):
+    # Page 1 net-profit figure, built and serialized as it is sent to the browser
+    _, history, _ = _season_history(n_seasons)
+
+    def run():
+        net_profit_figure(history).to_json()
+    return run
+
+
+def race_chart(n_seasons):
+    # Page 2 race figure built from scratch, e.g. on a new session, and serialized
+    history = _race_history(n_seasons)
+
+    def run():
+        RaceChart(PERSONAS).update(history).to_json()
+    return run
+
+
+def race_chart_click(n_seasons):
+    # Page 2 race figure extended by one season on top of n_seasons, and serialized
+    history = _race_history(n_seasons)
+    chart = RaceChart(PERSONAS)
+    chart.update(history)
+    history.append(year_type=0, **{persona["name"]: 0.0 for persona in PERSONAS})
+
+    def run():
+        chart.update(history).to_json()
+    return run
+
+
+CASES = {
+    "season_batch": season_batch,
+    "season_single": season_single,
+    "persona_batch": persona_batch,
+    "persona_single": persona_single,
+    "history_frame": history_frame,
+    "history_table": history_table,
+    "summary_markdown": summary_markdown,
+    "net_profit_chart": net_profit_chart,
+    "race_chart": race_chart,
+    "race_chart_click": race_chart_click,
+}
@@ -0,0 +1,133 @@
+"""Start-up budget for the pages: ``python -m benchmarks.imports --help``.
+
+For every page, in fresh interpreters after Streamlit itself has been imported:
+
+- times the import block at the top of the page, which must not load pandas,
+  pyarrow or tabulate;
+- times a full first render with ``AppTest.from_file(...).run()``, which runs
+  the whole script, including imports further down and those made by
+  ``farming`` helpers. A page whose first render draws no table must not load
+  those modules either. Plotly cannot be checked this way because
+  ``streamlit.testing`` imports it.
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = [ROOT / "1_The_Farming_Challenge.py", *sorted((ROOT / "pages").glob("*.py"))]
+BUDGET_MS = 150
+RENDER_BUDGET_MS = 2000
+LAZY_MODULES = ("pandas", "pyarrow", "tabulate")
+
+PROBE = """
+import json, sys, time
+import streamlit
+before = set(sys.modules)
+start = time.perf_counter()
+exec(compile({source!r}, {path!r}, "exec"), {{}})
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": sorted(set(sys.modules) - before)}}))
+"""
+
+RENDER_PROBE = """
+import json, sys, time
+import streamlit
+from streamlit.testing.v1 import AppTest
+before = set(sys.modules)
+start = time.perf_counter()
+app = AppTest.from_file({path!r}, default_timeout=60).run()
+seconds = time.perf_counter() - start
+if app.exception:
+    sys.exit("\\n".join(exception.message for exception in app.exception))
+print(json.dumps({{"seconds": seconds, "loaded": sorted(set(sys.modules) - before), "tables": len(app.dataframe)}}))
+"""
+
+
+def import_block(path):
+    # Source of the import statements a page starts with, up to its first other statement
+    statements = []
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            break
+        statements.append(node)
+    return ast.unparse(ast.Module(body=statements, type_ignores=[]))
+
+
+def run_probe(code):
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def lazy_modules_loaded(runs):
+    loaded = {name.partition(".")[0] for run in runs for name in run["loaded"]}
+    return [name for name in LAZY_MODULES if name in loaded]
+
+
+def measure_page(path, repeat):
+    # Fastest of `repeat` cold imports and first renders, and the heavy modules each loaded
+    import_runs = [run_probe(PROBE.format(source=import_block(path), path=str(path))) for _ in range(repeat)]
+    render_runs = [run_probe(RENDER_PROBE.format(path=str(path))) for _ in range(repeat)]
+    return {
+        "page": path.relative_to(ROOT).as_posix(),
+        "milliseconds": min(run["seconds"] for run in import_runs) * 1000,
+        "lazy_modules_loaded": lazy_modules_loaded(import_runs),
+        "render_milliseconds": min(run["seconds"] for run in render_runs) * 1000,
+        "render_tables": render_runs[0]["tables"],
+        "render_lazy_modules_loaded": lazy_modules_loaded(render_runs),
+    }
+
+
+def problems(result, budget_ms, render_budget_ms):
+    found = []
+    if result["milliseconds"] > budget_ms:
+        found.append("imports over budget")
+    if result["lazy_modules_loaded"]:
+        found.append("imports load " + ", ".join(result["lazy_modules_loaded"]))
+    if result["render_milliseconds"] > render_budget_ms:
+        found.append("render over budget")
+    if result["render_lazy_modules_loaded"] and not result["render_tables"]:
+        found.append("render loads " + ", ".join(result["render_lazy_modules_loaded"]) + " without a table")
+    return found
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.imports", description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS,
+                        help="allowed import time per page (default: %(default)s)")
+    parser.add_argument("--render-budget-ms", type=float, default=RENDER_BUDGET_MS,
+                        help="allowed first-render time per page (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per page (default: %(default)s)")
+    parser.add_argument("--output", type=Path, help="also write the results as JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = [measure_page(path, args.repeat) for path in PAGES]
+
+    failed = False
+    print(f"{'page':<48} {'imports':>11} {'render':>11}")
+    for result in results:
+        found = problems(result, args.budget_ms, args.render_budget_ms)
+        failed = failed or bool(found)
+        print(f"{result['page']:<48} {result['milliseconds']:8.1f} ms {result['render_milliseconds']:8.1f} ms"
+              f"{'  ' + '; '.join(found) if found else ''}")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            "budget_ms": args.budget_ms, "render_budget_ms": args.render_budget_ms, "results": results
+        }, indent=2))
+        print(f"Wrote {args.output}")
+    print(f"Budget: {args.budget_ms:.0f} ms of imports per page, without {', '.join(LAZY_MODULES)}; "
+          f"{args.render_budget_ms:.0f} ms per first render, without them unless a table is drawn")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
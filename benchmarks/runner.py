@@ -0,0 +1,99 @@
+"""Benchmark runner: ``python -m benchmarks --help``.
+
+Times every case at each season count, writes the results as JSON and, given
+a baseline file from an earlier run, reports cases that got slower.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from benchmarks.cases import CASES
+
+SIZES = (10, 1_000, 100_000, 1_000_000)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES),
+                        help="cases to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES),
+                        help="season counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case and size (default: %(default)s)")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="stop repeating a case after this many seconds, keeping at least one run "
+                             "(default: %(default)s)")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"), help="(default: %(default)s)")
+    parser.add_argument("--baseline", type=Path, help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline as a fraction (default: %(default)s)")
+    return parser
+
+
+def time_case(setup, n_seasons, repeat, budget):
+    # Best, median and all timings of the callable returned by setup(n_seasons)
+    timings = []
+    while len(timings) < repeat and sum(timings) < budget:
+        run = setup(n_seasons)
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {"best": min(timings), "median": statistics.median(timings), "timings": timings}
+
+
+def environment():
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plotly": plotly.__version__,
+    }
+
+
+def compare(results, baseline, tolerance):
+    # (case, seasons, baseline best, current best) for every case slower than allowed
+    reference = {(row["case"], row["seasons"]): row["best"] for row in baseline["results"]}
+    regressions = []
+    for row in results:
+        previous = reference.get((row["case"], row["seasons"]))
+        if previous is not None and row["best"] > previous * (1 + tolerance):
+            regressions.append((row["case"], row["seasons"], previous, row["best"]))
+    return regressions
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.repeat < 1 or min(args.sizes) < 1:
+        print("--repeat and --sizes must be at least 1", file=sys.stderr)
+        return 2
+
+    results = []
+    for name in args.cases:
+        for n_seasons in args.sizes:
+            timing = time_case(CASES[name], n_seasons, args.repeat, args.budget)
+            results.append({"case": name, "seasons": n_seasons, **timing})
+            print(f"{name:<18} {n_seasons:>9,} seasons  best {timing['best'] * 1000:10.3f} ms  "
+                  f"median {timing['median'] * 1000:10.3f} ms  ({len(timing['timings'])} runs)")
+
+    args.output.write_text(json.dumps({"environment": environment(), "results": results}, indent=2))
+    print(f"Wrote {args.output}")
+
+    if args.baseline is None:
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for name, n_seasons, previous, current in regressions:
+        print(f"REGRESSION {name} at {n_seasons:,} seasons: {previous * 1000:.3f} ms -> {current * 1000:.3f} ms "
+              f"({current / previous - 1:+.0%})")
+    if not regressions:
+        print(f"No case is more than {args.tolerance:.0%} slower than {args.baseline}")
+    return 1 if regressions else 0
@@ -0,0 +1,5 @@
+"""Simulation core for the Agricultural Insurance Simulation Game.
+
+Only farming.ui imports Streamlit; every other module can be used from
+scripts and benchmarks without a Streamlit runtime.
+"""
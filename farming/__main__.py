@@ -0,0 +1,5 @@
+import sys
+
+from farming.cli import main
+
+sys.exit(main())
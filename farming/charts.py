@@ -0,0 +1,261 @@
+"""Plotly figures whose payload stays bounded however long the history grows."""
+from collections import deque
+
+import numpy as np
+
+from farming.simulation import YEAR_TYPES
+
+PERSONA_EMOJIS = {
+    "Traditional_No_Insurance": "🌱",
+    "Traditional_With_Insurance": "🛡️",
+    "High_Quality_No_Insurance": "💎",
+    "High_Quality_With_Insurance": "🚀",
+}
+
+# Above this many seasons the per-season bars are replaced by binned WebGL traces
+MAX_BARS = 200
+N_BINS = 200
+# The race chart thins its traces to at most twice this many points per persona
+MAX_RACE_POINTS = 500
+# Only the most recent lead changes are marked on the race chart
+MAX_LEAD_MARKERS = 20
+
+
+def bin_series(chunks, n_values, n_bins=N_BINS):
+    """Aggregate a series into at most ``n_bins`` consecutive bins.
+
+    The series is given as an iterable of consecutive ``chunks`` holding
+    ``n_values`` values in total, so a long history can be streamed from disk.
+    Returns the 1-based season at the centre of each bin along with the
+    per-bin mean, minimum and maximum.
+    """
+    n_bins = min(n_bins, n_values)
+    starts = np.linspace(0, n_values, n_bins + 1).astype(int)[:-1]
+    sizes = np.diff(np.append(starts, n_values))
+    total = np.zeros(n_bins)
+    low = np.full(n_bins, np.inf)
+    high = np.full(n_bins, -np.inf)
+
+    offset = 0
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=float)
+        if not len(chunk):
+            continue
+        # Bins overlapping this chunk, and where each of them starts inside it
+        first = np.searchsorted(starts, offset, side="right") - 1
+        last = np.searchsorted(starts, offset + len(chunk) - 1, side="right") - 1
+        bins = np.arange(first, last + 1)
+        local_starts = np.maximum(starts[bins] - offset, 0)
+
+        total[bins] += np.add.reduceat(chunk, local_starts)
+        low[bins] = np.minimum(low[bins], np.minimum.reduceat(chunk, local_starts))
+        high[bins] = np.maximum(high[bins], np.maximum.reduceat(chunk, local_starts))
+        offset += len(chunk)
+
+    centre = starts + (sizes + 1) / 2
+    return centre, total / sizes, low, high
+
+
+def net_profit_figure(history, max_bars=MAX_BARS, n_bins=N_BINS):
+    # Net profit per season: one bar per season for short histories,
+    # a binned mean with a min/max band for long ones
+    import plotly.graph_objects as go
+
+    n_seasons = len(history)
+
+    if n_seasons <= max_bars:
+        net_profit = np.round(history.column("net_profit").astype(float), 2)
+        colors = np.where(net_profit >= 0, '#99FF99', '#FF9999')  # Green for profit, red for loss
+        fig = go.Figure(
+            data=[go.Bar(
+                x=[f"Sim {i+1}" for i in range(n_seasons)],
+                y=net_profit,
+                marker=dict(color=colors),
+                text=net_profit,
+                textposition='auto'
+            )]
+        )
+        shapes = [dict(type="line", x0=-0.5, x1=n_seasons - 0.5, y0=0, y1=0, line=dict(color="black", width=1, dash="dash"))]
+    else:
+        centre, mean, low, high = bin_series(history.column_chunks("net_profit"), n_seasons, n_bins)
+        mean, low, high = np.round(mean, 2), np.round(low, 2), np.round(high, 2)
+        fig = go.Figure(
+            data=[
+                go.Scattergl(x=centre, y=low, mode="lines", line=dict(width=0), hoverinfo="skip", showlegend=False),
+                go.Scattergl(
+                    x=centre, y=high, mode="lines", line=dict(width=0), fill="tonexty",
+                    fillcolor="rgba(153, 204, 255, 0.4)", name="Best / Worst Season"
+                ),
+                go.Scattergl(
+                    x=centre, y=mean, mode="lines", line=dict(color="#3366CC", width=2),
+                    name="Average Net Profit"
+                ),
+            ]
+        )
+        shapes = [dict(type="line", xref="paper", x0=0, x1=1, y0=0, y1=0, line=dict(color="black", width=1, dash="dash"))]
+
+    fig.update_layout(
+        title=" ",
+        xaxis_title="Farming Season",
+        yaxis_title="Net Profit ($)",
+        title_x=0.5,
+        title_font=dict(size=16, family="Arial"),
+        shapes=shapes  # Reference line at 0
+    )
+    return fig
+
+
+class RaceChart:
+    """Net Profit Race figure that is kept between reruns and only extended.
+
+    Each ``update`` reads just the seasons added to the history since the last
+    one and plots the running total of each persona's column. A trace keeps
+    every ``stride``-th season plus the latest; the stride doubles whenever a
+    trace passes twice ``max_points``, so a click costs amortized constant work
+    and the figure sent to the browser stays bounded.
+
+    Lead changes are found on every season, before thinning, and the latest
+    ``MAX_LEAD_MARKERS`` of them are marked with a star.
+    """
+
+    def __init__(self, personas, max_points=MAX_RACE_POINTS):
+        self.personas = personas
+        self.max_points = max_points
+        self._clear()
+
+    @property
+    def totals(self):
+        # Each persona's running total up to the newest season added
+        return self._latest[2] if self._latest is not None else np.zeros(len(self.personas))
+
+    @property
+    def latest_lead_change(self):
+        # (season, persona index) of the most recent change of leader, or None
+        return self._lead_changes[-1][:2] if self._lead_changes else None
+
+    def _clear(self):
+        self.n_seasons = 0
+        self.stride = 1
+        self._seasons = np.zeros(0, dtype=np.int64)  # 1-based seasons kept on the chart
+        self._year_types = np.zeros(0, dtype=np.uint8)
+        self._totals = np.zeros((0, len(self.personas)))
+        self._latest = None  # (season, year type, totals) of the newest season
+        self._figure = None
+        self.seasons_in_lead = np.zeros(len(self.personas), dtype=np.int64)
+        self.n_lead_changes = 0
+        self._lead_changes = deque(maxlen=MAX_LEAD_MARKERS)  # (season, new leader, its total)
+        self.leader = None  # Index of the persona in the lead after the newest season
+
+    def update(self, history):
+        """Add the seasons appended to ``history`` since the last update and return the figure."""
+        import plotly.graph_objects as go
+
+        n_seasons = len(history)
+        if n_seasons < self.n_seasons:
+            # The history was reset
+            self._clear()
+        if n_seasons > self.n_seasons:
+            self._extend(history, n_seasons)
+        if self._figure is None:
+            self._figure = self._new_figure(go)
+        if self._latest is None:
+            return self._figure
+
+        seasons, year_types, totals = self._seasons, self._year_types, self._totals
+        latest_season, latest_year_type, latest_totals = self._latest
+        if not len(seasons) or seasons[-1] != latest_season:
+            seasons = np.append(seasons, latest_season)
+            year_types = np.append(year_types, latest_year_type)
+            totals = np.vstack([totals, latest_totals])
+
+        year_labels = np.asarray(YEAR_TYPES)[year_types]
+        with self._figure.batch_update():
+            for index, (trace, persona) in enumerate(zip(self._figure.data, self.personas)):
+                trace.x = seasons
+                trace.y = np.round(totals[:, index], 2)
+                trace.customdata = year_labels
+                trace.text = [""] * (len(seasons) - 1) + [PERSONA_EMOJIS[persona["name"]]]
+                trace.mode = "lines+markers+text" if self.stride == 1 else "lines+text"
+            lead_trace = self._figure.data[len(self.personas)]
+            lead_trace.x = [season for season, _, _ in self._lead_changes]
+            lead_trace.y = [round(float(total), 2) for _, _, total in self._lead_changes]
+            lead_trace.customdata = [
+                self.personas[leader]["name"].replace("_", " ") for _, leader, _ in self._lead_changes
+            ]
+        return self._figure
+
+    def _extend(self, history, n_seasons):
+        start = self.n_seasons
+        new_values = np.column_stack([
+            history.column_slice(persona["name"], start, n_seasons) for persona in self.personas
+        ]).astype(float)
+        totals = self.totals + np.cumsum(new_values, axis=0)
+        seasons = np.arange(start + 1, n_seasons + 1)
+        year_types = history.column_slice("year_type", start, n_seasons)
+        self._track_leaders(seasons, totals)
+
+        keep = seasons % self.stride == 0
+        self._seasons = np.append(self._seasons, seasons[keep])
+        self._year_types = np.append(self._year_types, year_types[keep])
+        self._totals = np.vstack([self._totals, totals[keep]])
+        self._latest = (seasons[-1], year_types[-1], totals[-1])
+        self.n_seasons = n_seasons
+
+        # Thin out to every other kept season until the traces are short enough again
+        while len(self._seasons) > 2 * self.max_points:
+            self.stride *= 2
+            keep = self._seasons % self.stride == 0
+            self._seasons, self._year_types, self._totals = self._seasons[keep], self._year_types[keep], self._totals[keep]
+
+    def _track_leaders(self, seasons, totals):
+        leaders = np.argmax(totals, axis=1)
+        self.seasons_in_lead += np.bincount(leaders, minlength=len(self.personas))
+        previous = np.concatenate(([leaders[0] if self.leader is None else self.leader], leaders[:-1]))
+        changes = np.flatnonzero(leaders != previous)
+        self.n_lead_changes += len(changes)
+        for index in changes[-MAX_LEAD_MARKERS:]:
+            self._lead_changes.append((int(seasons[index]), int(leaders[index]), totals[index, leaders[index]]))
+        self.leader = int(leaders[-1])
+
+    def _new_figure(self, go):
+        fig = go.Figure()
+        for persona in self.personas:
+            name = persona["name"]
+            fig.add_trace(go.Scatter(
+                mode="lines+markers+text",
+                marker=dict(size=10),
+                name=f"{PERSONA_EMOJIS[name]} {name.replace('_', ' ')}",
+                textposition="top center",
+                hovertemplate="Season %{x} (%{customdata})<br>$%{y}"
+            ))
+        fig.add_trace(go.Scatter(
+            mode="markers",
+            marker=dict(symbol="star", size=16, color="gold", line=dict(color="black", width=1)),
+            name="⭐ New Leader",
+            hovertemplate="Season %{x}: %{customdata} takes the lead<br>$%{y}<extra></extra>"
+        ))
+
+        fig.update_layout(
+            title="Farming Personas: Cumulative Profit",
+            xaxis=dict(
+                title="Farming Season",
+            ),
+            yaxis=dict(
+                title="Cumulative Profit ($)",
+            ),
+            shapes=[
+                # Add a persistent black line at y=0
+                dict(
+                    type="line",
+                    xref="paper",  # Relative to the entire x-axis
+                    yref="y",  # Relative to the y-axis
+                    x0=0,  # Start at the left side
+                    x1=1,  # End at the right side
+                    y0=0,  # Line is at y=0
+                    y1=0,  # Line stays at y=0
+                    line=dict(color="darkslategray", width=2),  # Dark black line with thicker width
+                )
+            ],
+            template="plotly_white"
+        )
+        return fig
@@ -0,0 +1,191 @@
+"""Headless batch runner: ``python -m farming --help``.
+
+Runs the farming simulation without Streamlit and writes summary statistics
+and per-season results to CSV or Parquet, e.g. for nightly studies from cron.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from farming.climate import DROUGHT_SHARE, fit_stations
+from farming.config import CONFIG_PATH, PARAMETER_KEYS, FarmingParameters, load_config, validate_config
+from farming.exact import PERCENTILES
+from farming.parallel import iter_unit_draws, run_monte_carlo
+from farming.rng import new_seed
+from farming.simulation import PERSONAS, RETURN_PERIOD_OPTIONS, YEAR_TYPES, persona_profit_matrix
+
+RETURN_PERIODS = sorted(100 // chance for chance in RETURN_PERIOD_OPTIONS.values())
+
+
+def parse_override(text):
+    # "key=value" -> (key, float)
+    key, separator, value = text.partition("=")
+    if not separator or key not in PARAMETER_KEYS:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE with KEY one of {', '.join(PARAMETER_KEYS)}")
+    try:
+        return key, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"value for {key} must be a number, got {value!r}") from None
+
+
+def probability(text):
+    # argparse type for a number between 0 and 1
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number between 0 and 1, got {text!r}") from None
+    if not 0 <= value <= 1:
+        raise argparse.ArgumentTypeError(f"expected a number between 0 and 1, got {text!r}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m farming", description=__doc__.splitlines()[0])
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH, help="config file (default: %(default)s)")
+    parser.add_argument("--set", dest="overrides", type=parse_override, action="append", default=[],
+                        metavar="KEY=VALUE", help="override a config parameter; may be repeated")
+    weather = parser.add_mutually_exclusive_group()
+    weather.add_argument("--return-period", type=int, choices=RETURN_PERIODS, default=10,
+                         help="extreme weather once in this many years (default: %(default)s)")
+    weather.add_argument("--bad-year-probability", type=probability, help="chance of a bad year, overriding --return-period")
+    weather.add_argument("--station", help="use the historical chance of a bad year at this station in --climate-file")
+    parser.add_argument("--climate-file", type=Path, help="CSV or Parquet file of yearly or daily station data")
+    parser.add_argument("--drought-share", type=probability, default=DROUGHT_SHARE,
+                        help="a station's bad years are below this share of its median year (default: %(default)s)")
+    parser.add_argument("--personas", nargs="+", choices=[persona["name"] for persona in PERSONAS],
+                        default=[persona["name"] for persona in PERSONAS], help="personas to simulate (default: all)")
+    parser.add_argument("--seasons", type=int, default=100, help="seasons per path (default: %(default)s)")
+    parser.add_argument("--paths", type=int, default=1000, help="independent paths (default: %(default)s)")
+    parser.add_argument("--seed", type=int, help="random seed; a fresh one is chosen and reported if omitted")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: %(default)s)")
+    parser.add_argument("--output-dir", type=Path, default=Path("farming_results"), help="(default: %(default)s)")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv", help="(default: %(default)s)")
+    parser.add_argument("--no-seasons", action="store_true", help="write only the summary, not per-season results")
+    return parser
+
+
+def summary_frame(distributions, n_seasons, n_paths, bad_year_probability, seed):
+    import pandas as pd
+
+    rows = []
+    for name, distribution in distributions.items():
+        rows.append({
+            "persona": name,
+            "seasons": n_seasons,
+            "paths": n_paths,
+            "bad_year_probability": bad_year_probability,
+            "seed": str(seed),
+            "mean_profit": distribution.mean,
+            "std_profit": distribution.std,
+            "mean_profit_per_season": distribution.mean / n_seasons,
+            **{f"p{q}_profit": distribution.percentiles[q] for q in PERCENTILES},
+            "prob_loss": distribution.prob_loss,
+        })
+    return pd.DataFrame(rows)
+
+
+class TableWriter:
+    # Appends DataFrames chunk by chunk to a CSV or Parquet file
+    def __init__(self, path, file_format):
+        self.path = path
+        self.file_format = file_format
+        self._parquet_writer = None
+        self._started = False
+
+    def write(self, frame):
+        if self.file_format == "csv":
+            frame.to_csv(self.path, mode="a" if self._started else "w", header=not self._started, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        self._started = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+def write_seasons(path, file_format, params, personas, bad_year_probability, n_seasons, n_paths, seed):
+    # Per-season year type and profit of every persona, one work unit at a time
+    import pandas as pd
+
+    writer = TableWriter(path, file_format)
+    year_types = pd.Categorical.from_codes([0, 1], categories=YEAR_TYPES)
+    try:
+        for (path_start, unit_paths, season_start, unit_seasons), is_bad in iter_unit_draws(
+            bad_year_probability, n_seasons, n_paths, seed
+        ):
+            flat = is_bad.ravel()
+            profits = persona_profit_matrix(params, flat, personas)
+            frame = pd.DataFrame({
+                "path": np.repeat(np.arange(path_start, path_start + unit_paths), unit_seasons),
+                "season": np.tile(np.arange(season_start + 1, season_start + unit_seasons + 1), unit_paths),
+                "year_type": year_types[flat.astype(np.int8)],
+            })
+            for index, persona in enumerate(personas):
+                frame[persona["name"]] = profits[:, index]
+            writer.write(frame)
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.seasons < 1 or args.paths < 1 or args.workers < 1:
+        parser.error("--seasons, --paths and --workers must be at least 1")
+
+    if (args.station is None) != (args.climate_file is None):
+        parser.error("--station and --climate-file must be given together")
+
+    try:
+        config = load_config(args.config)
+        config.update(dict(args.overrides))
+        # Overrides are checked like the config file itself, e.g. no negative costs
+        params = FarmingParameters.from_mapping(validate_config(config, source="--config/--set"))
+    except ValueError as error:
+        parser.error(str(error))
+    personas = [persona for persona in PERSONAS if persona["name"] in args.personas]
+    if args.station is not None:
+        try:
+            fits = fit_stations(args.climate_file)
+        except (OSError, ValueError, KeyError) as error:
+            parser.error(f"cannot read --climate-file {args.climate_file}: {error}")
+        if args.station not in fits:
+            parser.error(f"station {args.station!r} not in {args.climate_file}; choose from {', '.join(fits)}")
+        bad_year_probability = fits[args.station].bad_year_probability(args.drought_share)
+    elif args.bad_year_probability is not None:
+        bad_year_probability = args.bad_year_probability
+    else:
+        bad_year_probability = 1 / args.return_period
+    seed = args.seed if args.seed is not None else new_seed()
+
+    stats = run_monte_carlo(bad_year_probability, args.seasons, args.paths, seed=seed, workers=args.workers)
+    summary = summary_frame(
+        stats.persona_distributions(params, personas), args.seasons, args.paths, bad_year_probability, seed
+    )
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    extension = "csv" if args.format == "csv" else "parquet"
+    summary_path = args.output_dir / f"summary.{extension}"
+    writer = TableWriter(summary_path, args.format)
+    writer.write(summary)
+    writer.close()
+    written = [summary_path]
+
+    if not args.no_seasons:
+        seasons_path = args.output_dir / f"seasons.{extension}"
+        write_seasons(seasons_path, args.format, params, personas, bad_year_probability, args.seasons, args.paths, seed)
+        written.append(seasons_path)
+
+    print(f"Seed: {seed}")
+    print(summary[["persona", "mean_profit", "std_profit", "p5_profit", "p95_profit", "prob_loss"]].to_string(index=False))
+    for path in written:
+        print(f"Wrote {path}")
+    return 0
@@ -0,0 +1,235 @@
+"""Bad-year probabilities estimated from local historical climate data.
+
+Station files are CSV or Parquet tables with one row per observation: a
+station, a year and a value such as rainfall or crop yield. Daily or monthly
+rows are fine; they are added up per station and year. Files are read in
+chunks (Parquet through a memory map), so only the per-station annual totals
+are ever held in memory.
+
+A year is bad when its total falls below ``drought_share`` of the station's
+median year. Each station's annual totals are kept sorted with Weibull
+plotting positions, ``rank / (n + 1)``, which give the chance of a year at or
+below that total and its return period. Fits are cached on disk next to the
+file's size and modification time, and in memory for the process, so a page
+rerun does not re-read unchanged files.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+CLIMATE_DIR = Path(__file__).resolve().parent.parent / "climate_data"
+FILE_SUFFIXES = (".csv", ".parquet")
+STATION_COLUMN = "station"
+YEAR_COLUMN = "year"
+VALUE_COLUMNS = ("rainfall", "precipitation", "yield", "value")  # The first one present is used
+CHUNK_ROWS = 1_000_000
+DROUGHT_SHARE = 0.7  # A bad year is below 70% of the station's median year
+CACHE_VERSION = 1
+
+# Fits keyed by cache key, for the lifetime of the process
+_fit_cache = {}
+_fit_lock = threading.Lock()
+
+
+def climate_dir():
+    # Override with FARMING_CLIMATE_DIR to read station files from elsewhere
+    return Path(os.environ.get("FARMING_CLIMATE_DIR", CLIMATE_DIR))
+
+
+def cache_root():
+    # Override with FARMING_CACHE_DIR, e.g. to keep fits across reboots
+    return Path(os.environ.get("FARMING_CACHE_DIR", Path(tempfile.gettempdir()) / "farming_cache"))
+
+
+def climate_files(directory=None):
+    directory = climate_dir() if directory is None else Path(directory)
+    if not directory.is_dir():
+        return []
+    return sorted(path for path in directory.iterdir() if path.suffix.lower() in FILE_SUFFIXES)
+
+
+@dataclass
+class StationFit:
+    station: str
+    years: np.ndarray  # Years of record, in the order of ``values``
+    values: np.ndarray  # Annual totals, ascending
+
+    @property
+    def n_years(self):
+        return len(self.values)
+
+    @property
+    def non_exceedance(self):
+        # Weibull plotting positions: chance of a year at or below each total
+        return np.arange(1, self.n_years + 1) / (self.n_years + 1)
+
+    @property
+    def return_periods(self):
+        # A total this low comes once in this many years
+        return 1 / self.non_exceedance
+
+    def threshold(self, drought_share=DROUGHT_SHARE):
+        return drought_share * float(np.median(self.values))
+
+    def bad_year_probability(self, drought_share=DROUGHT_SHARE):
+        """Share of years below the drought threshold.
+
+        A record without any such year still gives 1 / (n + 1), since a
+        drought rarer than the record is not impossible.
+        """
+        bad_years = np.count_nonzero(self.values < self.threshold(drought_share))
+        return max(bad_years / self.n_years, 1 / (self.n_years + 1))
+
+
+def value_column(columns):
+    for name in VALUE_COLUMNS:
+        if name in columns:
+            return name
+    raise ValueError(f"climate file needs a value column, one of {', '.join(VALUE_COLUMNS)}")
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """(station, year, value) DataFrames of at most ``chunk_rows`` rows."""
+    import pandas as pd
+
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path, memory_map=True)
+        value = value_column(parquet.schema_arrow.names)
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=[STATION_COLUMN, YEAR_COLUMN, value]):
+            yield batch.to_pandas().rename(columns={value: "value"})
+    else:
+        value = value_column(pd.read_csv(path, nrows=0).columns)
+        reader = pd.read_csv(
+            path, usecols=[STATION_COLUMN, YEAR_COLUMN, value], dtype={STATION_COLUMN: str}, chunksize=chunk_rows
+        )
+        for chunk in reader:
+            yield chunk.rename(columns={value: "value"})
+
+
+def annual_totals(path, chunk_rows=CHUNK_ROWS):
+    """Total value per station and year, as a DataFrame sorted by station and year."""
+    import pandas as pd
+
+    partial = []
+    for chunk in read_chunks(path, chunk_rows):
+        chunk = chunk.dropna()
+        chunk[STATION_COLUMN] = chunk[STATION_COLUMN].astype(str)
+        # Chunks may split a station-year, so the partial totals are added up again below
+        partial.append(chunk.groupby([STATION_COLUMN, YEAR_COLUMN], sort=False)["value"].sum())
+    if not partial:
+        return pd.DataFrame(columns=[STATION_COLUMN, YEAR_COLUMN, "value"])
+    return pd.concat(partial).groupby(level=[0, 1]).sum().reset_index()
+
+
+def fit_totals(totals):
+    # One StationFit per station, from the output of annual_totals
+    fits = {}
+    for station, group in totals.groupby(STATION_COLUMN, sort=True):
+        order = np.argsort(group["value"].to_numpy(), kind="stable")
+        fits[station] = StationFit(
+            station=station,
+            years=group[YEAR_COLUMN].to_numpy()[order].astype(np.int64),
+            values=group["value"].to_numpy()[order].astype(float),
+        )
+    return fits
+
+
+def cache_key(path):
+    # Changes whenever the file is replaced or edited
+    stat = Path(path).stat()
+    identity = [str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size, CHUNK_ROWS, CACHE_VERSION]
+    return hashlib.sha256(json.dumps(identity).encode("utf-8")).hexdigest()[:32]
+
+
+def save_fits(fits, cache_path):
+    stations = list(fits)
+    lengths = [fits[station].n_years for station in stations]
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # Written under a temporary name first, so concurrent readers never see half a file
+    partial_path = cache_path.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(
+        partial_path,
+        stations=np.array(stations, dtype=str),
+        offsets=np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+        years=np.concatenate([fits[station].years for station in stations] or [np.array([], dtype=np.int64)]),
+        values=np.concatenate([fits[station].values for station in stations] or [np.array([])]),
+    )
+    os.replace(partial_path, cache_path)
+
+
+def load_fits(cache_path):
+    with np.load(cache_path) as data:
+        # Every key access decompresses its array again, so each is read once
+        stations, offsets, years, values = data["stations"], data["offsets"], data["years"], data["values"]
+    return {
+        str(station): StationFit(
+            station=str(station),
+            years=years[offsets[index]:offsets[index + 1]],
+            values=values[offsets[index]:offsets[index + 1]],
+        )
+        for index, station in enumerate(stations)
+    }
+
+
+def fit_stations(path):
+    """StationFit per station in a climate file, from the memory or disk cache when the file is unchanged."""
+    key = cache_key(path)
+    with _fit_lock:
+        cached = _fit_cache.get(key)
+    if cached is not None:
+        return cached
+
+    cache_path = cache_root() / f"climate_{key}.npz"
+    if cache_path.exists():
+        fits = load_fits(cache_path)
+    else:
+        fits = fit_totals(annual_totals(path))
+        save_fits(fits, cache_path)
+    with _fit_lock:
+        _fit_cache[key] = fits
+    return fits
+
+
+def station_fits(directory=None, errors=None):
+    """StationFit per (file name, station) for every climate file in ``directory``.
+
+    Files that cannot be read raise, unless an ``errors`` list is given; then
+    they are skipped and (file name, message) is appended to it.
+    """
+    fits = {}
+    for path in climate_files(directory):
+        try:
+            file_fits = fit_stations(path)
+        except (OSError, ValueError, KeyError) as error:
+            if errors is None:
+                raise
+            errors.append((path.name, str(error)))
+            continue
+        fits.update({(path.name, station): fit for station, fit in file_fits.items()})
+    return fits
+
+
+def option_label(file_name, station, bad_year_probability):
+    chance = 100 * bad_year_probability
+    return f"Station {station}, {file_name}: once in {100 / chance:.1f} years ({chance:.1f}% chance per year)"
+
+
+def climate_return_period_options(drought_share=DROUGHT_SHARE, directory=None, errors=None):
+    """Return period label -> chance of a bad year (%), one entry per station with data.
+
+    The labels sit alongside ``RETURN_PERIOD_OPTIONS`` in the pages' selectors.
+    """
+    options = {}
+    for (file_name, station), fit in station_fits(directory, errors).items():
+        probability = fit.bad_year_probability(drought_share)
+        options[option_label(file_name, station, probability)] = 100 * probability
+    return options
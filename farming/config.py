@@ -0,0 +1,83 @@
+"""Configuration loading shared by every page.
+
+``config.json`` is parsed and validated once per process and only re-read
+when its modification time changes, so Streamlit reruns do no file reads.
+"""
+import json
+import math
+import threading
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
+
+# Parsed configs keyed by path: path -> (mtime_ns, params)
+_config_cache = {}
+_config_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class FarmingParameters:
+    traditional_seed_cost: float
+    high_quality_seed_cost: float
+    traditional_yield_revenue: float
+    high_quality_yield_revenue: float
+    insurance_payout: float
+    insurance_premium: float
+    loan_interest_rate: float  # Percent
+
+    # Derived constants, computed once when the parameters are created
+    high_quality_cost: float = field(init=False)  # Seed cost including loan interest
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "high_quality_cost",
+            self.high_quality_seed_cost * (1 + self.loan_interest_rate / 100)
+        )
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        # Build from config.json values or st.session_state, ignoring unrelated keys
+        return cls(**{name: mapping[name] for name in PARAMETER_KEYS})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in PARAMETER_KEYS}
+
+
+PARAMETER_KEYS = tuple(f.name for f in fields(FarmingParameters) if f.init)
+
+
+def validate_config(raw, source="config.json"):
+    # Every parameter must be present as a finite, non-negative number; ``source`` names the input in errors
+    if not isinstance(raw, dict):
+        raise ValueError(f"{source} must be an object of parameters, got {type(raw).__name__}")
+    missing = [key for key in PARAMETER_KEYS if key not in raw]
+    if missing:
+        raise ValueError(f"{source} is missing parameters: {', '.join(missing)}")
+    for key in PARAMETER_KEYS:
+        value = raw[key]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"{source} parameter '{key}' must be a number, got {value!r}")
+        if value < 0:
+            raise ValueError(f"{source} parameter '{key}' must not be negative, got {value!r}")
+    return {key: raw[key] for key in PARAMETER_KEYS}
+
+
+def load_config(file_path=CONFIG_PATH):
+    """Default parameters from ``config.json`` as a new dict."""
+    path = Path(file_path).resolve()
+    mtime = path.stat().st_mtime_ns
+
+    with _config_lock:
+        cached = _config_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            with open(path, "r") as file:
+                cached = (mtime, validate_config(json.load(file)))
+            _config_cache[path] = cached
+
+    # Copy so callers can't mutate the cached values
+    return dict(cached[1])
+
+
+def load_parameters(file_path=CONFIG_PATH):
+    return FarmingParameters.from_mapping(load_config(file_path))
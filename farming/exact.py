@@ -0,0 +1,112 @@
+"""Exact profit distributions for the two-state Normal/Bad weather model.
+
+With independent years, a strategy's cumulative profit over ``n`` seasons is
+``n * normal_profit + K * (bad_profit - normal_profit)`` where ``K`` is the
+binomial number of bad years. Everything below follows from the binomial
+distribution of ``K``, so no simulation is needed for any horizon.
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from farming.simulation import PERSONAS, persona_profits
+
+# The binomial mass further than this many standard deviations from the mean is negligible
+TAIL_SD = 12
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def bad_year_distribution(n_seasons, bad_year_probability, tail_sd=TAIL_SD):
+    """Support and probabilities of the number of bad years in ``n_seasons``.
+
+    Only the window of ``tail_sd`` standard deviations around the mean is
+    returned, so the cost grows with sqrt(n) rather than n.
+    """
+    n, p = int(n_seasons), float(bad_year_probability)
+    if p <= 0 or n == 0:
+        return np.array([0]), np.array([1.0])
+    if p >= 1:
+        return np.array([n]), np.array([1.0])
+
+    mean = n * p
+    sd = math.sqrt(n * p * (1 - p))
+    low = max(0, math.floor(mean - tail_sd * sd) - 1)
+    high = min(n, math.ceil(mean + tail_sd * sd) + 1)
+    k = np.arange(low, high + 1)
+
+    # log P(K=k+1) - log P(K=k) = log((n-k)/(k+1)) + log(p/(1-p))
+    steps = np.log((n - k[:-1]) / (k[:-1] + 1)) + math.log(p / (1 - p))
+    log_pmf = np.concatenate(([0.0], np.cumsum(steps)))
+    pmf = np.exp(log_pmf - log_pmf.max())
+    return k, pmf / pmf.sum()
+
+
+def poisson_binomial_distribution(bad_year_probabilities):
+    """Support and probabilities of the number of bad years when season t is bad with ``bad_year_probabilities[t]``.
+
+    Built one season at a time, so the cost is quadratic in the number of seasons.
+    """
+    pmf = np.ones(1)
+    for p in np.asarray(bad_year_probabilities, dtype=float):
+        pmf = np.append(pmf * (1 - p), 0.0) + np.append(0.0, pmf * p)
+    return np.arange(len(pmf)), pmf
+
+
+@dataclass
+class ProfitDistribution:
+    n_seasons: int
+    mean: float
+    std: float
+    percentiles: dict
+    prob_loss: float
+    values: np.ndarray  # Possible cumulative profits, ascending
+    pmf: np.ndarray  # Probability of each value
+
+
+def exact_profit_distribution(normal_profit, bad_profit, n_seasons, bad_year_probability):
+    """Distribution of cumulative profit over ``n_seasons`` for one strategy."""
+    n, p = int(n_seasons), float(bad_year_probability)
+    k, pmf = bad_year_distribution(n, p)
+    # Mean and variance are known in closed form
+    swing = bad_profit - normal_profit
+    mean = n * (normal_profit + p * swing)
+    std = math.sqrt(n * p * (1 - p)) * abs(swing)
+    return bad_year_profit_distribution(normal_profit, bad_profit, n, k, pmf, mean, std)
+
+
+def bad_year_profit_distribution(normal_profit, bad_profit, n_seasons, k, pmf, mean=None, std=None):
+    # Cumulative profit distribution given the distribution (k, pmf) of the number of bad years
+    values = n_seasons * normal_profit + k * (bad_profit - normal_profit)
+    order = np.argsort(values, kind="stable")
+    return summarize_distribution(n_seasons, values[order], pmf[order], mean, std)
+
+
+def summarize_distribution(n_seasons, values, pmf, mean=None, std=None):
+    """``ProfitDistribution`` for a discrete distribution given as ascending ``values``.
+
+    Used for exact and simulated distributions alike; the mean and standard
+    deviation are computed from ``pmf`` unless given.
+    """
+    if mean is None:
+        mean = float(np.dot(values, pmf))
+    if std is None:
+        std = math.sqrt(max(float(np.dot((values - mean) ** 2, pmf)), 0.0))
+
+    # Discrete percentile: smallest value whose cumulative probability reaches q
+    cdf = np.cumsum(pmf)
+    percentiles = {
+        q: float(values[min(np.searchsorted(cdf, q / 100 - 1e-12), len(values) - 1)])
+        for q in PERCENTILES
+    }
+    prob_loss = float(pmf[values < 0].sum())
+    return ProfitDistribution(n_seasons, mean, std, percentiles, prob_loss, values, pmf)
+
+
+def exact_persona_distributions(params, n_seasons, bad_year_probability, personas=PERSONAS):
+    # One ProfitDistribution per persona, keyed by persona name
+    normal_profit, bad_profit = persona_profits(params, personas)
+    return {
+        persona["name"]: exact_profit_distribution(normal, bad, n_seasons, bad_year_probability)
+        for persona, normal, bad in zip(personas, normal_profit.tolist(), bad_profit.tolist())
+    }
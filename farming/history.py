@@ -0,0 +1,85 @@
+"""Columnar, array-backed storage for simulation history.
+
+Each column is a preallocated NumPy array that grows by amortized doubling,
+so appending a season costs a few bytes instead of a Python dict.
+"""
+import numpy as np
+
+from farming.simulation import PERSONAS, YEAR_TYPES
+
+# Column name -> dtype. Year types are stored as codes into YEAR_TYPES.
+SEASON_COLUMNS = {
+    "year_type": np.uint8,
+    "revenue": np.float32,
+    "costs": np.float32,
+    "net_profit": np.float32,
+}
+
+# Persona race: the shared year type plus each persona's net profit for the season
+RACE_COLUMNS = {
+    "year_type": np.uint8,
+    **{persona["name"]: np.float64 for persona in PERSONAS},
+}
+
+
+class SeasonHistory:
+    def __init__(self, columns=SEASON_COLUMNS, capacity=64):
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in columns.items()}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(next(iter(self._columns.values())))
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._columns.values())
+
+    def append(self, **values):
+        # Append a batch of seasons; every column must be given with the same length
+        if set(values) != set(self._columns):
+            raise ValueError(f"Expected columns {sorted(self._columns)}, got {sorted(values)}")
+        n_new = len(np.atleast_1d(next(iter(values.values()))))
+        if self._size + n_new > self.capacity:
+            self._grow(self._size + n_new)
+
+        stop = self._size + n_new
+        for name, array in self._columns.items():
+            array[self._size:stop] = values[name]
+        self._size = stop
+
+    def _grow(self, min_capacity):
+        # Double the capacity (or more, for large batches) and copy the filled rows once
+        capacity = max(2 * self.capacity, min_capacity)
+        for name, array in self._columns.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._columns[name] = grown
+
+    @property
+    def columns(self):
+        return {name: array.dtype for name, array in self._columns.items()}
+
+    def column(self, name):
+        # View of the filled part of a column (no copy)
+        return self._columns[name][:self._size]
+
+    def column_slice(self, name, start, stop):
+        return self.column(name)[start:stop]
+
+    def column_chunks(self, name):
+        # Same interface as SpillingHistory, which yields one array per stored chunk
+        yield self.column(name)
+
+    def year_types(self):
+        # "Normal"/"Bad" labels for the stored year-type codes
+        return np.asarray(YEAR_TYPES)[self.column("year_type")]
+
+    def to_frame(self):
+        # DataFrame whose columns are views onto the underlying arrays
+        import pandas as pd
+
+        return pd.DataFrame({name: self.column(name) for name in self._columns}, copy=False)
@@ -0,0 +1,123 @@
+"""Chunked Monte Carlo backend that runs serially or on a process pool.
+
+Work is split into fixed units of (block of paths, block of seasons). Each
+unit draws its weather from its own stream spawned from the run's
+``SeedSequence`` and returns the number of bad years on each of its paths.
+These are folded into a sparse histogram of bad-year counts per path, which is
+a sufficient statistic for every persona's cumulative profit. The units and
+their streams depend only on the seed and the chunk size, never on the
+number of workers, so a parallel run matches the serial one exactly.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from farming.exact import summarize_distribution
+from farming.simulation import PERSONAS, persona_profits
+
+# Uniform draws per work unit; bounds the memory used by each worker
+CHUNK_DRAWS = 4_000_000
+
+
+@dataclass
+class MonteCarloStats:
+    n_seasons: int
+    n_paths: int
+    bad_year_values: np.ndarray  # Distinct numbers of bad years seen on a path, ascending
+    bad_year_counts: np.ndarray  # How many paths had each of them
+
+    @classmethod
+    def from_paths(cls, n_seasons, bad_years_per_path):
+        values, counts = np.unique(bad_years_per_path, return_counts=True)
+        return cls(n_seasons, len(bad_years_per_path), values, counts)
+
+    def merge(self, other):
+        # Histograms of disjoint sets of paths add up exactly
+        values = np.concatenate([self.bad_year_values, other.bad_year_values])
+        counts = np.concatenate([self.bad_year_counts, other.bad_year_counts])
+        merged_values, inverse = np.unique(values, return_inverse=True)
+        merged_counts = np.bincount(inverse, weights=counts, minlength=len(merged_values)).astype(np.int64)
+        return MonteCarloStats(self.n_seasons, self.n_paths + other.n_paths, merged_values, merged_counts)
+
+    @property
+    def total_bad_years(self):
+        return int(np.dot(self.bad_year_values.astype(np.int64), self.bad_year_counts))
+
+    def persona_distributions(self, params, personas=PERSONAS):
+        # Simulated distribution of cumulative profit per persona, in the same form as the exact engine
+        normal_profit, bad_profit = persona_profits(params, personas)
+        pmf = self.bad_year_counts / self.n_paths
+        results = {}
+        for persona, normal, bad in zip(personas, normal_profit.tolist(), bad_profit.tolist()):
+            values = self.n_seasons * normal + self.bad_year_values * (bad - normal)
+            order = np.argsort(values, kind="stable")
+            results[persona["name"]] = summarize_distribution(self.n_seasons, values[order], pmf[order])
+        return results
+
+
+def plan_units(n_paths, n_seasons, chunk_draws=CHUNK_DRAWS):
+    # Work units as (first path, paths, first season, seasons), path block by path block
+    if n_seasons >= chunk_draws:
+        path_block, season_block = 1, chunk_draws
+    else:
+        path_block, season_block = max(1, chunk_draws // n_seasons), n_seasons
+    return [
+        (path, min(path_block, n_paths - path), season, min(season_block, n_seasons - season))
+        for path in range(0, n_paths, path_block)
+        for season in range(0, n_seasons, season_block)
+    ]
+
+
+def _count_bad_years(seed_sequence, n_paths, n_seasons, bad_year_probability):
+    # Bad years on each path of one work unit
+    rng = np.random.Generator(np.random.PCG64(seed_sequence))
+    is_bad = rng.random((n_paths, n_seasons)) < bad_year_probability
+    return np.count_nonzero(is_bad, axis=1)
+
+
+def run_monte_carlo(bad_year_probability, n_seasons, n_paths=1, seed=None, workers=1, chunk_draws=CHUNK_DRAWS):
+    """Simulate ``n_paths`` paths of ``n_seasons`` and return their ``MonteCarloStats``.
+
+    ``workers`` > 1 spreads the work units across a process pool.
+    """
+    units = plan_units(n_paths, n_seasons, chunk_draws)
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(units))
+    args = (
+        seed_sequences,
+        [unit[1] for unit in units],
+        [unit[3] for unit in units],
+        [bad_year_probability] * len(units),
+    )
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return _merge_units(units, n_seasons, pool.map(_count_bad_years, *args, chunksize=max(1, len(units) // (4 * workers))))
+    return _merge_units(units, n_seasons, map(_count_bad_years, *args))
+
+
+def iter_unit_draws(bad_year_probability, n_seasons, n_paths=1, seed=None, chunk_draws=CHUNK_DRAWS):
+    """Yield ``(unit, is_bad)`` for every work unit of a run, in order.
+
+    Uses the same units and streams as ``run_monte_carlo``, so per-season
+    output written from these draws matches its statistics exactly.
+    """
+    units = plan_units(n_paths, n_seasons, chunk_draws)
+    for unit, seed_sequence in zip(units, np.random.SeedSequence(seed).spawn(len(units))):
+        rng = np.random.Generator(np.random.PCG64(seed_sequence))
+        yield unit, rng.random((unit[1], unit[3])) < bad_year_probability
+
+
+def _merge_units(units, n_seasons, results):
+    # Sum season blocks per path block, then fold each finished path block into the histogram
+    stats = MonteCarloStats(n_seasons, 0, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    block_start, block_counts = None, None
+    for (path_start, _, _, _), bad_years in zip(units, results):
+        if path_start != block_start:
+            if block_counts is not None:
+                stats = stats.merge(MonteCarloStats.from_paths(n_seasons, block_counts))
+            block_start, block_counts = path_start, np.zeros(len(bad_years), dtype=np.int64)
+        block_counts += bad_years
+    if block_counts is not None:
+        stats = stats.merge(MonteCarloStats.from_paths(n_seasons, block_counts))
+    return stats
@@ -0,0 +1,163 @@
+"""Insurer portfolio of many farms with regionally correlated bad years.
+
+Farms are split into regions of equal size. A farm has a bad year when its
+latent weather score falls below the threshold that gives it the chosen
+bad-year probability. Each score is a one-factor Gaussian copula:
+
+    score = sqrt(correlation) * regional_factor + sqrt(1 - correlation) * farm_noise
+
+so farms in the same region share droughts, while different regions are
+independent. Simulated years are independent of each other.
+
+Given its region's factor, a farm has a bad year when its own noise is below
+a conditional threshold. Those thresholds are computed once per region and
+year, so each farm-year costs a single normal draw and a comparison. Farms
+are processed in chunks of at most ``CHUNK_CELLS`` farm-years, so memory
+stays bounded for any number of farms; only the per-year claim counts are
+kept.
+
+VaR and TVaR are empirical quantiles of the simulated years, so they need
+enough years beyond the confidence level: with 99% confidence and 100 years,
+both are just the worst year. ``min_years`` gives the number of years that
+leaves ``TAIL_YEARS`` of them in the tail.
+"""
+import math
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+
+CHUNK_CELLS = 2_000_000  # Farm-years simulated at once
+CONFIDENCE = 0.99
+TAIL_YEARS = 10  # Simulated years beyond the VaR for a usable tail estimate
+
+
+@dataclass
+class PortfolioResult:
+    n_farms: int
+    n_regions: int
+    correlation: float
+    bad_year_probability: float
+    payout: float  # Insurance payout per farm in a bad year
+    premiums: float  # Premium income per year
+    bad_farms: np.ndarray  # (years,) number of farms with a bad year
+    claims: np.ndarray  # (years,) aggregate insurance payouts
+
+    @property
+    def n_years(self):
+        return len(self.claims)
+
+    @property
+    def independent_claims_std(self):
+        # Standard deviation of the yearly claims if every farm's weather were independent (binomial)
+        p = self.bad_year_probability
+        return math.sqrt(self.n_farms * p * (1 - p)) * self.payout
+
+    @property
+    def loss_ratios(self):
+        # Claims as a share of premium income, per year
+        return self.claims / self.premiums if self.premiums else np.full(self.n_years, np.nan)
+
+
+@dataclass
+class PortfolioRisk:
+    confidence: float
+    n_years: int  # Simulated years behind the estimates
+    premiums: float
+    expected_claims: float
+    loss_ratio: float  # Expected claims over premium income
+    value_at_risk: float  # Annual claims exceeded with probability 1 - confidence
+    tail_value_at_risk: float  # Average annual claims beyond the value at risk
+    reserve: float  # Capital needed on top of the premiums to pay the tail-average year
+    prob_shortfall: float  # Chance that a year's claims exceed its premiums
+
+    @property
+    def tail_years(self):
+        # Simulated years beyond the value at risk
+        return self.n_years - _var_index(self.confidence, self.n_years) - 1
+
+    @property
+    def enough_years(self):
+        return self.n_years >= min_years(self.confidence)
+
+
+def min_years(confidence=CONFIDENCE, tail_years=TAIL_YEARS):
+    """Simulated years needed for ``tail_years`` of them to lie beyond the VaR at ``confidence``."""
+    return math.ceil(round(tail_years / (1 - confidence), 6))
+
+
+def _var_index(confidence, n_years):
+    # Position of the value at risk among the sorted yearly claims
+    return min(max(math.ceil(confidence * n_years) - 1, 0), n_years - 1)
+
+
+def region_sizes(n_farms, n_regions):
+    # Farms per region, as equal as possible
+    base, extra = divmod(int(n_farms), int(n_regions))
+    return np.array([base + 1] * extra + [base] * (n_regions - extra), dtype=np.int64)
+
+
+def conditional_thresholds(bad_year_probability, correlation, factors):
+    """Farm-noise threshold for a bad year given each regional factor."""
+    threshold = NormalDist().inv_cdf(bad_year_probability)
+    return (threshold - math.sqrt(correlation) * factors) / math.sqrt(1 - correlation)
+
+
+def simulate_portfolio(params, bad_year_probability, n_farms, n_years, correlation=0.3, n_regions=10,
+                       chunk_cells=CHUNK_CELLS, rng=None):
+    """Aggregate claims of ``n_farms`` insured farms over ``n_years`` independent years."""
+    n_farms, n_years, n_regions = int(n_farms), int(n_years), int(n_regions)
+    p, correlation = float(bad_year_probability), float(correlation)
+    if not 0 <= correlation < 1:
+        raise ValueError(f"correlation must be in [0, 1), got {correlation}")
+    if not 1 <= n_regions <= n_farms:
+        raise ValueError(f"n_regions must be between 1 and the number of farms, got {n_regions}")
+    rng = np.random.default_rng() if rng is None else rng
+
+    bad_farms = np.zeros(n_years, dtype=np.int64)
+    if 0 < p < 1:
+        factors = rng.standard_normal((n_regions, n_years))
+        thresholds = conditional_thresholds(p, correlation, factors).astype(np.float32)
+        chunk_farms = max(1, chunk_cells // max(n_years, 1))
+        for region, size in enumerate(region_sizes(n_farms, n_regions)):
+            for start in range(0, size, chunk_farms):
+                noise = rng.standard_normal((min(chunk_farms, size - start), n_years), dtype=np.float32)
+                bad_farms += (noise < thresholds[region]).sum(axis=0)
+    elif p >= 1:
+        bad_farms[:] = n_farms
+
+    return PortfolioResult(
+        n_farms=n_farms,
+        n_regions=n_regions,
+        correlation=correlation,
+        bad_year_probability=p,
+        payout=float(params.insurance_payout),
+        premiums=n_farms * float(params.insurance_premium),
+        bad_farms=bad_farms,
+        claims=bad_farms * float(params.insurance_payout),
+    )
+
+
+def portfolio_risk(result, confidence=CONFIDENCE):
+    """Loss ratio, VaR, TVaR and required reserve of the simulated annual claims.
+
+    Check ``enough_years`` before trusting the tail: with fewer than
+    ``min_years(confidence)`` years, VaR and TVaR rest on a handful of the
+    worst years.
+    """
+    claims = np.sort(result.claims)
+    # Value at risk: the smallest claim total not exceeded with probability `confidence`
+    value_at_risk = float(claims[_var_index(confidence, len(claims))])
+    tail_value_at_risk = float(claims[claims >= value_at_risk].mean())
+    expected_claims = float(claims.mean())
+    return PortfolioRisk(
+        confidence=float(confidence),
+        n_years=len(claims),
+        premiums=result.premiums,
+        expected_claims=expected_claims,
+        loss_ratio=expected_claims / result.premiums if result.premiums else float("nan"),
+        value_at_risk=value_at_risk,
+        tail_value_at_risk=tail_value_at_risk,
+        reserve=max(tail_value_at_risk - result.premiums, 0.0),
+        prob_shortfall=float((claims > result.premiums).mean()),
+    )
@@ -0,0 +1,61 @@
+"""Insurance premium solvers.
+
+Expected claims are also the break-even premium: insurance only moves money
+from normal years to bad ones, so a farmer's expected profit is the same
+with and without it exactly when the premium equals the expected payout.
+Target premiums price the same expected claims for a chosen loss ratio or
+insurer margin. Results are cached per parameter set, so the Customize page
+can recompute them on every slider move.
+"""
+from functools import lru_cache
+
+SCHEDULE_COLUMNS = (
+    "Return Period",
+    "Expected Claims ($)",
+    "Target Loss Ratio Premium ($)",
+    "Target Margin Premium ($)",
+    "Loss Ratio at Current Premium",
+)
+
+
+def expected_claims(params, bad_year_probability):
+    # Average payout per policy per season
+    return bad_year_probability * params.insurance_payout
+
+
+def target_loss_ratio_premium(params, bad_year_probability, loss_ratio):
+    # Premium at which expected claims are ``loss_ratio`` of the premium
+    return expected_claims(params, bad_year_probability) / loss_ratio
+
+
+def target_margin_premium(params, bad_year_probability, margin):
+    # Premium that leaves the insurer ``margin`` of the premium after expected claims
+    return expected_claims(params, bad_year_probability) / (1 - margin)
+
+
+@lru_cache(maxsize=256)
+def _schedule_rows(params, return_periods, loss_ratio, margin):
+    # Cached rows are tuples, so callers cannot change what later calls get
+    rows = []
+    for label, chance in return_periods:
+        probability = chance / 100
+        claims = expected_claims(params, probability)
+        rows.append((
+            label,
+            round(claims, 2),
+            round(target_loss_ratio_premium(params, probability, loss_ratio), 2),
+            round(target_margin_premium(params, probability, margin), 2),
+            f"{claims / params.insurance_premium:.0%}" if params.insurance_premium else "n/a",
+        ))
+    return tuple(rows)
+
+
+def premium_schedule(params, return_periods, loss_ratio, margin):
+    """One row per return period with the solved premiums.
+
+    ``return_periods`` maps each label to its chance of a bad year in percent,
+    like ``RETURN_PERIOD_OPTIONS`` or ``farming.ui.return_period_options()``.
+    Every call returns new row dicts.
+    """
+    rows = _schedule_rows(params, tuple(return_periods.items()), loss_ratio, margin)
+    return [dict(zip(SCHEDULE_COLUMNS, row)) for row in rows]
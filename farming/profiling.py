@@ -0,0 +1,98 @@
+"""Opt-in per-rerun profiling: section timings and payload sizes.
+
+A ``RerunProfiler`` lives in the session state while profiling is switched on
+(see ``farming.ui.start_profiling``). Every page rerun records how long each
+named section took and roughly how many bytes each chart or table sent to
+the browser, so slow pages can be narrowed down to the step responsible.
+"""
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+
+MAX_SAMPLES = 20_000  # Oldest samples are dropped beyond this
+TOTAL_SECTION = "Total rerun"
+PERCENTILES = (50, 95)
+
+
+def payload_size(value):
+    """Approximate bytes sent to the browser for a chart, table or text."""
+    import pandas as pd
+
+    if hasattr(value, "to_plotly_json"):
+        # Plotly figures are shipped as JSON
+        return len(value.to_json().encode("utf-8"))
+    if isinstance(value, pd.DataFrame):
+        # DataFrames are shipped as Arrow IPC, as st.dataframe does
+        import pyarrow as pa
+
+        sink = pa.BufferOutputStream()
+        table = pa.Table.from_pandas(value, preserve_index=False)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().size
+    return len(str(value).encode("utf-8"))
+
+
+class RerunProfiler:
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.timings = deque(maxlen=max_samples)  # (rerun, page, section, seconds)
+        self.payloads = deque(maxlen=max_samples)  # (rerun, page, name, bytes)
+        self.reruns = 0
+        self.page = None
+        self._rerun_start = None
+
+    def begin_rerun(self, page):
+        self.reruns += 1
+        self.page = page
+        self._rerun_start = time.perf_counter()
+
+    def end_rerun(self):
+        # Records the whole rerun up to this point as its own section
+        if self._rerun_start is not None:
+            self.record(TOTAL_SECTION, time.perf_counter() - self._rerun_start)
+            self._rerun_start = None
+
+    def record(self, section, seconds):
+        self.timings.append((self.reruns, self.page, section, seconds))
+
+    def record_payload(self, name, value):
+        self.payloads.append((self.reruns, self.page, name, payload_size(value)))
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timings_frame(self):
+        import pandas as pd
+
+        frame = pd.DataFrame(list(self.timings), columns=["rerun", "page", "section", "seconds"])
+        frame["milliseconds"] = frame["seconds"] * 1000
+        return frame
+
+    def payloads_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(list(self.payloads), columns=["rerun", "page", "name", "bytes"])
+
+    def section_summary(self, page=None):
+        # Latency per section in milliseconds: count, mean, percentiles and max
+        frame = self.timings_frame()
+        if page is not None:
+            frame = frame[frame["page"] == page]
+        grouped = frame.groupby("section", sort=False)["milliseconds"]
+        summary = grouped.agg(["count", "mean", "max"])
+        for q in PERCENTILES:
+            summary[f"p{q}"] = grouped.quantile(q / 100)
+        return summary[["count", "mean", *(f"p{q}" for q in PERCENTILES), "max"]].round(2).reset_index()
+
+    def to_json(self):
+        return json.dumps({
+            "reruns": self.reruns,
+            "timings": [dict(zip(("rerun", "page", "section", "seconds"), row)) for row in self.timings],
+            "payloads": [dict(zip(("rerun", "page", "name", "bytes"), row)) for row in self.payloads],
+        })
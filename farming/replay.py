@@ -0,0 +1,232 @@
+"""Event-sourced simulation history.
+
+A run log stores only the session seed and, for every click, a snapshot of
+the parameters, the weather risk and how many seasons were drawn. That is
+enough to rebuild any part of the history bit-for-bit, so long histories can
+be regenerated on demand instead of kept in memory.
+
+``ReplayLog`` records one strategy per click (The Farming Challenge);
+``RaceLog`` records seasons shared by every persona (the persona race).
+"""
+import bisect
+import json
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from farming.config import FarmingParameters, validate_config
+from farming.history import RACE_COLUMNS, SeasonHistory
+from farming.rng import SeasonStream
+from farming.simulation import PERSONAS, SEED_TYPES, persona_profit_matrix, simulate_seasons
+from farming.summary import SeasonSummary
+
+
+@dataclass(frozen=True)
+class SimulationEvent:
+    start: int  # Stream position of the event's first draw
+    count: int  # Seasons drawn
+    bad_year_probability: float
+    seed_type: str
+    insurance: bool
+    params: FarmingParameters
+
+
+@dataclass(frozen=True)
+class RaceEvent:
+    start: int  # Stream position of the event's first draw
+    count: int  # Seasons drawn
+    bad_year_probability: float
+    params: FarmingParameters
+
+
+def _non_negative_int(value, name, minimum=0):
+    # JSON integers only; bools and floats are rejected
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{name} must be an integer of at least {minimum}, got {value!r}")
+    return value
+
+
+def _common_fields(raw, previous_end, fields):
+    # Checks the fields every event has and returns them parsed; ``fields`` lists all of the event's fields
+    if not isinstance(raw, dict) or set(raw) != set(fields):
+        raise ValueError(f"every event needs exactly the fields {', '.join(fields)}")
+    start = _non_negative_int(raw["start"], "start")
+    if start < previous_end:
+        raise ValueError(f"event starting at draw {start} overlaps the previous event, which ends at draw {previous_end}")
+    probability = raw["bad_year_probability"]
+    if isinstance(probability, bool) or not isinstance(probability, (int, float)) or not 0 <= probability <= 1:
+        raise ValueError(f"bad_year_probability must be a number between 0 and 1, got {probability!r}")
+    return {
+        "start": start,
+        "count": _non_negative_int(raw["count"], "count", minimum=1),
+        "bad_year_probability": float(probability),
+        "params": FarmingParameters.from_mapping(validate_config(raw["params"], source="run log")),
+    }
+
+
+def parse_event(raw, previous_end):
+    """``SimulationEvent`` from its JSON form, raising ValueError unless every field is valid.
+
+    Events must follow each other in the stream, starting at or after ``previous_end``.
+    """
+    fields = _common_fields(raw, previous_end, ("start", "count", "bad_year_probability", "seed_type", "insurance", "params"))
+    if raw["seed_type"] not in SEED_TYPES:
+        raise ValueError(f"seed_type must be one of {', '.join(SEED_TYPES)}, got {raw['seed_type']!r}")
+    if not isinstance(raw["insurance"], bool):
+        raise ValueError(f"insurance must be true or false, got {raw['insurance']!r}")
+    return SimulationEvent(seed_type=raw["seed_type"], insurance=raw["insurance"], **fields)
+
+
+def parse_race_event(raw, previous_end):
+    # ``RaceEvent`` from its JSON form, validated like ``parse_event``
+    return RaceEvent(**_common_fields(raw, previous_end, ("start", "count", "bad_year_probability", "params")))
+
+
+def season_results(event, uniforms):
+    # Year types and rounded money columns for the draws of one event
+    is_bad = uniforms < event.bad_year_probability
+    revenue, costs, profit = simulate_seasons(event.params, event.seed_type, event.insurance, is_bad)
+    return is_bad, np.round(revenue, 2), np.round(costs, 2), np.round(profit, 2)
+
+
+def race_results(event, uniforms):
+    # Year types and the (seasons x personas) net profit for the draws of one race event
+    is_bad = uniforms < event.bad_year_probability
+    return is_bad, persona_profit_matrix(event.params, is_bad)
+
+
+class EventLog:
+    """Seeded stream plus the events drawn from it.
+
+    Subclasses set how an event's uniform draws become results
+    (``results``), how a saved event is parsed (``parse_event``) and what an
+    empty window looks like (``empty_results``).
+    """
+
+    results = None
+    parse_event = None
+
+    def __init__(self, seed=None):
+        self.stream = SeasonStream(seed)
+        self.events = []
+        self._offsets = [0]  # Season index at which each event starts, plus the total
+
+    @property
+    def seed(self):
+        return self.stream.seed
+
+    def __len__(self):
+        return self._offsets[-1]
+
+    def empty_results(self):
+        raise NotImplementedError
+
+    def _record(self, event):
+        # Draw the event's seasons, append it to the log and return its results
+        uniforms = self.stream.random(event.count)
+        self.events.append(event)
+        self._offsets.append(self._offsets[-1] + event.count)
+        return self.results(event, uniforms)
+
+    def replay(self, start=0, stop=None):
+        """Regenerate seasons [start, stop) as arrays, in the same form ``run`` returns them."""
+        if start < 0 or stop is not None and stop < start:
+            raise ValueError(f"expected 0 <= start <= stop, got start={start}, stop={stop}")
+        stop = len(self) if stop is None else min(stop, len(self))
+        pieces = []
+        # Only the events overlapping the window are replayed, each from its exact stream position
+        first = max(bisect.bisect_right(self._offsets, start) - 1, 0)
+        for index in range(first, len(self.events)):
+            event_start = self._offsets[index]
+            if event_start >= stop:
+                break
+            event = self.events[index]
+            skip = max(start - event_start, 0)
+            take = min(stop, event_start + event.count) - event_start - skip
+            pieces.append(self.results(event, self.stream.replay(event.start + skip, take)))
+
+        if not pieces:
+            return self.empty_results()
+        return tuple(np.concatenate(column) for column in zip(*pieces))
+
+    # --- Serialization ---
+    def to_json(self):
+        return json.dumps({
+            "seed": str(self.seed),
+            "events": [
+                {**asdict(event), "params": event.params.to_dict()}
+                for event in self.events
+            ],
+        })
+
+    @classmethod
+    def from_json(cls, text):
+        """Log saved by ``to_json``; raises ValueError for anything that could not have been saved by it."""
+        data = json.loads(text)
+        if not isinstance(data, dict) or not isinstance(data.get("events"), list):
+            raise ValueError("a run log needs a seed and a list of events")
+        seed = data.get("seed")
+        # Seeds are saved as strings, since they can exceed the range of JSON numbers in some readers
+        if not isinstance(seed, str) or not seed.isdigit():
+            raise ValueError(f"seed must be a non-negative integer, got {seed!r}")
+        log = cls(int(seed))
+        previous_end = 0
+        for raw in data["events"]:
+            event = cls.parse_event(raw, previous_end)
+            previous_end = event.start + event.count
+            log.events.append(event)
+            log._offsets.append(log._offsets[-1] + event.count)
+        # Continue the stream after the last recorded draw
+        if log.events:
+            last = log.events[-1]
+            log.stream.generator.bit_generator.advance(last.start + last.count)
+            log.stream.position = last.start + last.count
+        return log
+
+
+class ReplayLog(EventLog):
+    results = staticmethod(season_results)
+    parse_event = staticmethod(parse_event)
+
+    def empty_results(self):
+        return np.zeros(0, dtype=bool), np.zeros(0), np.zeros(0), np.zeros(0)
+
+    def run(self, params, seed_type, insurance, bad_year_probability, n_seasons):
+        """Draw and simulate ``n_seasons`` new seasons, recording the event."""
+        return self._record(SimulationEvent(
+            self.stream.position, int(n_seasons), float(bad_year_probability), seed_type, bool(insurance), params
+        ))
+
+    def rebuild(self, history_factory=SeasonHistory):
+        # Full history and SeasonSummary, replayed one event at a time
+        history, summary = history_factory(), SeasonSummary()
+        for index in range(len(self.events)):
+            is_bad, revenue, costs, profit = self.replay(self._offsets[index], self._offsets[index + 1])
+            history.append(year_type=is_bad.astype(np.uint8), revenue=revenue, costs=costs, net_profit=profit)
+            summary.update(is_bad, revenue, costs, profit)
+        return history, summary
+
+
+class RaceLog(EventLog):
+    """Run log of the persona race: every season is shared by all ``PERSONAS``."""
+
+    results = staticmethod(race_results)
+    parse_event = staticmethod(parse_race_event)
+
+    def empty_results(self):
+        return np.zeros(0, dtype=bool), np.zeros((0, len(PERSONAS)))
+
+    def run(self, params, bad_year_probability, n_seasons=1):
+        """Draw ``n_seasons`` new race seasons, recording the event."""
+        return self._record(RaceEvent(self.stream.position, int(n_seasons), float(bad_year_probability), params))
+
+    def rebuild(self, history_factory=SeasonHistory):
+        # Race history with the year type and every persona's net profit, replayed one event at a time
+        history = history_factory(RACE_COLUMNS)
+        for index in range(len(self.events)):
+            is_bad, profits = self.replay(self._offsets[index], self._offsets[index + 1])
+            history.append(
+                year_type=is_bad.astype(np.uint8),
+                **{persona["name"]: profits[:, column] for column, persona in enumerate(PERSONAS)}
+            )
+        return history
@@ -0,0 +1,39 @@
+"""Seeded, replayable random number streams.
+
+Each session owns a ``SeasonStream``: a PCG64 generator seeded through a
+``SeedSequence``. Every uniform draw advances the stream by exactly one step,
+so any range of past draws can be regenerated by jumping straight to it.
+"""
+import numpy as np
+
+
+def new_seed():
+    # Fresh 128-bit entropy from the operating system
+    return int(np.random.SeedSequence().entropy)
+
+
+def make_generator(seed):
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed)))
+
+
+class SeasonStream:
+    def __init__(self, seed=None):
+        self.seed = new_seed() if seed is None else int(seed)
+        self.generator = make_generator(self.seed)
+        self.position = 0  # Uniform draws consumed so far
+
+    def random(self, size):
+        # Same interface as Generator.random, counting the draws it consumes
+        values = self.generator.random(size)
+        self.position += values.size
+        return values
+
+    def replay(self, start, count):
+        # Regenerate draws [start, start + count) without touching the live generator
+        bit_generator = np.random.PCG64(np.random.SeedSequence(self.seed))
+        bit_generator.advance(start)
+        return np.random.Generator(bit_generator).random(count)
+
+    def spawn(self):
+        # Independent generator for side simulations that don't need replaying
+        return np.random.Generator(np.random.PCG64(self.generator.bit_generator.seed_seq.spawn(1)[0]))
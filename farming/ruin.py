@@ -0,0 +1,100 @@
+"""Multi-year risk-of-ruin simulation.
+
+Each simulated farmer starts with some capital and farms for ``n_years``.
+Every year:
+
+1. Cash costs (traditional seeds, insurance premium) are paid from capital;
+   any shortfall is borrowed.
+2. High-quality seeds are always bought with a loan.
+3. The harvest (and any insurance payout) is added to capital.
+4. Loan interest accrues on everything owed, including unpaid balances
+   carried over from earlier years.
+5. As much debt as possible is repaid from capital; the rest carries over.
+
+A farmer whose outstanding debt exceeds the credit limit is bankrupt and
+stops farming. All farmers and personas are simulated together as arrays,
+so the cost grows linearly in farmers x years with no per-farmer loop.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from farming.simulation import PERSONAS, draw_bad_years
+
+
+@dataclass
+class RuinResult:
+    n_years: int
+    ruin_probability: np.ndarray  # (personas,) share of farmers bankrupt by the last year
+    mean_years_to_ruin: np.ndarray  # (personas,) among bankrupt farmers; NaN if none
+    survival: np.ndarray  # (n_years + 1, personas) share still farming after each year
+    final_net_worth: np.ndarray  # (farmers, personas) capital minus debt at the end
+
+
+def persona_cash_flows(params, personas=PERSONAS):
+    # Per-persona arrays: cash costs, loan principal, revenue in normal and bad years
+    is_traditional = np.array([persona["seed_type"] == "Traditional" for persona in personas])
+    insured = np.array([persona["insurance"] for persona in personas])
+
+    cash_costs = np.where(is_traditional, params.traditional_seed_cost, 0.0) + np.where(insured, params.insurance_premium, 0.0)
+    loan_principal = np.where(is_traditional, 0.0, params.high_quality_seed_cost)
+    normal_revenue = np.where(is_traditional, params.traditional_yield_revenue, params.high_quality_yield_revenue).astype(float)
+    bad_revenue = np.where(insured, params.insurance_payout, 0.0)
+    return cash_costs, loan_principal, normal_revenue, bad_revenue
+
+
+def simulate_ruin(params, bad_year_probability, n_farmers, n_years, starting_capital,
+                  credit_limit=None, personas=PERSONAS, rng=None):
+    """Simulate ``n_farmers`` paths of ``n_years`` for every persona.
+
+    All personas face the same weather on a given path. ``credit_limit``
+    defaults to two seasons of high-quality seed loans including interest.
+    """
+    if credit_limit is None:
+        credit_limit = 2 * params.high_quality_cost
+    rng = np.random.default_rng() if rng is None else rng
+    cash_costs, loan_principal, normal_revenue, bad_revenue = persona_cash_flows(params, personas)
+    interest = 1 + params.loan_interest_rate / 100
+
+    shape = (n_farmers, len(personas))
+    capital = np.full(shape, float(starting_capital))
+    debt = np.zeros(shape)
+    ruin_year = np.zeros(shape, dtype=np.int32)  # 0 means still farming
+
+    for year in range(1, n_years + 1):
+        active = ruin_year == 0
+        if not active.any():
+            break
+        is_bad = draw_bad_years(n_farmers, bad_year_probability, rng)[:, None]
+
+        # Pay cash costs, borrowing any shortfall, and take the seed loan
+        cash = capital - cash_costs
+        owed = debt + np.maximum(-cash, 0.0) + loan_principal
+        cash = np.maximum(cash, 0.0)
+
+        # Harvest, accrue interest, then repay what we can
+        cash += np.where(is_bad, bad_revenue, normal_revenue)
+        owed *= interest
+        repayment = np.minimum(owed, cash)
+
+        capital = np.where(active, cash - repayment, capital)
+        debt = np.where(active, owed - repayment, debt)
+        ruin_year[active & (debt > credit_limit)] = year
+
+    ruined = ruin_year > 0
+    n_ruined = ruined.sum(axis=0)
+    with np.errstate(invalid="ignore"):
+        mean_years_to_ruin = np.where(ruined, ruin_year, 0).sum(axis=0) / n_ruined
+
+    # Survival curve from the count of bankruptcies in each year
+    ruined_per_year = np.stack([np.bincount(ruin_year[:, j], minlength=n_years + 1) for j in range(len(personas))], axis=1)
+    ruined_per_year[0] = 0
+    survival = 1 - np.cumsum(ruined_per_year, axis=0) / n_farmers
+
+    return RuinResult(
+        n_years=n_years,
+        ruin_probability=n_ruined / n_farmers,
+        mean_years_to_ruin=mean_years_to_ruin,
+        survival=survival,
+        final_net_worth=capital - debt,
+    )
@@ -0,0 +1,96 @@
+"""Vectorized season engine.
+
+Every function works on whole arrays of seasons at once: a single click on
+"Run Simulation" is simply the N=1 case of a batch run. ``params`` is a
+``farming.config.FarmingParameters``.
+"""
+import numpy as np
+
+YEAR_TYPES = ("Normal", "Bad")
+SEED_TYPES = ("Traditional", "High Quality")
+
+# Return period label -> chance of a bad year (%)
+RETURN_PERIOD_OPTIONS = {
+    "Once in 2 years (50% chance per year)": 50,
+    "Once in 5 years (20% chance per year)": 20,
+    "Once in 10 years (10% chance per year)": 10,
+    "Once in 20 years (5% chance per year)": 5,
+    "Once in 50 years (2% chance per year)": 2,
+    "Once in 100 years (1% chance per year)": 1,
+}
+
+# --- Personas ---
+PERSONAS = [
+    {"name": "Traditional_No_Insurance", "seed_type": "Traditional", "insurance": False},
+    {"name": "Traditional_With_Insurance", "seed_type": "Traditional", "insurance": True},
+    {"name": "High_Quality_No_Insurance", "seed_type": "High Quality", "insurance": False},
+    {"name": "High_Quality_With_Insurance", "seed_type": "High Quality", "insurance": True},
+]
+
+
+# --- Weather ---
+def draw_bad_years(n_seasons, bad_year_probability, rng=None):
+    # One uniform draw per season; True marks a bad year
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.random(n_seasons) < bad_year_probability
+
+
+def draw_bad_year_paths(n_paths, bad_year_probabilities, rng=None):
+    # (paths x seasons) bad years in one call; season t uses bad_year_probabilities[t]
+    rng = np.random.default_rng() if rng is None else rng
+    probabilities = np.asarray(bad_year_probabilities, dtype=float)
+    return rng.random((n_paths, len(probabilities))) < probabilities
+
+
+def year_type_labels(is_bad):
+    # Map the boolean weather array back to "Normal"/"Bad" labels
+    return np.where(is_bad, YEAR_TYPES[1], YEAR_TYPES[0])
+
+
+# --- Costs and Revenue ---
+def seed_economics(params, seed_type):
+    # Returns (cost, revenue in a normal year) for the chosen seed type
+    if seed_type == "Traditional":
+        return params.traditional_seed_cost, params.traditional_yield_revenue
+    # High-quality seeds are bought with a loan, so the cost includes interest
+    return params.high_quality_cost, params.high_quality_yield_revenue
+
+
+def season_outcomes(params, seed_type, insurance):
+    # Returns (revenue in a normal year, revenue in a bad year, costs) for one strategy
+    seed_cost, yield_revenue = seed_economics(params, seed_type)
+
+    # Insurance: the premium is always paid, the payout only arrives in bad years
+    if insurance:
+        return yield_revenue, params.insurance_payout, seed_cost + params.insurance_premium
+    # Crops fail in a bad year; costs are paid regardless of the weather
+    return yield_revenue, 0, seed_cost
+
+
+def simulate_seasons(params, seed_type, purchase_insurance, is_bad):
+    """Revenue, costs and net profit arrays for every season in ``is_bad``."""
+    is_bad = np.asarray(is_bad, dtype=bool)
+    normal_revenue, bad_revenue, cost = season_outcomes(params, seed_type, purchase_insurance)
+
+    revenue = np.where(is_bad, float(bad_revenue), float(normal_revenue))
+    costs = np.full(is_bad.shape, float(cost))
+    profit = revenue - costs
+    return revenue, costs, profit
+
+
+def persona_profits(params, personas=PERSONAS):
+    # Net profit of every persona in a normal and in a bad year
+    outcomes = np.array(
+        [season_outcomes(params, persona["seed_type"], persona["insurance"]) for persona in personas],
+        dtype=float
+    )
+    normal_profit = outcomes[:, 0] - outcomes[:, 2]
+    bad_profit = outcomes[:, 1] - outcomes[:, 2]
+    return normal_profit, bad_profit
+
+
+def persona_profit_matrix(params, is_bad, personas=PERSONAS):
+    """Net profit as a (seasons x personas) matrix for the weather in ``is_bad``."""
+    normal_profit, bad_profit = persona_profits(params, personas)
+    is_bad = np.asarray(is_bad, dtype=bool)
+    return np.where(is_bad[:, None], bad_profit, normal_profit)
@@ -0,0 +1,123 @@
+"""History that spills to disk so per-session memory stays flat.
+
+``SpillingHistory`` keeps only the most recent seasons in a ``SeasonHistory``.
+Older seasons are written in fixed-size chunks to Arrow IPC files in a
+per-history directory, and read back through memory maps without copying.
+The directory is deleted when the history is garbage collected, e.g. when a
+session ends or its history is reset.
+"""
+import bisect
+import os
+import shutil
+import tempfile
+import weakref
+from pathlib import Path
+
+import numpy as np
+
+from farming.history import SEASON_COLUMNS, SeasonHistory
+from farming.simulation import YEAR_TYPES
+
+RECENT_ROWS = 50_000  # Seasons always kept in memory
+CHUNK_ROWS = 100_000  # Seasons per file on disk
+
+
+def spill_root():
+    # Override with FARMING_SPILL_DIR, e.g. to use a larger local disk
+    return Path(os.environ.get("FARMING_SPILL_DIR", Path(tempfile.gettempdir()) / "farming_sessions"))
+
+
+class SpillingHistory:
+    def __init__(self, columns=SEASON_COLUMNS, recent_rows=RECENT_ROWS, chunk_rows=CHUNK_ROWS, directory=None):
+        self._schema = dict(columns)
+        self._recent_rows = recent_rows
+        self._chunk_rows = chunk_rows
+        self._recent = SeasonHistory(self._schema)
+        self._chunk_paths = []
+        self._offsets = [0]  # First season stored in each chunk file, plus the number spilled
+
+        root = Path(directory) if directory is not None else spill_root()
+        root.mkdir(parents=True, exist_ok=True)
+        self.directory = Path(tempfile.mkdtemp(prefix="history-", dir=root))
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.directory, True)
+
+    def __len__(self):
+        return self._offsets[-1] + len(self._recent)
+
+    @property
+    def spilled_rows(self):
+        return self._offsets[-1]
+
+    @property
+    def nbytes(self):
+        # Memory held by this session; spilled seasons only live in the page cache
+        return self._recent.nbytes
+
+    def append(self, **values):
+        self._recent.append(**values)
+        if len(self._recent) >= self._recent_rows + self._chunk_rows:
+            self._spill()
+
+    def _spill(self):
+        # Write whole chunks of the oldest in-memory seasons to disk
+        n_spill = (len(self._recent) - self._recent_rows) // self._chunk_rows * self._chunk_rows
+        for start in range(0, n_spill, self._chunk_rows):
+            stop = start + self._chunk_rows
+            self._write_chunk({name: self._recent.column_slice(name, start, stop) for name in self._schema})
+
+        # Keep the rest in a fresh buffer so a large batch doesn't leave a large allocation behind
+        recent = SeasonHistory(self._schema, capacity=2 * (self._recent_rows + self._chunk_rows))
+        recent.append(**{name: self._recent.column_slice(name, n_spill, None) for name in self._schema})
+        self._recent = recent
+
+    def _write_chunk(self, columns):
+        import pyarrow as pa
+
+        path = self.directory / f"chunk_{len(self._chunk_paths):06d}.arrow"
+        batch = pa.record_batch([pa.array(array) for array in columns.values()], names=list(columns))
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        self._chunk_paths.append(path)
+        self._offsets.append(self._offsets[-1] + batch.num_rows)
+
+    def _read_chunk(self, index, name):
+        # Zero-copy view of one column of a chunk file through a memory map
+        import pyarrow as pa
+
+        batch = pa.ipc.open_file(pa.memory_map(str(self._chunk_paths[index]), "r")).get_batch(0)
+        return batch.column(name).to_numpy(zero_copy_only=True)
+
+    def column_chunks(self, name):
+        # Stream a column chunk by chunk, oldest first, without materializing it
+        for index in range(len(self._chunk_paths)):
+            yield self._read_chunk(index, name)
+        yield self._recent.column(name)
+
+    def column_slice(self, name, start, stop):
+        stop = len(self) if stop is None else min(stop, len(self))
+        pieces = []
+        # Only the chunk files overlapping [start, stop) are mapped
+        first = max(bisect.bisect_right(self._offsets, start) - 1, 0)
+        for index in range(first, len(self._chunk_paths)):
+            chunk_start = self._offsets[index]
+            if chunk_start >= stop:
+                break
+            pieces.append(self._read_chunk(index, name)[max(start - chunk_start, 0):stop - chunk_start])
+        spilled = self.spilled_rows
+        if stop > spilled:
+            pieces.append(self._recent.column_slice(name, max(start - spilled, 0), stop - spilled))
+        if not pieces:
+            return np.zeros(0, dtype=self._schema[name])
+        return np.concatenate(pieces) if len(pieces) > 1 else pieces[0]
+
+    def column(self, name):
+        # Whole column as one array; prefer column_chunks or column_slice for long histories
+        return np.concatenate(list(self.column_chunks(name)))
+
+    def year_types(self):
+        return np.asarray(YEAR_TYPES)[self.column("year_type")]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame({name: self.column(name) for name in self._schema})
@@ -0,0 +1,102 @@
+"""Mixed strategies beyond the four personas, and their efficient frontier.
+
+A strategy plants a ``seed_mix`` share of its land with high-quality seeds
+and insures a ``coverage`` share of it. Costs, revenues and payouts scale
+with those shares, so the four personas are the corners of the unit square.
+
+Every strategy faces the same weather, and its cumulative profit over ``n``
+seasons is linear in the shared number of bad years ``K``. Evaluating all
+candidates against the exact distribution of ``K`` (see ``farming.exact``) is
+therefore one (strategies x outcomes) array operation.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from farming.exact import bad_year_distribution
+from farming.simulation import seed_economics
+
+GRID_STEPS = 21  # Coverage and seed-mix steps: 0%, 5%, ..., 100%
+TAIL = 0.05  # Downside risk looks at the worst 5% of outcomes
+
+
+@dataclass
+class StrategyFrontier:
+    n_seasons: int
+    coverage: np.ndarray  # Insured share of the land, per strategy
+    seed_mix: np.ndarray  # High-quality share of the land, per strategy
+    mean: np.ndarray  # Expected cumulative profit
+    tail_mean: np.ndarray  # Expected cumulative profit in the worst ``tail`` of outcomes
+    prob_loss: np.ndarray  # Chance of a cumulative net loss
+    frontier: np.ndarray  # Indices of the efficient strategies, by increasing risk
+
+    @property
+    def downside_risk(self):
+        # How far the worst outcomes fall below the expected profit
+        return self.mean - self.tail_mean
+
+
+def strategy_grid(steps=GRID_STEPS):
+    # Every (coverage, seed_mix) pair on a square grid, flattened
+    fractions = np.linspace(0, 1, steps)
+    coverage, seed_mix = np.meshgrid(fractions, fractions, indexing="ij")
+    return coverage.ravel(), seed_mix.ravel()
+
+
+def mixed_strategy_profits(params, coverage, seed_mix):
+    """Net profit of each strategy in a normal and in a bad year."""
+    coverage, seed_mix = np.asarray(coverage, dtype=float), np.asarray(seed_mix, dtype=float)
+    traditional_cost, traditional_revenue = seed_economics(params, "Traditional")
+    high_quality_cost, high_quality_revenue = seed_economics(params, "High Quality")
+
+    costs = (1 - seed_mix) * traditional_cost + seed_mix * high_quality_cost + coverage * params.insurance_premium
+    normal_profit = (1 - seed_mix) * traditional_revenue + seed_mix * high_quality_revenue - costs
+    # Crops fail in a bad year; only the insured share pays out
+    bad_profit = coverage * params.insurance_payout - costs
+    return normal_profit, bad_profit
+
+
+def tail_means(values, pmf, tail=TAIL):
+    """Expected value of the worst ``tail`` probability mass of each row of ``values``."""
+    order = np.argsort(values, axis=1)
+    sorted_values = np.take_along_axis(values, order, axis=1)
+    sorted_pmf = pmf[order]
+    mass_before = np.cumsum(sorted_pmf, axis=1) - sorted_pmf
+    weights = np.clip(tail - mass_before, 0, sorted_pmf)
+    return (sorted_values * weights).sum(axis=1) / weights.sum(axis=1)
+
+
+def efficient_frontier(mean, risk):
+    """Indices of the strategies no other strategy beats on both mean and risk, by increasing risk."""
+    order = np.lexsort((-mean, risk))
+    best_so_far = np.maximum.accumulate(mean[order])
+    # Efficient: strictly better mean than every less risky strategy
+    improves = np.concatenate(([True], mean[order][1:] > best_so_far[:-1]))
+    return order[improves]
+
+
+def optimize_strategies(params, bad_year_probability, n_seasons, coverage=None, seed_mix=None, tail=TAIL):
+    """Mean and downside risk of every candidate strategy over ``n_seasons``, with the efficient frontier.
+
+    Candidates default to the full ``strategy_grid``.
+    """
+    if coverage is None or seed_mix is None:
+        coverage, seed_mix = strategy_grid()
+    normal_profit, bad_profit = mixed_strategy_profits(params, coverage, seed_mix)
+
+    k, pmf = bad_year_distribution(n_seasons, bad_year_probability)
+    # Cumulative profit of every strategy for every possible number of bad years
+    values = n_seasons * normal_profit[:, None] + k[None, :] * (bad_profit - normal_profit)[:, None]
+
+    mean = values @ pmf
+    tail_mean = tail_means(values, pmf, tail)
+    prob_loss = (values < 0) @ pmf
+    return StrategyFrontier(
+        n_seasons=int(n_seasons),
+        coverage=np.asarray(coverage, dtype=float),
+        seed_mix=np.asarray(seed_mix, dtype=float),
+        mean=mean,
+        tail_mean=tail_mean,
+        prob_loss=prob_loss,
+        frontier=efficient_frontier(mean, mean - tail_mean),
+    )
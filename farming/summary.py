@@ -0,0 +1,60 @@
+"""Running aggregates for the Farming Season Summary.
+
+The totals, year-type counts and profit moments are updated once per appended
+batch, so rendering the summary never has to walk the full history.
+"""
+import math
+
+import numpy as np
+
+from farming.simulation import YEAR_TYPES
+
+
+class SeasonSummary:
+    def __init__(self):
+        self.seasons = 0
+        self.total_revenue = 0.0
+        self.total_costs = 0.0
+        self.total_profit = 0.0
+        self.year_type_counts = {year_type: 0 for year_type in YEAR_TYPES}
+        self.min_profit = math.inf
+        self.max_profit = -math.inf
+        self.mean_profit = 0.0
+        self._profit_m2 = 0.0  # Sum of squared deviations from the mean
+
+    def update(self, is_bad, revenue, costs, profit):
+        # Fold a batch of seasons into the running aggregates
+        profit = np.asarray(profit, dtype=float)
+        n_new = profit.size
+        if n_new == 0:
+            return
+
+        bad_seasons = int(np.count_nonzero(is_bad))
+        self.year_type_counts[YEAR_TYPES[1]] += bad_seasons
+        self.year_type_counts[YEAR_TYPES[0]] += n_new - bad_seasons
+
+        self.total_revenue += float(np.sum(revenue))
+        self.total_costs += float(np.sum(costs))
+        self.total_profit += float(profit.sum())
+        self.min_profit = min(self.min_profit, float(profit.min()))
+        self.max_profit = max(self.max_profit, float(profit.max()))
+
+        # Merge the batch mean and variance into the running ones (Chan et al.)
+        batch_mean = float(profit.mean())
+        batch_m2 = float(np.sum((profit - batch_mean) ** 2))
+        n_total = self.seasons + n_new
+        delta = batch_mean - self.mean_profit
+        self.mean_profit += delta * n_new / n_total
+        self._profit_m2 += batch_m2 + delta ** 2 * self.seasons * n_new / n_total
+        self.seasons = n_total
+
+    @property
+    def profit_variance(self):
+        # Sample variance of the net profit per season
+        if self.seasons < 2:
+            return 0.0
+        return self._profit_m2 / (self.seasons - 1)
+
+    @property
+    def profit_std(self):
+        return math.sqrt(self.profit_variance)
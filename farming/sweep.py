@@ -0,0 +1,100 @@
+"""Parameter sweeps: expected profit of every persona over a grid of settings.
+
+Expected profit per season is ``normal_profit + p * (bad_profit - normal_profit)``,
+so a whole grid of parameters and every return period is evaluated with
+array broadcasting. Very large grids are split across a process pool.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from farming.config import FarmingParameters
+from farming.simulation import PERSONAS, RETURN_PERIOD_OPTIONS, season_outcomes
+
+# Slider ranges on the Customize Your Farming Adventure page: name -> (label, min, max)
+SWEEP_PARAMETERS = {
+    "traditional_seed_cost": ("Traditional Seed Cost ($)", 0, 100),
+    "traditional_yield_revenue": ("Traditional Yield Revenue ($)", 0, 500),
+    "high_quality_seed_cost": ("High Quality Seed Cost ($)", 0, 200),
+    "loan_interest_rate": ("Loan Interest Rate (%)", 0.0, 20.0),
+    "high_quality_yield_revenue": ("High Quality Yield Revenue ($)", 0, 1000),
+    "insurance_premium": ("Insurance Premium ($)", 0, 100),
+    "insurance_payout": ("Insurance Payout ($)", 0, 500),
+}
+
+# Grids with more cells than this (parameter points x return periods) use a process pool
+POOL_THRESHOLD = 5_000_000
+
+
+@dataclass
+class SweepResult:
+    axes: dict  # Parameter name -> swept values, in grid axis order
+    bad_year_probabilities: np.ndarray  # (return periods,)
+    expected_profit: np.ndarray  # (return periods, *axis lengths, personas) per season
+
+    @property
+    def winner(self):
+        # Index of the persona with the highest expected profit at each grid point
+        return self.expected_profit.argmax(axis=-1)
+
+    @property
+    def best_profit(self):
+        return self.expected_profit.max(axis=-1)
+
+
+def sweep_axis(name, n_points):
+    # Evenly spaced values across a parameter's slider range
+    _, low, high = SWEEP_PARAMETERS[name]
+    return np.linspace(low, high, n_points)
+
+
+def _expected_profit_block(base, axes, bad_year_probabilities, personas):
+    # Expected profit for one block of the grid: (return periods, *axis lengths, personas)
+    grids = np.meshgrid(*axes.values(), indexing="ij")
+    values = base.to_dict()
+    values.update(zip(axes, grids))
+    values = dict(zip(values, np.broadcast_arrays(*values.values())))
+    grid_params = FarmingParameters(**values)
+
+    probabilities = np.asarray(bad_year_probabilities, dtype=float).reshape((-1,) + (1,) * len(axes))
+    expected = np.empty((len(probabilities),) + grids[0].shape + (len(personas),))
+    for index, persona in enumerate(personas):
+        normal_revenue, bad_revenue, cost = season_outcomes(grid_params, persona["seed_type"], persona["insurance"])
+        normal_profit = normal_revenue - cost
+        expected[..., index] = normal_profit + probabilities * (bad_revenue - normal_revenue)
+    return expected
+
+
+def run_sweep(params, axes, bad_year_probabilities=None, personas=PERSONAS, max_workers=None):
+    """Evaluate every persona over the grid spanned by ``axes``.
+
+    ``axes`` maps parameter names to 1-D arrays of values; parameters not
+    swept keep their value from ``params``. By default every return period
+    option is evaluated.
+    """
+    if bad_year_probabilities is None:
+        bad_year_probabilities = np.array(list(RETURN_PERIOD_OPTIONS.values())) / 100
+    bad_year_probabilities = np.asarray(bad_year_probabilities, dtype=float)
+    axes = {name: np.asarray(values, dtype=float) for name, values in axes.items()}
+
+    n_cells = len(bad_year_probabilities) * math.prod(len(values) for values in axes.values())
+    if n_cells <= POOL_THRESHOLD:
+        expected = _expected_profit_block(params, axes, bad_year_probabilities, personas)
+        return SweepResult(axes, bad_year_probabilities, expected)
+
+    # Split the first axis into one chunk per task and stitch the blocks back together
+    first_name, first_values = next(iter(axes.items()))
+    n_chunks = min(len(first_values), math.ceil(n_cells / POOL_THRESHOLD) * 2)
+    chunks = np.array_split(first_values, n_chunks)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        blocks = pool.map(
+            _expected_profit_block,
+            [params] * len(chunks),
+            [{**axes, first_name: chunk} for chunk in chunks],
+            [bad_year_probabilities] * len(chunks),
+            [personas] * len(chunks),
+        )
+        expected = np.concatenate(list(blocks), axis=1)
+    return SweepResult(axes, bad_year_probabilities, expected)
@@ -0,0 +1,34 @@
+"""Windowed table formatting: only the rows on screen are ever formatted."""
+import math
+
+import numpy as np
+
+from farming.simulation import YEAR_TYPES
+
+PAGE_SIZE = 50
+EMOJI_MAP = {"Normal": "🌞", "Bad": "🌩️"}  # Emojis for Year Types
+
+
+def page_count(n_rows, page_size=PAGE_SIZE):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def page_bounds(n_rows, page, page_size=PAGE_SIZE):
+    # Row range [start, stop) shown on a 1-based page
+    start = min((page - 1) * page_size, max(n_rows - 1, 0))
+    start -= start % page_size
+    return start, min(start + page_size, n_rows)
+
+
+def season_history_window(history, start, stop):
+    # Farming Season History rows [start, stop) of a SeasonHistory or SpillingHistory
+    import pandas as pd
+
+    year_labels = np.array([f"{EMOJI_MAP[year_type]} {year_type}" for year_type in YEAR_TYPES])
+    return pd.DataFrame({
+        "Farming Season": [f"Sim {index + 1}" for index in range(start, stop)],
+        "Year Type": year_labels[history.column_slice("year_type", start, stop)],
+        "Revenue ($)": history.column_slice("revenue", start, stop).astype(float).round(2),
+        "Costs ($)": history.column_slice("costs", start, stop).astype(float).round(2),
+        "Net Profit ($)": history.column_slice("net_profit", start, stop).astype(float).round(2),
+    })
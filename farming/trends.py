@@ -0,0 +1,109 @@
+"""Climate-trend scenarios: a bad-year probability that changes over time.
+
+A ``ClimateTrend`` moves the chance of a bad year from ``start_probability``
+to ``end_probability`` over ``horizon`` seasons, then holds it there:
+
+- "Linear": by the same amount every season;
+- "Exponential": by the same percentage every season;
+- "Step": all at once, at season ``horizon``.
+
+``probabilities`` turns a scenario into a per-season vector, so a whole set of
+paths is drawn in one call with ``draw_bad_year_paths``. Years stay
+independent, so the number of bad years over the trend is Poisson-binomial
+and, after it, binomial; ``trend_persona_distributions`` combines the two
+into exact odds for any horizon.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from farming.exact import bad_year_distribution, bad_year_profit_distribution, poisson_binomial_distribution
+from farming.simulation import PERSONAS, draw_bad_year_paths, persona_profits
+
+TREND_KINDS = ("None", "Linear", "Exponential", "Step")
+
+
+@dataclass(frozen=True)
+class ClimateTrend:
+    start_probability: float
+    end_probability: float
+    horizon: int  # Seasons until the end probability is reached
+    kind: str = "Linear"
+
+    def __post_init__(self):
+        if self.kind not in TREND_KINDS:
+            raise ValueError(f"kind must be one of {', '.join(TREND_KINDS)}, got {self.kind!r}")
+        for name in ("start_probability", "end_probability"):
+            if not 0 <= getattr(self, name) <= 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {getattr(self, name)!r}")
+        if self.horizon < 1:
+            raise ValueError(f"horizon must be at least 1, got {self.horizon!r}")
+
+    def probabilities(self, start, stop):
+        """Chance of a bad year for each of the seasons ``start`` to ``stop - 1`` (0-based)."""
+        seasons = np.arange(start, stop)
+        progress = np.minimum(seasons / self.horizon, 1.0)
+        p0, p1 = self.start_probability, self.end_probability
+        if self.kind == "None":
+            return np.full(len(seasons), p0)
+        if self.kind == "Step":
+            return np.where(seasons < self.horizon, p0, p1)
+        if self.kind == "Exponential" and p0 > 0 and p1 > 0:
+            return p0 * (p1 / p0) ** progress
+        # Linear, and exponential trends starting or ending at zero, which have no constant growth rate
+        return p0 + (p1 - p0) * progress
+
+
+def trend_profit_paths(params, trend, n_paths, n_seasons, personas=PERSONAS, rng=None):
+    """Cumulative profit per (path, season, persona) under ``trend``."""
+    bad_years = draw_bad_year_paths(n_paths, trend.probabilities(0, n_seasons), rng)
+    cumulative_bad = np.cumsum(bad_years, axis=1, dtype=np.int64)
+    seasons = np.arange(1, n_seasons + 1)
+
+    normal_profit, bad_profit = persona_profits(params, personas)
+    # A persona's total after t seasons only depends on how many of them were bad
+    return seasons[None, :, None] * normal_profit + cumulative_bad[:, :, None] * (bad_profit - normal_profit)
+
+
+def expected_season_profits(params, trend, n_seasons, personas=PERSONAS):
+    """Expected profit of each persona in each season, as a (seasons x personas) array."""
+    normal_profit, bad_profit = persona_profits(params, personas)
+    return normal_profit + trend.probabilities(0, n_seasons)[:, None] * (bad_profit - normal_profit)
+
+
+def trend_bad_year_distribution(trend, n_seasons):
+    """Support and probabilities of the number of bad years in the first ``n_seasons`` under ``trend``."""
+    # Every season from the horizon on has the same chance of a bad year
+    changing = min(int(n_seasons), trend.horizon)
+    k_trend, pmf_trend = poisson_binomial_distribution(trend.probabilities(0, changing))
+    k_after, pmf_after = bad_year_distribution(int(n_seasons) - changing, trend.probabilities(trend.horizon, trend.horizon + 1)[0])
+    pmf = np.convolve(pmf_trend, pmf_after)
+    return np.arange(len(pmf)) + k_trend[0] + k_after[0], pmf
+
+
+def trend_persona_distributions(params, trend, n_seasons, personas=PERSONAS):
+    # One exact ProfitDistribution per persona under ``trend``, keyed by persona name
+    k, pmf = trend_bad_year_distribution(trend, n_seasons)
+    normal_profit, bad_profit = persona_profits(params, personas)
+    return {
+        persona["name"]: bad_year_profit_distribution(normal, bad, int(n_seasons), k, pmf)
+        for persona, normal, bad in zip(personas, normal_profit.tolist(), bad_profit.tolist())
+    }
+
+
+def leader_shares(totals):
+    """Share of paths each persona leads in every season, from ``trend_profit_paths`` output."""
+    leaders = np.argmax(totals, axis=2)  # (paths, seasons)
+    n_personas = totals.shape[2]
+    return np.stack([(leaders == index).mean(axis=0) for index in range(n_personas)], axis=1)
+
+
+def rank_changes(scores):
+    """Seasons (0-based) where the order of the personas by ``scores`` changes, with the new order.
+
+    ``scores`` is a (seasons x personas) array; each order lists persona
+    indices from best to worst.
+    """
+    orders = np.argsort(-scores, axis=1, kind="stable")
+    changed = np.flatnonzero((orders[1:] != orders[:-1]).any(axis=1)) + 1
+    return [(int(season), orders[season]) for season in changed]
@@ -0,0 +1,153 @@
+"""Streamlit widgets shared by the pages.
+
+The table and climate helpers need numpy, so they are imported where they are
+used; a text-only page that only profiles itself loads none of them.
+"""
+import os
+from contextlib import contextmanager
+
+import streamlit as st
+
+from farming.profiling import TOTAL_SECTION, RerunProfiler
+
+# Profiling is switched on with FARMING_PROFILE=1 or by opening a page with ?profile=1
+PROFILE_ENV = "FARMING_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+TRUTHY = {"1", "true", "yes", "on"}
+
+
+def paged_table(n_rows, render_window, key, page_size=None):
+    """Show one page of a long table as an Arrow-backed ``st.dataframe``.
+
+    ``render_window(start, stop)`` builds the DataFrame for the visible rows,
+    so the cost of a rerun depends on the page size, not on ``n_rows``.
+    ``page_size`` defaults to ``farming.tables.PAGE_SIZE``.
+    """
+    from farming.tables import PAGE_SIZE, page_bounds, page_count
+
+    page_size = PAGE_SIZE if page_size is None else page_size
+    n_pages = page_count(n_rows, page_size)
+    page = 1
+    if n_pages > 1:
+        # Keep the selected page valid after the history shrinks (e.g. on reset).
+        # No ``value=``: the page starts at ``min_value``, and passing both a
+        # value and a session state entry for the key makes Streamlit warn.
+        if st.session_state.get(key, 1) > n_pages:
+            st.session_state[key] = n_pages
+        page = st.number_input(
+            f"Page (1–{n_pages})",
+            min_value=1,
+            max_value=n_pages,
+            step=1,
+            key=key
+        )
+
+    start, stop = page_bounds(n_rows, int(page), page_size)
+    window = render_window(start, stop)
+    st.dataframe(window, hide_index=True)
+    profile_payload(key, window)
+    st.caption(f"Showing rows {start + 1}–{stop} of {n_rows}")
+
+
+def return_period_options(report_errors=True):
+    """``RETURN_PERIOD_OPTIONS`` plus one historical option per station in the local climate files.
+
+    A station's bad years are those below the drought share of its median year
+    chosen on the Customize page. Unreadable files are skipped, with a warning
+    unless ``report_errors`` is false.
+    """
+    from farming.climate import DROUGHT_SHARE, climate_return_period_options
+    from farming.simulation import RETURN_PERIOD_OPTIONS
+
+    drought_share = st.session_state.get("drought_share", round(DROUGHT_SHARE * 100)) / 100
+    errors = []
+    options = {**RETURN_PERIOD_OPTIONS, **climate_return_period_options(drought_share, errors=errors)}
+    for file_name, message in errors if report_errors else ():
+        st.warning(f"Skipped climate file {file_name}: {message}")
+    return options
+
+
+def profiling_enabled():
+    if os.environ.get(PROFILE_ENV, "").lower() in TRUTHY:
+        return True
+    return st.query_params.get(PROFILE_QUERY_PARAM, "").lower() in TRUTHY
+
+
+def start_profiling(page):
+    """Start timing this rerun of ``page``; call right after ``st.set_page_config``."""
+    st.session_state["profiling_active"] = profiling_enabled()
+    if st.session_state["profiling_active"]:
+        if "profiler" not in st.session_state:
+            st.session_state["profiler"] = RerunProfiler()
+        st.session_state["profiler"].begin_rerun(page)
+
+
+def _active_profiler():
+    return st.session_state.get("profiler") if st.session_state.get("profiling_active") else None
+
+
+@contextmanager
+def profile_section(name):
+    # Times the enclosed block when profiling is on; does nothing otherwise
+    profiler = _active_profiler()
+    if profiler is None:
+        yield
+    else:
+        with profiler.section(name):
+            yield
+
+
+def profile_payload(name, value):
+    # Records the size of a chart, table or text sent to the browser
+    profiler = _active_profiler()
+    if profiler is not None:
+        profiler.record_payload(name, value)
+
+
+def profiling_panel():
+    """Close this rerun's timings and show the profiling panel; call at the end of every page."""
+    profiler = _active_profiler()
+    if profiler is None:
+        return
+    profiler.end_rerun()
+
+    import plotly.graph_objects as go
+
+    with st.expander("⏱️ Profiling", expanded=False):
+        st.caption(f"Rerun {profiler.reruns} of this session. Timings in milliseconds for the {profiler.page} page.")
+        summary = profiler.section_summary(profiler.page)
+        st.dataframe(summary, hide_index=True)
+
+        timings = profiler.timings_frame()
+        timings = timings[timings["page"] == profiler.page]
+        sections = list(summary["section"])
+        section = st.selectbox(
+            "Latency histogram for:",
+            sections,
+            index=sections.index(TOTAL_SECTION)
+        )
+        histogram_fig = go.Figure(
+            data=[go.Histogram(x=timings.loc[timings["section"] == section, "milliseconds"], nbinsx=30)]
+        )
+        histogram_fig.update_layout(xaxis_title="Milliseconds", yaxis_title="Reruns", template="plotly_white")
+        st.plotly_chart(histogram_fig)
+
+        payloads = profiler.payloads_frame()
+        st.markdown("**Payloads sent to the browser in this rerun:**")
+        st.dataframe(payloads[payloads["rerun"] == profiler.reruns][["name", "bytes"]], hide_index=True)
+
+        export_col1, export_col2 = st.columns(2)
+        with export_col1:
+            st.download_button(
+                "Download Profile (JSON)",
+                data=profiler.to_json(),
+                file_name="farming_profile.json",
+                mime="application/json"
+            )
+        with export_col2:
+            st.download_button(
+                "Download Timings (CSV)",
+                data=profiler.timings_frame().to_csv(index=False),
+                file_name="farming_timings.csv",
+                mime="text/csv"
+            )
@@ -0,0 +1,156 @@
+"""Multi-state weather with persistent droughts.
+
+Instead of one independent Normal/Bad draw per season, the weather moves
+between Normal, Moderate and Severe years as a Markov chain, so dry years
+can cluster. Each state has its own yield (share of the normal harvest) and
+insurance payout (share of ``insurance_payout``).
+
+``persistent_weather`` builds a chain whose long-run share of drought years
+(Moderate or Severe) equals the bad-year probability of the chosen return
+period, so the labels users pick keep their meaning. With no persistence and
+only Severe droughts it is exactly the original two-state model.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from farming.exact import summarize_distribution
+from farming.simulation import PERSONAS, seed_economics
+
+WEATHER_STATES = ("Normal", "Moderate", "Severe")
+NORMAL, MODERATE, SEVERE = range(len(WEATHER_STATES))
+
+# A moderate drought halves the harvest and pays half the insured payout
+MODERATE_YIELD = 0.5
+MODERATE_PAYOUT = 0.5
+
+
+@dataclass
+class MarkovWeather:
+    transition: np.ndarray  # transition[i, j]: chance that a state-i year is followed by a state-j year
+    yield_fraction: np.ndarray  # Share of the normal harvest in each state
+    payout_fraction: np.ndarray  # Share of the insurance payout in each state
+
+    def __post_init__(self):
+        self.transition = np.asarray(self.transition, dtype=float)
+        self.yield_fraction = np.asarray(self.yield_fraction, dtype=float)
+        self.payout_fraction = np.asarray(self.payout_fraction, dtype=float)
+        n_states = len(WEATHER_STATES)
+        if self.transition.shape != (n_states, n_states):
+            raise ValueError(f"transition must be a {n_states}x{n_states} matrix")
+        if (self.transition < 0).any() or not np.allclose(self.transition.sum(axis=1), 1):
+            raise ValueError("every row of transition must be probabilities summing to 1")
+        if self.yield_fraction.shape != (n_states,) or self.payout_fraction.shape != (n_states,):
+            raise ValueError(f"yield_fraction and payout_fraction need one value per state {WEATHER_STATES}")
+
+    @property
+    def cumulative_transition(self):
+        # Rows of cumulative probabilities: a uniform draw u moves to the first state whose bound exceeds u
+        return np.cumsum(self.transition, axis=1)
+
+    def stationary_distribution(self):
+        """Long-run share of years spent in each state."""
+        n_states = len(WEATHER_STATES)
+        # Solve pi @ P = pi together with sum(pi) = 1
+        system = np.vstack([self.transition.T - np.eye(n_states), np.ones(n_states)])
+        target = np.append(np.zeros(n_states), 1.0)
+        stationary = np.clip(np.linalg.lstsq(system, target, rcond=None)[0], 0, None)
+        return stationary / stationary.sum()
+
+    def drought_probability(self):
+        # Long-run chance that a year is a Moderate or Severe drought
+        return 1 - self.stationary_distribution()[NORMAL]
+
+    def mean_drought_length(self):
+        """Average number of consecutive drought years once a drought starts."""
+        stationary = self.stationary_distribution()[NORMAL + 1:]
+        if stationary.sum() <= 0:
+            return 0.0
+        ending = np.dot(stationary, self.transition[NORMAL + 1:, NORMAL]) / stationary.sum()
+        return float(1 / ending) if ending > 0 else float("inf")
+
+    def sample_paths(self, n_paths, n_seasons, rng=None):
+        """Weather states as a (paths x seasons) array of codes into ``WEATHER_STATES``.
+
+        The first year is drawn from the stationary distribution. Every later
+        year is one uniform draw per path, looked up in the row of the
+        cumulative transition table for the path's previous state.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        bounds = self.cumulative_transition[:, :-1]
+        initial_bounds = np.cumsum(self.stationary_distribution())[:-1]
+
+        states = np.empty((n_paths, n_seasons), dtype=np.uint8)
+        if n_seasons == 0:
+            return states
+        states[:, 0] = (rng.random(n_paths)[:, None] >= initial_bounds).sum(axis=1)
+        for season in range(1, n_seasons):
+            uniforms = rng.random(n_paths)
+            states[:, season] = (uniforms[:, None] >= bounds[states[:, season - 1]]).sum(axis=1)
+        return states
+
+
+def persistent_weather(bad_year_probability, persistence=0.0, severe_share=1.0,
+                       moderate_yield=MODERATE_YIELD, moderate_payout=MODERATE_PAYOUT):
+    """Markov weather whose long-run drought probability is ``bad_year_probability``.
+
+    ``persistence`` is the year-to-year correlation of drought (0 means
+    independent years). ``severe_share`` is the chance that a drought year is
+    Severe rather than Moderate.
+    """
+    p, rho, s = float(bad_year_probability), float(persistence), float(severe_share)
+    # Two-state drought chain with stationary probability p and lag-1 correlation rho
+    drought_after_normal = p * (1 - rho)
+    drought_after_drought = p + rho * (1 - p)
+
+    def row(drought_chance):
+        return [1 - drought_chance, drought_chance * (1 - s), drought_chance * s]
+
+    return MarkovWeather(
+        transition=[row(drought_after_normal), row(drought_after_drought), row(drought_after_drought)],
+        yield_fraction=[1.0, moderate_yield, 0.0],
+        payout_fraction=[0.0, moderate_payout, 1.0],
+    )
+
+
+def state_profits(params, weather, personas=PERSONAS):
+    """Net profit as a (states x personas) matrix."""
+    profits = np.empty((len(WEATHER_STATES), len(personas)))
+    for index, persona in enumerate(personas):
+        seed_cost, yield_revenue = seed_economics(params, persona["seed_type"])
+        revenue = weather.yield_fraction * yield_revenue
+        cost = seed_cost
+        if persona["insurance"]:
+            revenue = revenue + weather.payout_fraction * params.insurance_payout
+            cost = cost + params.insurance_premium
+        profits[:, index] = revenue - cost
+    return profits
+
+
+def longest_drought(states):
+    # Longest run of consecutive drought years on each path
+    longest = np.zeros(len(states), dtype=np.int64)
+    current = np.zeros(len(states), dtype=np.int64)
+    for season in range(states.shape[1]):
+        current = np.where(states[:, season] != NORMAL, current + 1, 0)
+        np.maximum(longest, current, out=longest)
+    return longest
+
+
+def weather_path_distributions(params, weather, states, personas=PERSONAS):
+    """Distribution of cumulative profit per persona over the sampled weather ``states``.
+
+    A path's profit only depends on how many years it spent in each state, so
+    paths are grouped by their state counts before the personas are priced.
+    """
+    n_paths, n_seasons = states.shape
+    counts = np.stack([(states == state).sum(axis=1) for state in range(len(WEATHER_STATES))], axis=1)
+    unique_counts, frequency = np.unique(counts, axis=0, return_counts=True)
+    pmf = frequency / n_paths
+
+    values = unique_counts @ state_profits(params, weather, personas)  # (count patterns x personas)
+    results = {}
+    for index, persona in enumerate(personas):
+        order = np.argsort(values[:, index], kind="stable")
+        results[persona["name"]] = summarize_distribution(n_seasons, values[order, index], pmf[order])
+    return results
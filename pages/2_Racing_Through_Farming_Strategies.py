@@ -1,13 +1,23 @@
 import streamlit as st
 import numpy as np
-import plotly.graph_objects as go
-import pandas as pd
-import json
+
+from farming.charts import PERSONA_EMOJIS, RaceChart
+from farming.config import FarmingParameters, load_config
+from farming.exact import exact_persona_distributions
+from farming.history import RACE_COLUMNS
+from farming.replay import RaceLog
+from farming.ruin import simulate_ruin
+from farming.simulation import PERSONAS, year_type_labels
+from farming.storage import SpillingHistory
+from farming.trends import TREND_KINDS, ClimateTrend, expected_season_profits, leader_shares, rank_changes, trend_persona_distributions, trend_profit_paths
+from farming.ui import profile_payload, profile_section, profiling_panel, return_period_options, start_profiling
+from farming.weather import WEATHER_STATES, longest_drought, persistent_weather, weather_path_distributions
 
 st.set_page_config(
     page_title="Understanding Farming Strategies!",
     page_icon="🌾",
 )
+start_profiling("Racing Through Farming Strategies")
 
 # --- App Title ---
 st.title("🌟 Racing Through Farming Strategies 🌾")
@@ -24,76 +34,65 @@ Once you've explored your strategies here, don't forget to try [The Science Behi
 
 
 # --- Initialize Session State ---
+# Each session draws its weather from its own seeded generator and records every season,
+# so the whole race can be replayed from the seed
+if "race_log" not in st.session_state:
+    st.session_state["race_log"] = RaceLog()
+# One row per season: the shared year type and each persona's net profit, rebuilt from the log if needed
 if "persona_simulation_history" not in st.session_state:
-    st.session_state["persona_simulation_history"] = {
-        "Traditional_No_Insurance": [],
-        "Traditional_With_Insurance": [],
-        "High_Quality_No_Insurance": [],
-        "High_Quality_With_Insurance": [],
-    }
-if "years_record" not in st.session_state:
-    st.session_state["years_record"] = {
-        "Traditional_No_Insurance": [],
-        "Traditional_With_Insurance": [],
-        "High_Quality_No_Insurance": [],
-        "High_Quality_With_Insurance": [],
-    }
-if "global_year_types" not in st.session_state:
-    st.session_state["global_year_types"] = []
+    st.session_state["persona_simulation_history"] = st.session_state["race_log"].rebuild(SpillingHistory)
+# The race chart is kept between reruns and only extended with new seasons
+if "race_chart" not in st.session_state:
+    st.session_state["race_chart"] = RaceChart(PERSONAS)
 
 # --- Define Personas ---
-personas = [
-    {"name": "Traditional_No_Insurance", "seed_type": "Traditional", "insurance": False},
-    {"name": "Traditional_With_Insurance", "seed_type": "Traditional", "insurance": True},
-    {"name": "High_Quality_No_Insurance", "seed_type": "High Quality", "insurance": False},
-    {"name": "High_Quality_With_Insurance", "seed_type": "High Quality", "insurance": True},
-]
+personas = PERSONAS
 
 # --- Default Parameters ---
-# Load configuration from JSON file
-def load_config(file_path="config.json"):
-    with open(file_path, "r") as file:
-        return json.load(file)
-
-# Load default parameters from the config file
-default_params = load_config()
+# Load default parameters from the config file (parsed once per process, cached until it changes)
+with profile_section("load_config"):
+    default_params = load_config()
 
 for key, value in default_params.items():
     if key not in st.session_state:
         st.session_state[key] = value
 
 # --- Farming Parameters ---
+# pandas and plotly are imported where first needed, so the header above reaches the browser before they load
+import pandas as pd
+
 # Load parameters into a DataFrame
-parameters_df = pd.DataFrame([
-    {
-        "Setting": "Traditional Seed Cost",
-        "Value": f"${st.session_state['traditional_seed_cost']}"
-    },
-    {
-        "Setting": "High Quality Seed Cost",
-        "Value": f"${st.session_state['high_quality_seed_cost']}"
-    },
-    {
-        "Setting": "Traditional Yield Revenue",
-        "Value": f"${st.session_state['traditional_yield_revenue']}"
-    },
-    {
-        "Setting": "High Quality Yield Revenue",
-        "Value": f"${st.session_state['high_quality_yield_revenue']}"
-    },
-    {
-        "Setting": "Insurance Payout",
-        "Value": f"${st.session_state['insurance_payout']}"
-    },
-    {
-        "Setting": "Insurance Premium",
-        "Value": f"${st.session_state['insurance_premium']}"
-    },
-    {
-        "Setting": "Loan Interest Rate (%)",
-        "Value": f"{st.session_state['loan_interest_rate']}%"
-    }
-])
+with profile_section("parameters_df"):
+    parameters_df = pd.DataFrame([
+        {
+            "Setting": "Traditional Seed Cost",
+            "Value": f"${st.session_state['traditional_seed_cost']}"
+        },
+        {
+            "Setting": "High Quality Seed Cost",
+            "Value": f"${st.session_state['high_quality_seed_cost']}"
+        },
+        {
+            "Setting": "Traditional Yield Revenue",
+            "Value": f"${st.session_state['traditional_yield_revenue']}"
+        },
+        {
+            "Setting": "High Quality Yield Revenue",
+            "Value": f"${st.session_state['high_quality_yield_revenue']}"
+        },
+        {
+            "Setting": "Insurance Payout",
+            "Value": f"${st.session_state['insurance_payout']}"
+        },
+        {
+            "Setting": "Insurance Premium",
+            "Value": f"${st.session_state['insurance_premium']}"
+        },
+        {
+            "Setting": "Loan Interest Rate (%)",
+            "Value": f"{st.session_state['loan_interest_rate']}%"
+        }
+    ])
 
 # --- Instructions Section ---
 with st.expander("Instructions", expanded=False):
@@ -129,23 +128,16 @@ with st.expander("Instructions", expanded=False):
             **Here are the current farming costs and revenues for your weather simulations:**  
         """)
 
-    # Convert parameters DataFrame to a markdown-styled table
-    styled_parameters = parameters_df.to_markdown(index=False, tablefmt="pretty")
-    st.markdown(f"```\n{styled_parameters}\n```")
+    # Show the parameters as a compact table
+    st.dataframe(parameters_df, hide_index=True)
+    profile_payload("parameters_df", parameters_df)
 
 # --- Simulation Settings ---
 with st.expander("Weather Simulation Settings", expanded=True):
-    return_period_options = {
-        "Once in 2 years (50% chance per year)": 50,
-        "Once in 5 years (20% chance per year)": 20,
-        "Once in 10 years (10% chance per year)": 10,
-        "Once in 20 years (5% chance per year)": 5,
-        "Once in 50 years (2% chance per year)": 2,
-        "Once in 100 years (1% chance per year)": 1,
-    }
+    return_period_choices = return_period_options()
     selected_return_period = st.selectbox(
         "Select Return Period for Extreme Weather Events (Disasters):",
-        options=list(return_period_options.keys()),
+        options=list(return_period_choices.keys()),
         help="""
             🌪️ **How Often Do Extreme Weather Events (Disasters) Strike?**  
             Extreme weather or a disaster is described as “once in N years.” For instance, a 1-in-5-year drought means a **20% chance** of it happening each year.  
@@ -154,43 +146,50 @@ with st.expander("Weather Simulation Settings", expanded=True):
             Plan wisely and expect the unexpected! 🌦️
             """
     )
-bad_year_probability = return_period_options[selected_return_period] / 100
+    climate_trend_kind = st.selectbox(
+        "Climate Trend:",
+        TREND_KINDS,
+        format_func=lambda kind: {"None": "No change", "Step": "Sudden step"}.get(kind, kind),
+        help="Let the chance of a bad year change as the seasons go by, e.g. as the climate warms."
+    )
+    if climate_trend_kind != "None":
+        trend_col1, trend_col2 = st.columns(2)
+        with trend_col1:
+            end_return_period = st.selectbox(
+                "Return Period at the End of the Trend:",
+                options=list(return_period_choices.keys()),
+                index=min(1, len(return_period_choices) - 1)
+            )
+        with trend_col2:
+            trend_horizon = st.number_input(
+                "Seasons Until the Trend Ends:", min_value=1, max_value=1_000, value=30, step=1,
+                help="For a sudden step, the season in which the change happens."
+            )
+bad_year_probability = return_period_choices[selected_return_period] / 100
 normal_year_probability = 1 - bad_year_probability
+# The race draws season t with climate_trend.probabilities(t, t + 1)
+climate_trend = ClimateTrend(
+    bad_year_probability,
+    return_period_choices[end_return_period] / 100 if climate_trend_kind != "None" else bad_year_probability,
+    int(trend_horizon) if climate_trend_kind != "None" else 1,
+    climate_trend_kind
+)
 
 
 # --- Simulation Logic ---
-def simulate_season(persona, year_type):
-    # Costs and revenue logic
-    if persona["seed_type"] == "Traditional":
-        costs = st.session_state['traditional_seed_cost']
-        revenue = st.session_state['traditional_yield_revenue'] if year_type == "Normal" else 0
-    else:
-        costs = st.session_state['high_quality_seed_cost'] * (1 + st.session_state['loan_interest_rate'] / 100)
-        revenue = st.session_state['high_quality_yield_revenue'] if year_type == "Normal" else 0
-
-    # Insurance adjustments
-    if persona["insurance"]:
-        costs += st.session_state['insurance_premium']
-        if year_type == "Bad":
-            revenue += st.session_state['insurance_payout']
-
-    # Calculate net profit
-    net_profit = revenue - costs
-
-    # Update history
-    persona_name = persona["name"]
-    cumulative_profit = net_profit + (st.session_state["persona_simulation_history"][persona_name][-1] if
-                                      st.session_state["persona_simulation_history"][persona_name] else 0)
-    st.session_state["persona_simulation_history"][persona_name].append(cumulative_profit)
+def record_season(is_bad, season_profits):
+    # Append the season's year type and each persona's net profit; cumulative totals are kept by the race chart
+    st.session_state["persona_simulation_history"].append(
+        year_type=int(is_bad[0]),
+        **{persona["name"]: net_profit for persona, net_profit in zip(personas, season_profits.tolist())}
+    )
 
 
 # --- Reset Logic ---
 def reset_simulation_history():
-    for key in st.session_state["persona_simulation_history"]:
-        st.session_state["persona_simulation_history"][key] = []
-        st.session_state["years_record"][key] = []
-    # Reset the global year types
-    st.session_state["global_year_types"] = []
+    st.session_state["race_log"] = RaceLog()
+    st.session_state["persona_simulation_history"] = SpillingHistory(RACE_COLUMNS)
+    st.session_state["race_chart"] = RaceChart(personas)
     st.success("Simulation reset successfully!")
 
 
@@ -201,17 +200,16 @@ with col1:
     if st.button("Run Simulation"):
         st.session_state["show_simulation_feedback"] = False  # Reset feedback flag
 
-        # Determine the year type once for all personas
-        global_year_type = np.random.choice(
-            ["Normal", "Bad"], p=[normal_year_probability, bad_year_probability]
-        )
-
-        # Store the global year type for this simulation
-        st.session_state["global_year_types"].append(global_year_type)
-
-        # Run the simulation for all personas using the global year type
-        for persona in personas:
-            simulate_season(persona, global_year_type)  # Pass the shared year type
+        with profile_section("Simulation"):
+            # Determine the year type once for all personas, with this season's chance of a bad year,
+            # and simulate all personas at once; the run log records the draw and the parameters
+            season_index = len(st.session_state["race_log"])
+            is_bad, season_profits = st.session_state["race_log"].run(
+                FarmingParameters.from_mapping(st.session_state),
+                climate_trend.probabilities(season_index, season_index + 1)[0]
+            )
+            global_year_type = year_type_labels(is_bad[0]).item()
+            record_season(is_bad, season_profits[0])
 
         # Set the flag to show feedback
         st.session_state["show_simulation_feedback"] = True
@@ -233,101 +231,391 @@ if "show_simulation_feedback" in st.session_state and st.session_state["show_sim
     else:
         st.success("It was a great year! 🌞 Favorable weather brought good fortune to everyone. Click 'Run Weather Simulation' again to discover next year's weather!")
 
+    if climate_trend_kind != "None":
+        season_chance = climate_trend.probabilities(season_index, season_index + 1)[0]
+        st.caption(f"The chance of a bad year in season {season_index + 1} was {season_chance:.1%}.")
+
     # Clear the feedback flag after displaying it
     st.session_state["show_simulation_feedback"] = False
 
 
 
 # --- Visualization: Race for Net Profit ---
-if any(st.session_state["persona_simulation_history"].values()):
+if len(st.session_state["persona_simulation_history"]):
     st.subheader("Net Profit Race 🏁")
 
-    race_fig = go.Figure()
-    persona_emojis = {
-        "Traditional_No_Insurance": "🌱",
-        "Traditional_With_Insurance": "🛡️",
-        "High_Quality_No_Insurance": "💎",
-        "High_Quality_With_Insurance": "🚀",
-    }
+    with profile_section("Race chart"):
+        race_fig = st.session_state["race_chart"].update(st.session_state["persona_simulation_history"])
 
-    # Create x-axis labels
-    x_labels = [f"{i + 1} ({year})" for i, year in enumerate(st.session_state['global_year_types'])]
-
-    for persona in personas:
-        name = persona["name"]
-        history = st.session_state["persona_simulation_history"][name]
-
-        # Calculate cumulative profit
-        cumulative_profit = np.cumsum(history)
-
-        # Add traces for each persona
-        race_fig.add_trace(go.Scatter(
-            x=x_labels,
-            y=cumulative_profit,
-            mode="lines+markers+text",
-            marker=dict(size=10),
-            name=f"{persona_emojis[name]} {name.replace('_', ' ')}",
-            text=[""] * (len(cumulative_profit) - 1) + [persona_emojis[name]],
-            textposition="top center"
-        ))
-
-    # # Update layout with categorical x-axis
-    race_fig.update_layout(
-        title="Farming Personas: Cumulative Profit",
-        xaxis=dict(
-            title="Farming Season (Year Type)",
-            type='category',
-            tickangle=45,
-        ),
-        yaxis=dict(
-            title="Cumulative Profit ($)",
-        ),
-        shapes=[
-            # Add a persistent black line at y=0
-            dict(
-                type="line",
-                xref="paper",  # Relative to the entire x-axis
-                yref="y",  # Relative to the y-axis
-                x0=0,  # Start at the left side
-                x1=1,  # End at the right side
-                y0=0,  # Line is at y=0
-                y1=0,  # Line stays at y=0
-                line=dict(color="darkslategray", width=2),  # Dark black line with thicker width
-            )
-        ],
-        template="plotly_white"
-    )
-
-    # Display the chart
-    st.plotly_chart(race_fig)
+        # Display the chart
+        st.plotly_chart(race_fig)
+    profile_payload("Race chart", race_fig)
 
 
 # --- Leaderboard ---
-leaderboard = pd.DataFrame([
-    {
-        "Persona": persona["name"].replace("_", " "),
-        # Calculate cumulative profit using np.sum to ensure consistency
-        "Cumulative Profit": round(np.sum(st.session_state["persona_simulation_history"][persona["name"]]), 2)
-        if st.session_state["persona_simulation_history"][persona["name"]] else 0
-    }
-    for persona in personas
-]).sort_values(by="Cumulative Profit", ascending=False)
-
-# Add rank and emojis based on positions
-emoji_map = ["🥇", "🥈", "🥉", "🌱"]  # Emojis for ranking
-leaderboard["Rank"] = range(len(leaderboard))  # Assign ranks
-leaderboard["Emoji"] = leaderboard["Rank"].apply(lambda x: emoji_map[x] if x < len(emoji_map) else "🌾")
-leaderboard = leaderboard[["Emoji", "Persona", "Cumulative Profit"]]  # Reorder columns
-
-# Style the leaderboard as a fun and visually engaging Markdown table
+# Cumulative profit is the race chart's running total after the latest season, so no history is re-summed
+race_totals = st.session_state["race_chart"].totals
+with profile_section("Leaderboard"):
+    leaderboard = pd.DataFrame([
+        {
+            "Persona": persona["name"].replace("_", " "),
+            "Cumulative Profit": round(float(total), 2),
+            "Seasons in the Lead": int(seasons_led)
+        }
+        for persona, total, seasons_led in zip(personas, race_totals, st.session_state["race_chart"].seasons_in_lead)
+    ]).sort_values(by="Cumulative Profit", ascending=False)
+
+    # Add rank and emojis based on positions
+    emoji_map = ["🥇", "🥈", "🥉", "🌱"]  # Emojis for ranking
+    leaderboard["Rank"] = range(len(leaderboard))  # Assign ranks
+    leaderboard["Emoji"] = leaderboard["Rank"].apply(lambda x: emoji_map[x] if x < len(emoji_map) else "🌾")
+    leaderboard = leaderboard[["Emoji", "Persona", "Cumulative Profit", "Seasons in the Lead"]]  # Reorder columns
+
+# Show the leaderboard as a compact table
 st.subheader("🏆 🌟 The Farming Leaderboard 🌟")
 st.markdown("""
     **Which farmer is performing the best?**  
 """)
 
-# Convert leaderboard to a markdown-styled table
-styled_leaderboard = leaderboard.to_markdown(index=False, tablefmt="pretty")
-st.markdown(f"```\n{styled_leaderboard}\n```")
+st.dataframe(leaderboard, hide_index=True)
+profile_payload("Leaderboard", leaderboard)
+
+latest_lead_change = st.session_state["race_chart"].latest_lead_change
+if latest_lead_change is not None:
+    lead_season, new_leader = latest_lead_change
+    st.markdown(
+        f"⭐ The lead has changed hands **{st.session_state['race_chart'].n_lead_changes}** times. Most recently, "
+        f"**{personas[new_leader]['name'].replace('_', ' ')}** took the lead in season {lead_season}."
+    )
+
+# --- Exact Analysis ---
+with st.expander("🧮 Exact Analysis: The Long-Run Odds for Every Persona", expanded=False):
+    st.markdown("""
+    Because every season's weather is independent, each persona's odds can be calculated exactly, without running the race.
+    Check how closely the race above follows the math, and look far beyond what you could ever click through!
+    """)
+
+    exact_horizon = st.number_input(
+        "Number of seasons to analyse:",
+        min_value=1,
+        max_value=10_000_000,
+        value=100,
+        step=1,
+        key="exact_horizon"
+    )
+
+    with profile_section("Exact analysis"):
+        if climate_trend_kind == "None":
+            exact_results = exact_persona_distributions(
+                FarmingParameters.from_mapping(st.session_state), exact_horizon, bad_year_probability, personas
+            )
+        else:
+            # The same per-season chances of a bad year as the race, starting from season 1
+            exact_results = trend_persona_distributions(
+                FarmingParameters.from_mapping(st.session_state), climate_trend, exact_horizon, personas
+            )
+    n_race = len(st.session_state["persona_simulation_history"])
+    exact_rows = []
+    for persona, race_total in zip(personas, race_totals):
+        name = persona["name"]
+        exact = exact_results[name]
+        exact_rows.append({
+            "Persona": name.replace("_", " "),
+            "Exact Avg per Season": round(exact.mean / exact_horizon, 2),
+            "Race Avg per Season": round(float(race_total) / n_race, 2) if n_race else None,
+            "Expected Profit": round(exact.mean, 2),
+            "Bad Luck (5th pct)": round(exact.percentiles[5], 2),
+            "Median": round(exact.percentiles[50], 2),
+            "Good Luck (95th pct)": round(exact.percentiles[95], 2),
+            "Chance of Net Loss": f"{exact.prob_loss:.2%}",
+        })
+    exact_table = pd.DataFrame(exact_rows)
+    st.dataframe(exact_table, hide_index=True)
+    if climate_trend_kind != "None":
+        st.caption(
+            "With a climate trend, the exact odds follow the trend's chance of a bad year in every season, as the race does. "
+            "The race average covers the seasons run so far, so it only matches the exact average over the same number of seasons."
+        )
+
+# --- Risk of Ruin ---
+with st.expander("💸 Risk of Ruin: Can Each Farmer Stay in Business?", expanded=False):
+    st.markdown("""
+    In the race, every season starts from scratch. Real farmers carry their savings and their debts from one year to the next.
+    Here, thousands of farmers start with the same savings. Any costs they cannot cover are borrowed at the loan interest rate,
+    unpaid loans keep growing, and a farmer goes **bankrupt** once their debt passes the credit limit.
+    """)
+
+    ruin_col1, ruin_col2 = st.columns(2)
+    with ruin_col1:
+        starting_capital = st.number_input("Starting Savings ($):", min_value=0, max_value=10_000, value=100, step=10)
+        ruin_years = st.number_input("Years of Farming:", min_value=1, max_value=200, value=20, step=1)
+    with ruin_col2:
+        credit_limit = st.number_input(
+            "Credit Limit ($):",
+            min_value=0,
+            max_value=10_000,
+            value=250,
+            step=10,
+            help="A farmer whose unpaid debt grows beyond this amount goes bankrupt."
+        )
+        ruin_farmers = st.number_input("Number of Farmers:", min_value=100, max_value=200_000, value=10_000, step=100)
+
+    if st.button("Simulate Farmers", key="ruin_button"):
+        with profile_section("Risk of ruin"):
+            st.session_state["ruin_result"] = simulate_ruin(
+                FarmingParameters.from_mapping(st.session_state),
+                bad_year_probability,
+                int(ruin_farmers),
+                int(ruin_years),
+                starting_capital,
+                credit_limit=credit_limit,
+                personas=personas,
+                rng=st.session_state["race_log"].stream.spawn(),
+            )
+
+    if "ruin_result" in st.session_state:
+        ruin_result = st.session_state["ruin_result"]
+        ruin_table = pd.DataFrame({
+            "Persona": [persona["name"].replace("_", " ") for persona in personas],
+            "Chance of Bankruptcy": [f"{probability:.2%}" for probability in ruin_result.ruin_probability],
+            "Avg Years Before Bankruptcy": np.round(ruin_result.mean_years_to_ruin, 1),
+            "Median Final Net Worth ($)": np.round(np.median(ruin_result.final_net_worth, axis=0), 2),
+        })
+        st.dataframe(ruin_table, hide_index=True)
+
+        import plotly.graph_objects as go
+
+        survival_fig = go.Figure()
+        for index, persona in enumerate(personas):
+            survival_fig.add_trace(go.Scatter(
+                x=np.arange(ruin_result.n_years + 1),
+                y=ruin_result.survival[:, index] * 100,
+                mode="lines",
+                name=persona["name"].replace("_", " ")
+            ))
+        survival_fig.update_layout(
+            title="Farmers Still in Business",
+            xaxis_title="Year",
+            yaxis_title="Still Farming (%)",
+            template="plotly_white"
+        )
+        st.plotly_chart(survival_fig)
+
+# --- Climate Trend Outlook ---
+with st.expander("🌡️ Climate Trend Outlook: Who Leads as the Climate Changes?", expanded=False):
+    st.markdown("""
+    The [Science Behind the Game](https://agri-insurance-game.streamlit.app/The_Science_Behind_the_Game) page explains
+    that extreme weather is becoming more frequent. Pick a **Climate Trend** in the weather settings above, and see how
+    the best strategy changes as bad years become more common.
+    """)
+    if climate_trend_kind == "None":
+        st.info("No climate trend is selected, so the chance of a bad year stays the same every season.")
+
+    outlook_col1, outlook_col2 = st.columns(2)
+    with outlook_col1:
+        outlook_seasons = st.number_input(
+            "Seasons to Look Ahead:", min_value=2, max_value=200, value=50, step=1, key="outlook_seasons"
+        )
+    with outlook_col2:
+        outlook_farmers = st.number_input(
+            "Number of Farmers:", min_value=100, max_value=10_000, value=5_000, step=100, key="outlook_farmers"
+        )
+    outlook_seasons = int(outlook_seasons)
+
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    # Expected profits follow directly from each season's chance of a bad year
+    outlook_params = FarmingParameters.from_mapping(st.session_state)
+    expected_profits = expected_season_profits(outlook_params, climate_trend, outlook_seasons, personas)
+    outlook_seasons_axis = np.arange(1, outlook_seasons + 1)
+    persona_labels = [f"{PERSONA_EMOJIS[persona['name']]} {persona['name'].replace('_', ' ')}" for persona in personas]
+
+    expected_fig = make_subplots(specs=[[{"secondary_y": True}]])
+    for index, label in enumerate(persona_labels):
+        expected_fig.add_trace(
+            go.Scatter(x=outlook_seasons_axis, y=np.round(expected_profits[:, index], 2), mode="lines", name=label)
+        )
+    expected_fig.add_trace(
+        go.Scatter(
+            x=outlook_seasons_axis,
+            y=climate_trend.probabilities(0, outlook_seasons) * 100,
+            mode="lines",
+            line=dict(dash="dot", color="gray"),
+            name="Chance of a Bad Year (%)"
+        ),
+        secondary_y=True
+    )
+    expected_fig.update_layout(title="Expected Profit in Each Season", xaxis_title="Season", template="plotly_white")
+    expected_fig.update_yaxes(title_text="Expected Profit ($)", secondary_y=False)
+    expected_fig.update_yaxes(title_text="Chance of a Bad Year (%)", secondary_y=True)
+    st.plotly_chart(expected_fig)
+    profile_payload("Trend expected profits", expected_fig)
+
+    # Seasons where the expected cumulative ranking changes
+    ranking_changes = rank_changes(np.cumsum(expected_profits, axis=0))
+    if ranking_changes:
+        st.markdown("**🔀 When the Expected Ranking Flips**")
+        st.dataframe(
+            {
+                "After Season": [season + 1 for season, _ in ranking_changes],
+                "New Ranking (Most Cumulative Profit First)": [
+                    " > ".join(PERSONA_EMOJIS[personas[index]["name"]] for index in order) for _, order in ranking_changes
+                ],
+            },
+            hide_index=True
+        )
+    else:
+        st.markdown("The expected ranking stays the same over these seasons.")
+
+    if st.button("Simulate Outlook", key="trend_button"):
+        with profile_section("Climate trend outlook"):
+            # Every farmer's whole path of seasons is drawn in one call from the per-season probabilities
+            outlook_totals = trend_profit_paths(
+                outlook_params,
+                climate_trend,
+                int(outlook_farmers),
+                outlook_seasons,
+                personas,
+                rng=st.session_state["race_log"].stream.spawn()
+            )
+            st.session_state["trend_outlook"] = leader_shares(outlook_totals)
+
+    if "trend_outlook" in st.session_state:
+        outlook_shares = st.session_state["trend_outlook"]
+        leaders_fig = go.Figure()
+        for index, label in enumerate(persona_labels):
+            leaders_fig.add_trace(go.Scatter(
+                x=np.arange(1, len(outlook_shares) + 1),
+                y=np.round(outlook_shares[:, index] * 100, 2),
+                mode="lines",
+                stackgroup="leaders",
+                name=label
+            ))
+        leaders_fig.update_layout(
+            title="Which Persona Is Ahead? (Share of Farmers)",
+            xaxis_title="Season",
+            yaxis_title="Farmers Where This Persona Leads (%)",
+            template="plotly_white"
+        )
+        st.plotly_chart(leaders_fig)
+        profile_payload("Trend leaders", leaders_fig)
+
+# --- Persistent Droughts ---
+with st.expander("🌵 Persistent Droughts: When Bad Years Come in Runs", expanded=False):
+    st.markdown("""
+    So far every season's weather has been independent. Real droughts often last several years, and droughts come in
+    different strengths. Here the weather moves between **normal**, **moderate drought** and **severe drought** years.
+    Over the long run, droughts still come as often as the return period you picked above, but they can cluster.
+    """)
+
+    drought_col1, drought_col2 = st.columns(2)
+    with drought_col1:
+        drought_persistence = st.slider(
+            "Drought Persistence:",
+            min_value=0.0,
+            max_value=0.9,
+            value=0.5,
+            step=0.05,
+            help="How strongly a drought year makes the next year a drought too. 0 means independent years."
+        )
+        severe_share = st.slider("Share of Droughts That Are Severe (%):", min_value=0, max_value=100, value=50, step=5)
+        drought_years = st.number_input("Years of Farming:", min_value=1, max_value=100, value=20, step=1, key="drought_years")
+    with drought_col2:
+        moderate_yield = st.slider("Harvest in a Moderate Drought (%):", min_value=0, max_value=100, value=50, step=5)
+        moderate_payout = st.slider("Insurance Payout in a Moderate Drought (%):", min_value=0, max_value=100, value=50, step=5)
+        drought_farmers = st.number_input(
+            "Number of Farmers:", min_value=100, max_value=100_000, value=10_000, step=100, key="drought_farmers"
+        )
+
+    weather = persistent_weather(
+        bad_year_probability, drought_persistence, severe_share / 100, moderate_yield / 100, moderate_payout / 100
+    )
+    st.markdown("**Chance of next year's weather, given this year's:**")
+    st.dataframe(
+        {
+            "This Year": list(WEATHER_STATES),
+            **{f"Next: {state}": [f"{probability:.1%}" for probability in weather.transition[:, index]]
+               for index, state in enumerate(WEATHER_STATES)},
+        },
+        hide_index=True
+    )
+    st.caption(
+        f"Long-run chance of a drought year: {weather.drought_probability():.1%}. "
+        f"Once a drought starts, it lasts {weather.mean_drought_length():.1f} years on average."
+    )
+
+    if st.button("Simulate Droughts", key="drought_button"):
+        with profile_section("Persistent droughts"):
+            rng = st.session_state["race_log"].stream.spawn()
+            params = FarmingParameters.from_mapping(st.session_state)
+            # The same droughts, but striking independently each year, for comparison
+            independent = persistent_weather(
+                bad_year_probability, 0.0, severe_share / 100, moderate_yield / 100, moderate_payout / 100
+            )
+            persistent_states = weather.sample_paths(int(drought_farmers), int(drought_years), rng)
+            independent_states = independent.sample_paths(int(drought_farmers), int(drought_years), rng)
+            st.session_state["drought_result"] = {
+                "years": int(drought_years),
+                "persistent": weather_path_distributions(params, weather, persistent_states, personas),
+                "independent": weather_path_distributions(params, independent, independent_states, personas),
+                "longest_persistent": float(longest_drought(persistent_states).mean()),
+                "longest_independent": float(longest_drought(independent_states).mean()),
+            }
+
+    if "drought_result" in st.session_state:
+        drought_result = st.session_state["drought_result"]
+        st.markdown(
+            f"Over {drought_result['years']} years, the longest drought a farmer lives through averages "
+            f"**{drought_result['longest_persistent']:.1f} years**, compared with "
+            f"**{drought_result['longest_independent']:.1f} years** if droughts struck independently."
+        )
+        drought_rows = []
+        for persona in personas:
+            name = persona["name"]
+            persistent, independent = drought_result["persistent"][name], drought_result["independent"][name]
+            drought_rows.append({
+                "Persona": name.replace("_", " "),
+                "Avg Profit per Year": round(persistent.mean / drought_result["years"], 2),
+                "Bad Luck (5th pct), Persistent": round(persistent.percentiles[5], 2),
+                "Bad Luck (5th pct), Independent": round(independent.percentiles[5], 2),
+                "Chance of Net Loss, Persistent": f"{persistent.prob_loss:.2%}",
+                "Chance of Net Loss, Independent": f"{independent.prob_loss:.2%}",
+            })
+        st.dataframe(pd.DataFrame(drought_rows), hide_index=True)
+
+# --- Replay ---
+with st.expander("🔁 Save, Share and Replay the Race", expanded=False):
+    race_log = st.session_state["race_log"]
+    st.markdown(f"""
+        The race's weather comes from your own random seed, `{race_log.seed}`. Together with the settings of each season,
+        it recreates the whole race exactly. Download the race log to share it, or load one to replay someone else's race.
+        The farmers simulated in the sections above are extra samples and are not part of the log.
+    """)
+
+    # The log is only serialized when the button is clicked, so reruns don't pay for the whole race
+    st.download_button(
+        "Download Race Log",
+        data=race_log.to_json,
+        file_name="farming_race_log.json",
+        mime="application/json",
+        disabled=not race_log.events
+    )
+
+    uploaded_race_log = st.file_uploader("Load a Race Log:", type="json")
+    if uploaded_race_log is not None and st.button("Replay Race", key="race_replay_button"):
+        try:
+            loaded_race_log = RaceLog.from_json(uploaded_race_log.getvalue().decode("utf-8"))
+            loaded_race_history = loaded_race_log.rebuild(SpillingHistory)
+        except (ValueError, KeyError, TypeError) as error:
+            st.error(f"That file is not a valid race log: {error}")
+        else:
+            st.session_state["race_log"] = loaded_race_log
+            st.session_state["persona_simulation_history"] = loaded_race_history
+            st.session_state["race_chart"] = RaceChart(personas)
+            st.rerun()
+
+profiling_panel()
 
 # Add a copyright line at the bottom of the page
 st.markdown(
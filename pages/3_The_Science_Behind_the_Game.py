@@ -1,5 +1,9 @@
 import streamlit as st
 
+from farming.ui import profiling_panel, start_profiling
+
+start_profiling("The Science Behind the Game")
+
 st.markdown(
     """
     # 🌟 The Science Behind the Game
@@ -70,6 +74,8 @@ st.markdown(
 )
 
 
+profiling_panel()
+
 # Add a copyright line at the bottom of the page
 st.markdown(
     """
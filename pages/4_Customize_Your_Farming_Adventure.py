@@ -1,4 +1,15 @@
 import streamlit as st
+import numpy as np
+
+from farming.climate import DROUGHT_SHARE, climate_dir, station_fits
+from farming.config import FarmingParameters, load_config
+from farming.pricing import premium_schedule
+from farming.simulation import PERSONAS, RETURN_PERIOD_OPTIONS
+from farming.strategies import optimize_strategies
+from farming.sweep import SWEEP_PARAMETERS, run_sweep, sweep_axis
+from farming.ui import profile_payload, profile_section, profiling_panel, return_period_options, start_profiling
+
+start_profiling("Customize Your Farming Adventure")
 
 st.title("Customize Your Farming Adventure ⚙️")
 
@@ -23,16 +34,9 @@ Take control of your simulation and create the scenario that suits your farming
 """)
 
 
-# Default parameter values
-default_params = {
-    'traditional_seed_cost': 80,           # Lower cost to reflect affordability of traditional seeds
-    'high_quality_seed_cost': 120,         # High-quality seeds are more expensive but not excessively so
-    'traditional_yield_revenue': 150,      # Revenue from traditional seeds should be modest but sustainable
-    'high_quality_yield_revenue': 350,     # Higher potential revenue to make high-quality seeds attractive
-    'insurance_payout': 120,               # Insurance payout should sufficiently offset losses in bad years
-    'insurance_premium': 15,               # A fair cost for insurance that isn't too high for players to avoid
-    'loan_interest_rate': 7.0              # Slightly higher interest rate to reflect real-world loan conditions
-}
+# Default parameter values, shared with the other pages through config.json
+with profile_section("load_config"):
+    default_params = load_config()
 
 
 # Store initial values to compare later and initialize session state
@@ -119,6 +123,308 @@ settings_changed = any(
 if settings_changed:
     st.success("Parameters updated! Navigate back to the Home page to see the changes.")
 
+# --- Premium Solver ---
+with st.expander("🧾 What Should Insurance Cost?", expanded=False):
+    st.markdown("""
+    Is the insurance premium fair? For every return period, including those of your own climate data, the table below shows the insurer's **expected claims**
+    for the payout you chose. They are also the break-even premium: at that price, insured and uninsured farmers expect to earn the same.
+    The table also shows the premiums that:
+    - **Hit a target loss ratio:** expected claims are the chosen share of the premium.
+    - **Hit a target margin:** the insurer keeps the chosen share of the premium after expected claims.
+    """)
+
+    solver_col1, solver_col2 = st.columns(2)
+    with solver_col1:
+        target_loss_ratio = st.slider("Target Loss Ratio (%):", min_value=10, max_value=150, value=70, step=5)
+    with solver_col2:
+        target_margin = st.slider("Target Insurer Margin (%):", min_value=0, max_value=90, value=20, step=5)
+
+    with profile_section("Premium schedule"):
+        schedule = premium_schedule(
+            FarmingParameters.from_mapping(st.session_state),
+            # Unreadable climate files are reported in the climate data section below
+            return_period_options(report_errors=False),
+            target_loss_ratio / 100,
+            target_margin / 100
+        )
+    st.dataframe(schedule, hide_index=True)
+    st.caption(
+        f"Your current premium is ${st.session_state['insurance_premium']} for a payout of "
+        f"${st.session_state['insurance_payout']}. A loss ratio above 100% means the insurer expects to pay out more than it collects."
+    )
+
+# --- Who Wins Where? ---
+with st.expander("🗺️ Who Wins Where? Explore Many Settings at Once", expanded=False):
+    st.markdown("""
+    Pick two settings and see which farming persona earns the most per season, on average, for every combination of them.
+    All other settings stay at the values chosen above, and all six return periods are computed in one go.
+    """)
+
+    # Imported here so the rest of the page renders before plotly loads
+    import plotly.graph_objects as go
+
+    parameter_names = list(SWEEP_PARAMETERS)
+    sweep_col1, sweep_col2 = st.columns(2)
+    with sweep_col1:
+        x_parameter = st.selectbox(
+            "Horizontal Axis:",
+            parameter_names,
+            index=parameter_names.index("insurance_premium"),
+            format_func=lambda name: SWEEP_PARAMETERS[name][0]
+        )
+    with sweep_col2:
+        y_options = [name for name in parameter_names if name != x_parameter]
+        y_parameter = st.selectbox(
+            "Vertical Axis:",
+            y_options,
+            index=y_options.index("insurance_payout") if "insurance_payout" in y_options else 0,
+            format_func=lambda name: SWEEP_PARAMETERS[name][0]
+        )
+
+    grid_resolution = st.slider("Grid Resolution (points per axis):", min_value=10, max_value=200, value=100)
+    sweep_return_period = st.selectbox("Return Period for Extreme Weather Events:", list(RETURN_PERIOD_OPTIONS))
+
+    # One batched evaluation covers the whole grid and every return period
+    with profile_section("Parameter sweep"):
+        sweep_result = run_sweep(
+            FarmingParameters.from_mapping(st.session_state),
+            {
+                y_parameter: sweep_axis(y_parameter, grid_resolution),
+                x_parameter: sweep_axis(x_parameter, grid_resolution),
+            }
+        )
+    period_index = list(RETURN_PERIOD_OPTIONS).index(sweep_return_period)
+    x_values = sweep_result.axes[x_parameter]
+    y_values = sweep_result.axes[y_parameter]
+    winner = sweep_result.winner[period_index]
+    persona_labels = np.array([persona["name"].replace("_", " ") for persona in PERSONAS])
+    persona_colors = ["#8BC34A", "#4FC3F7", "#FFB74D", "#BA68C8"]
+
+    def current_setting_marker():
+        # Marks the values currently chosen with the sliders
+        return go.Scatter(
+            x=[st.session_state[x_parameter]],
+            y=[st.session_state[y_parameter]],
+            mode="markers",
+            marker=dict(symbol="x", size=14, color="black"),
+            name="Your Settings"
+        )
+
+    st.markdown("**🏆 Winning Persona**")
+    winner_fig = go.Figure(data=[
+        go.Heatmap(
+            x=x_values,
+            y=y_values,
+            z=winner,
+            zmin=-0.5,
+            zmax=len(PERSONAS) - 0.5,
+            colorscale=[
+                [bound, color]
+                for index, color in enumerate(persona_colors)
+                for bound in (index / len(PERSONAS), (index + 1) / len(PERSONAS))
+            ],
+            customdata=persona_labels[winner],
+            hovertemplate="%{customdata}<extra></extra>",
+            colorbar=dict(tickvals=list(range(len(PERSONAS))), ticktext=list(persona_labels))
+        ),
+        current_setting_marker()
+    ])
+    winner_fig.update_layout(
+        xaxis_title=SWEEP_PARAMETERS[x_parameter][0],
+        yaxis_title=SWEEP_PARAMETERS[y_parameter][0],
+        showlegend=False,
+        template="plotly_white"
+    )
+    with profile_section("Winner heatmap"):
+        st.plotly_chart(winner_fig)
+    profile_payload("Winner heatmap", winner_fig)
+
+    st.markdown("**💰 Expected Net Profit per Season of the Winner**")
+    profit_fig = go.Figure(data=[
+        go.Heatmap(
+            x=x_values,
+            y=y_values,
+            z=sweep_result.best_profit[period_index],
+            colorscale="RdYlGn",
+            zmid=0,
+            colorbar=dict(title="$")
+        ),
+        current_setting_marker()
+    ])
+    profit_fig.update_layout(
+        xaxis_title=SWEEP_PARAMETERS[x_parameter][0],
+        yaxis_title=SWEEP_PARAMETERS[y_parameter][0],
+        showlegend=False,
+        template="plotly_white"
+    )
+    with profile_section("Profit heatmap"):
+        st.plotly_chart(profit_fig)
+    profile_payload("Profit heatmap", profit_fig)
+
+# --- Mixed Strategies ---
+with st.expander("🎛️ Beyond the Four Personas: Mix Seeds and Insurance", expanded=False):
+    st.markdown("""
+    Real farmers don't have to choose all or nothing. Here a farmer plants any share of their land with high-quality seeds
+    and insures any share of it, in steps of 5%. Every combination is checked against the same weather, and the
+    **efficient frontier** shows the strategies that earn the most for each level of downside risk.
+    """)
+
+    mix_col1, mix_col2 = st.columns(2)
+    with mix_col1:
+        # Unreadable climate files are reported in the climate data section below
+        mix_return_period_options = return_period_options(report_errors=False)
+        mix_return_period = st.selectbox(
+            "Return Period for Extreme Weather Events:", list(mix_return_period_options), key="mix_return_period"
+        )
+        mix_horizon = st.slider("Years of Farming:", min_value=1, max_value=100, value=20, key="mix_horizon")
+    with mix_col2:
+        mix_tail = st.slider(
+            "Downside Risk Looks at the Worst (%) of Outcomes:",
+            min_value=1,
+            max_value=25,
+            value=5,
+            key="mix_tail",
+            help="Downside risk is how far the average of these worst outcomes falls below the expected profit."
+        )
+
+    with profile_section("Strategy frontier"):
+        strategies = optimize_strategies(
+            FarmingParameters.from_mapping(st.session_state),
+            mix_return_period_options[mix_return_period] / 100,
+            mix_horizon,
+            tail=mix_tail / 100
+        )
+    frontier = strategies.frontier
+    strategy_labels = np.array([
+        f"{seed_mix:.0%} high-quality seeds, {coverage:.0%} insured"
+        for coverage, seed_mix in zip(strategies.coverage, strategies.seed_mix)
+    ])
+
+    frontier_fig = go.Figure(data=[
+        go.Scatter(
+            x=strategies.downside_risk,
+            y=strategies.mean,
+            mode="markers",
+            marker=dict(size=6, color=strategies.coverage * 100, colorscale="Blues", colorbar=dict(title="Insured %")),
+            customdata=strategy_labels,
+            hovertemplate="%{customdata}<br>Expected: $%{y:.2f}<br>Downside risk: $%{x:.2f}<extra></extra>",
+            name="Strategies"
+        ),
+        go.Scatter(
+            x=strategies.downside_risk[frontier],
+            y=strategies.mean[frontier],
+            mode="lines",
+            line=dict(color="#E65100", width=3),
+            hoverinfo="skip",
+            name="Efficient Frontier"
+        )
+    ])
+    # The four personas are the corners of the grid
+    for persona in PERSONAS:
+        corner = np.flatnonzero(
+            (strategies.coverage == float(persona["insurance"]))
+            & (strategies.seed_mix == float(persona["seed_type"] == "High Quality"))
+        )[0]
+        frontier_fig.add_annotation(
+            x=strategies.downside_risk[corner],
+            y=strategies.mean[corner],
+            text=persona["name"].replace("_", " "),
+            showarrow=True,
+            arrowhead=2
+        )
+    frontier_fig.update_layout(
+        xaxis_title=f"Downside Risk over {mix_horizon} Years ($)",
+        yaxis_title=f"Expected Net Profit over {mix_horizon} Years ($)",
+        showlegend=False,
+        template="plotly_white"
+    )
+    st.plotly_chart(frontier_fig)
+    profile_payload("Strategy frontier", frontier_fig)
+
+    st.markdown("**📈 Efficient Strategies, From Safest to Boldest**")
+    st.dataframe(
+        {
+            "High-Quality Seeds": [f"{share:.0%}" for share in strategies.seed_mix[frontier]],
+            "Insured": [f"{share:.0%}" for share in strategies.coverage[frontier]],
+            "Expected Profit per Year ($)": np.round(strategies.mean[frontier] / mix_horizon, 2),
+            f"Avg of Worst {mix_tail}% ($)": np.round(strategies.tail_mean[frontier], 2),
+            "Downside Risk ($)": np.round(strategies.downside_risk[frontier], 2),
+            "Chance of Net Loss": [f"{probability:.2%}" for probability in strategies.prob_loss[frontier]],
+        },
+        hide_index=True
+    )
+
+# --- Local Climate Data ---
+with st.expander("📂 Return Periods From Your Own Climate Data", expanded=False):
+    st.markdown(f"""
+    Put CSV or Parquet files with historical rainfall or crop yields in `{climate_dir()}` (or point the
+    `FARMING_CLIMATE_DIR` environment variable at another folder). Each file needs a `station` column, a `year` column
+    and one of `rainfall`, `precipitation`, `yield` or `value`. Daily or monthly rows are added up per year.
+
+    Every station then appears as an extra return period on the other pages, with the chance of a bad year taken from
+    its own history.
+    """)
+
+    if "drought_share" not in st.session_state:
+        st.session_state["drought_share"] = round(DROUGHT_SHARE * 100)
+    st.session_state["drought_share"] = st.slider(
+        "A Bad Year Has Less Than (% of a Typical Year):",
+        min_value=10,
+        max_value=100,
+        value=st.session_state["drought_share"],
+        step=5,
+        help="A year counts as a drought when its total is below this share of the station's median year."
+    )
+    drought_share = st.session_state["drought_share"] / 100
+
+    climate_errors = []
+    with profile_section("Climate fits"):
+        climate_fits = station_fits(errors=climate_errors)
+    for file_name, message in climate_errors:
+        st.warning(f"Skipped climate file {file_name}: {message}")
+
+    if not climate_fits:
+        st.info("No climate files found yet.")
+    else:
+        st.dataframe(
+            {
+                "Station": [station for _, station in climate_fits],
+                "File": [file_name for file_name, _ in climate_fits],
+                "Years of Record": [fit.n_years for fit in climate_fits.values()],
+                "Typical Year": [round(float(np.median(fit.values)), 1) for fit in climate_fits.values()],
+                "Drought Below": [round(fit.threshold(drought_share), 1) for fit in climate_fits.values()],
+                "Chance of a Bad Year": [f"{fit.bad_year_probability(drought_share):.1%}" for fit in climate_fits.values()],
+                "Once in (Years)": [round(1 / fit.bad_year_probability(drought_share), 1) for fit in climate_fits.values()],
+            },
+            hide_index=True
+        )
+
+        climate_station = st.selectbox(
+            "Station:", list(climate_fits), format_func=lambda key: f"{key[1]} ({key[0]})", key="climate_station"
+        )
+        station_fit = climate_fits[climate_station]
+        curve_fig = go.Figure(go.Scatter(
+            x=station_fit.return_periods,
+            y=station_fit.values,
+            customdata=station_fit.years,
+            mode="markers",
+            hovertemplate="%{customdata}: %{y:.1f}, once in %{x:.1f} years<extra></extra>"
+        ))
+        curve_fig.add_hline(
+            y=station_fit.threshold(drought_share), line_dash="dash", line_color="red", annotation_text="Drought"
+        )
+        curve_fig.update_layout(
+            title=f"How Rare Is a Year This Dry? ({climate_station[1]})",
+            xaxis_title="Return Period (Years)",
+            yaxis_title="Yearly Total",
+            xaxis_type="log",
+            template="plotly_white"
+        )
+        st.plotly_chart(curve_fig)
+        profile_payload("Return period curve", curve_fig)
+
+profiling_panel()
+
 # Add a copyright line at the bottom of the page
 st.markdown(
     """
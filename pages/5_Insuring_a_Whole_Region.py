@@ -0,0 +1,156 @@
+import streamlit as st
+
+from farming.config import FarmingParameters, load_config
+from farming.portfolio import min_years, portfolio_risk, simulate_portfolio
+from farming.rng import SeasonStream
+from farming.simulation import RETURN_PERIOD_OPTIONS
+from farming.ui import profile_payload, profile_section, profiling_panel, start_profiling
+
+start_profiling("Insuring a Whole Region")
+
+st.title("Insuring a Whole Region 🏦")
+
+st.markdown("""
+So far every page has looked at a single farmer. An insurer sells policies to **thousands of farms at once**, and
+droughts rarely strike just one of them: farms in the same region tend to have their bad years together.
+
+On this page you run the insurance pool. Every farm pays the **insurance premium** and receives the **insurance
+payout** in a bad year, using the parameters from the other pages. Simulate many years and see:
+
+1. **Loss Ratio**: how much of the premium income goes back to farmers as payouts.
+2. **Value at Risk (VaR)**: the yearly payouts that are only exceeded in the worst years.
+3. **Tail Value at Risk (TVaR)**: the average payouts in those worst years.
+4. **Reserves**: the money the insurer must keep aside, on top of the premiums, to pay out in a bad year.
+""")
+
+# Default parameter values, shared with the other pages through config.json
+with profile_section("load_config"):
+    default_params = load_config()
+
+for key, value in default_params.items():
+    if key not in st.session_state:
+        st.session_state[key] = value
+# Each session draws its weather from its own seeded generator
+if "portfolio_stream" not in st.session_state:
+    st.session_state["portfolio_stream"] = SeasonStream()
+
+params = FarmingParameters.from_mapping(st.session_state)
+st.markdown(
+    f"Each farm pays a premium of **${params.insurance_premium}** and receives **${params.insurance_payout}** "
+    "in a bad year. Change them on the **Customize Your Farming Adventure** page."
+)
+
+with st.expander("Portfolio Settings", expanded=True):
+    portfolio_col1, portfolio_col2 = st.columns(2)
+    with portfolio_col1:
+        portfolio_return_period = st.selectbox(
+            "Return Period for Extreme Weather Events:", list(RETURN_PERIOD_OPTIONS), key="portfolio_return_period"
+        )
+        n_farms = st.number_input("Number of Insured Farms:", min_value=100, max_value=100_000, value=100_000, step=1_000)
+        n_years = st.number_input(
+            "Years to Simulate:",
+            min_value=10,
+            max_value=10_000,
+            value=1_000,
+            step=100,
+            help="Each year is an independent draw of the weather. More years give steadier estimates of the worst years."
+        )
+    with portfolio_col2:
+        n_regions = st.number_input("Number of Regions:", min_value=1, max_value=100, value=10, step=1)
+        correlation = st.slider(
+            "Weather Correlation Within a Region:",
+            min_value=0.0,
+            max_value=0.9,
+            value=0.3,
+            step=0.05,
+            help="How strongly farms in the same region share their bad years. 0 means every farm's weather is independent."
+        )
+        confidence = st.select_slider(
+            "Confidence Level:",
+            options=[0.9, 0.95, 0.99, 0.995],
+            value=0.99,
+            format_func=lambda level: f"{level:.1%}"
+        )
+
+portfolio_probability = RETURN_PERIOD_OPTIONS[portfolio_return_period] / 100
+
+if st.button("Simulate Portfolio"):
+    with profile_section("Portfolio simulation"):
+        st.session_state["portfolio_result"] = simulate_portfolio(
+            params,
+            portfolio_probability,
+            int(n_farms),
+            int(n_years),
+            correlation=correlation,
+            n_regions=int(n_regions),
+            rng=st.session_state["portfolio_stream"].spawn(),
+        )
+
+if "portfolio_result" in st.session_state:
+    portfolio_result = st.session_state["portfolio_result"]
+    risk = portfolio_risk(portfolio_result, confidence)
+
+    metric_col1, metric_col2, metric_col3 = st.columns(3)
+    metric_col1.metric("Premium Income per Year", f"${risk.premiums:,.0f}")
+    metric_col2.metric("Expected Payouts per Year", f"${risk.expected_claims:,.0f}")
+    metric_col3.metric("Loss Ratio", f"{risk.loss_ratio:.1%}")
+    metric_col1.metric(f"Value at Risk ({risk.confidence:.1%})", f"${risk.value_at_risk:,.0f}")
+    metric_col2.metric(f"Tail Value at Risk ({risk.confidence:.1%})", f"${risk.tail_value_at_risk:,.0f}")
+    metric_col3.metric("Required Reserves", f"${risk.reserve:,.0f}")
+    if not risk.enough_years:
+        st.warning(
+            f"Only {risk.tail_years} of the {risk.n_years} simulated years lie beyond the {risk.confidence:.1%} level, "
+            f"so the VaR, TVaR and reserves rest on very few years. Simulate at least "
+            f"{min_years(risk.confidence):,} years for steadier estimates."
+        )
+
+    st.markdown(
+        f"Across {portfolio_result.n_years} simulated years of {portfolio_result.n_farms:,} farms in "
+        f"{portfolio_result.n_regions} regions, payouts were higher than the premium income in "
+        f"**{risk.prob_shortfall:.1%}** of years. Yearly payouts varied by **${portfolio_result.claims.std():,.0f}** "
+        f"(standard deviation), compared with about **${portfolio_result.independent_claims_std:,.0f}** if every farm's weather were independent."
+    )
+
+    import plotly.graph_objects as go
+
+    with profile_section("Claims histogram"):
+        claims_fig = go.Figure(go.Histogram(x=portfolio_result.claims, nbinsx=50, name="Yearly payouts"))
+        for value, label, color in (
+            (risk.premiums, "Premium income", "green"),
+            (risk.value_at_risk, "VaR", "orange"),
+            (risk.tail_value_at_risk, "TVaR", "red"),
+        ):
+            claims_fig.add_vline(x=value, line_dash="dash", line_color=color, annotation_text=label)
+        claims_fig.update_layout(
+            title="Total Payouts per Year",
+            xaxis_title="Payouts ($)",
+            yaxis_title="Years",
+            template="plotly_white",
+            showlegend=False
+        )
+    st.plotly_chart(claims_fig)
+    profile_payload("Claims histogram", claims_fig)
+
+    st.markdown("""
+    **📝 What This Means:**
+    - When farms share their bad years, the insurer's good and bad years become extreme: most years are cheap,
+      but a regional drought hits many policies at once.
+    - A loss ratio below 100% is not enough. The insurer also needs **reserves** to pay out in the worst years
+      without running out of money.
+    - More regions spread the risk: independent regions rarely all have a drought in the same year.
+    """)
+
+profiling_panel()
+
+# Add a copyright line at the bottom of the page
+st.markdown(
+    """
+    <div style='text-align: center; margin-top: 50px; font-size: 12px; color: gray;'>
+        © Nitin Magima. All rights reserved.<br>
+        <a href="https://www.linkedin.com/in/nitin-magima/" target="_blank">
+            <img src="https://cdn-icons-png.flaticon.com/512/174/174857.png" width="20" height="20" style="vertical-align: middle; margin-right: 5px;">
+        </a>
+    </div>
+    """,
+    unsafe_allow_html=True
+)
@@ -0,0 +1,24 @@
+import pytest
+
+from farming.config import FarmingParameters
+
+# The shipped config.json values, fixed here so the tests don't depend on edits to that file
+PARAMETERS = {
+    "traditional_seed_cost": 80,
+    "high_quality_seed_cost": 120,
+    "traditional_yield_revenue": 150,
+    "high_quality_yield_revenue": 350,
+    "insurance_payout": 120,
+    "insurance_premium": 15,
+    "loan_interest_rate": 7.0,
+}
+
+
+@pytest.fixture
+def raw_params():
+    return dict(PARAMETERS)
+
+
+@pytest.fixture
+def params():
+    return FarmingParameters.from_mapping(PARAMETERS)
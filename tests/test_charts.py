@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from farming.charts import RaceChart, bin_series
+from farming.history import RACE_COLUMNS, SeasonHistory
+from farming.simulation import PERSONAS
+
+
+def reference_bins(values, n_bins):
+    # Same bin edges as bin_series, aggregated bin by bin
+    starts = np.linspace(0, len(values), n_bins + 1).astype(int)
+    bins = [values[start:stop] for start, stop in zip(starts[:-1], starts[1:])]
+    return [bin.mean() for bin in bins], [bin.min() for bin in bins], [bin.max() for bin in bins]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 1000])
+def test_bin_series_is_independent_of_chunking(chunk_size):
+    values = np.random.default_rng(5).normal(size=1000)
+    chunks = [values[start:start + chunk_size] for start in range(0, len(values), chunk_size)]
+    centre, mean, low, high = bin_series(chunks, len(values), n_bins=30)
+
+    expected_mean, expected_low, expected_high = reference_bins(values, 30)
+    assert len(centre) == 30
+    np.testing.assert_allclose(mean, expected_mean)
+    np.testing.assert_array_equal(low, expected_low)
+    np.testing.assert_array_equal(high, expected_high)
+
+
+def test_bin_series_with_fewer_values_than_bins():
+    centre, mean, low, high = bin_series([np.array([3.0, -1.0]), np.array([2.0])], 3, n_bins=10)
+    np.testing.assert_array_equal(centre, [1, 2, 3])
+    np.testing.assert_array_equal(mean, [3, -1, 2])
+    np.testing.assert_array_equal(low, mean)
+    np.testing.assert_array_equal(high, mean)
+
+
+def race_history(profits):
+    history = SeasonHistory(RACE_COLUMNS)
+    profits = np.asarray(profits, dtype=float)
+    history.append(year_type=np.zeros(len(profits), dtype=np.uint8),
+                   **{persona["name"]: profits[:, index] for index, persona in enumerate(PERSONAS)})
+    return history
+
+
+def test_race_chart_tracks_the_lead():
+    # Persona 0 leads for two seasons, persona 2 takes over, then persona 0 again
+    profits = [[5, 0, 0, 0], [0, 0, 0, 0], [0, 0, 20, 0], [0, 0, 0, 0], [30, 0, 0, 0]]
+    chart = RaceChart(PERSONAS)
+    chart.update(race_history(profits))
+
+    np.testing.assert_array_equal(chart.totals, [35, 0, 20, 0])
+    np.testing.assert_array_equal(chart.seasons_in_lead, [3, 0, 2, 0])
+    assert chart.n_lead_changes == 2
+    assert chart.leader == 0
+    assert chart.latest_lead_change == (5, 0)
+
+
+def test_race_chart_updates_incrementally():
+    profits = np.random.default_rng(8).normal(size=(300, 4))
+    whole = RaceChart(PERSONAS, max_points=20)
+    whole.update(race_history(profits))
+
+    history = SeasonHistory(RACE_COLUMNS)
+    stepwise = RaceChart(PERSONAS, max_points=20)
+    for start in range(0, 300, 37):
+        history.append(year_type=np.zeros(len(profits[start:start + 37]), dtype=np.uint8),
+                       **{persona["name"]: profits[start:start + 37, index] for index, persona in enumerate(PERSONAS)})
+        figure = stepwise.update(history)
+
+    np.testing.assert_allclose(stepwise.totals, whole.totals)
+    np.testing.assert_array_equal(stepwise.seasons_in_lead, whole.seasons_in_lead)
+    assert stepwise.n_lead_changes == whole.n_lead_changes
+    # Thinned traces stay bounded and end at the latest season
+    assert all(len(trace.x) <= 41 and trace.x[-1] == 300 for trace in figure.data[:len(PERSONAS)])
@@ -0,0 +1,57 @@
+import json
+
+import pandas as pd
+import pytest
+
+from farming.cli import main
+from farming.simulation import PERSONAS
+
+
+@pytest.fixture
+def config_path(tmp_path, raw_params):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(raw_params))
+    return path
+
+
+@pytest.mark.parametrize("arguments, message", [
+    (["--seasons", "0"], "must be at least 1"),
+    (["--workers", "0"], "must be at least 1"),
+    (["--bad-year-probability", "1.5"], "between 0 and 1"),
+    (["--set", "insurance_premium=-5"], "must not be negative"),
+    (["--set", "unknown=1"], "expected KEY=VALUE"),
+    (["--station", "A"], "must be given together"),
+])
+def test_argument_errors(config_path, capsys, arguments, message):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--config", str(config_path), *arguments])
+    assert exit_info.value.code == 2
+    error = capsys.readouterr().err
+    assert error.startswith("usage:")
+    assert message in error
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet"])
+def test_output_formats(config_path, tmp_path, file_format):
+    output_dir = tmp_path / "results"
+    arguments = ["--config", str(config_path), "--seasons", "7", "--paths", "3", "--seed", "11",
+                 "--output-dir", str(output_dir), "--format", file_format]
+    assert main(arguments) == 0
+
+    read = pd.read_csv if file_format == "csv" else pd.read_parquet
+    summary = read(output_dir / f"summary.{file_format}")
+    seasons = read(output_dir / f"seasons.{file_format}")
+    assert summary["persona"].tolist() == [persona["name"] for persona in PERSONAS]
+    assert summary["seed"].astype(str).unique().tolist() == ["11"]
+    assert len(seasons) == 7 * 3
+    # Per-season results add up to the simulated means in the summary
+    totals = seasons.groupby("path")[[persona["name"] for persona in PERSONAS]].sum().mean()
+    assert totals.tolist() == pytest.approx(summary["mean_profit"].tolist())
+
+
+def test_same_seed_same_results(config_path, tmp_path):
+    for name in ("first", "second"):
+        main(["--config", str(config_path), "--seasons", "5", "--paths", "4", "--seed", "3",
+              "--output-dir", str(tmp_path / name), "--no-seasons"])
+    assert (tmp_path / "first" / "summary.csv").read_text() == (tmp_path / "second" / "summary.csv").read_text()
+    assert not (tmp_path / "first" / "seasons.csv").exists()
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from farming import climate
+from farming.cli import main
+from farming.climate import annual_totals, climate_return_period_options, fit_stations, station_fits
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("FARMING_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(climate, "_fit_cache", {})
+
+
+def daily_rainfall():
+    # Two stations with 20 years of four "days" each; the first has a leading zero in its ID
+    rows = []
+    for station, scale in (("007", 1.0), ("12", 2.0)):
+        for year in range(2000, 2020):
+            # Years 2000-2003 are dry: half of a normal year's rain
+            daily = 10.0 * scale * (0.5 if year < 2004 else 1.0)
+            rows.extend({"station": station, "year": year, "rainfall": daily} for _ in range(4))
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(params=["csv", "parquet"])
+def climate_file(request, tmp_path):
+    directory = tmp_path / "climate"
+    directory.mkdir()
+    path = directory / f"rainfall.{request.param}"
+    frame = daily_rainfall()
+    if request.param == "csv":
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_parquet(path, index=False)
+    return path
+
+
+def test_annual_totals_across_chunks(climate_file):
+    totals = annual_totals(climate_file, chunk_rows=7)
+    assert totals["station"].unique().tolist() == ["007", "12"]
+    assert len(totals) == 40
+    station = totals[totals["station"] == "007"].set_index("year")["value"]
+    assert station[2000] == 20.0
+    assert station[2010] == 40.0
+
+
+def test_fit_stations(climate_file):
+    fits = fit_stations(climate_file)
+    assert list(fits) == ["007", "12"]
+    fit = fits["007"]
+    assert fit.n_years == 20
+    assert np.all(np.diff(fit.values) >= 0)
+    assert sorted(fit.years[:4].tolist()) == [2000, 2001, 2002, 2003]
+    # Four of the 20 years are below 70% of the median
+    assert fit.bad_year_probability(0.7) == pytest.approx(0.2)
+    # No year is below 40% of the median, but a rarer drought is still possible
+    assert fit.bad_year_probability(0.4) == pytest.approx(1 / 21)
+
+
+def test_fits_are_cached_on_disk(climate_file, monkeypatch):
+    fits = fit_stations(climate_file)
+    monkeypatch.setattr(climate, "_fit_cache", {})
+    monkeypatch.setattr(climate, "annual_totals", lambda path: pytest.fail("the file was read again"))
+    cached = fit_stations(climate_file)
+    for station, fit in fits.items():
+        np.testing.assert_array_equal(cached[station].values, fit.values)
+        np.testing.assert_array_equal(cached[station].years, fit.years)
+
+
+def test_return_period_options_skip_unreadable_files(climate_file):
+    (climate_file.parent / "broken.csv").write_text("station,year\nA,2000\n")
+    errors = []
+    options = climate_return_period_options(0.7, directory=climate_file.parent, errors=errors)
+
+    assert [name for name, _ in errors] == ["broken.csv"]
+    assert list(options.values()) == pytest.approx([20.0, 20.0])
+    assert all(label.startswith(("Station 007,", "Station 12,")) for label in options)
+    with pytest.raises(ValueError):
+        station_fits(climate_file.parent)
+
+
+def test_cli_uses_the_station_probability(climate_file, tmp_path):
+    output_dir = tmp_path / "results"
+    arguments = ["--climate-file", str(climate_file), "--station", "007", "--seasons", "4", "--paths", "2",
+                 "--seed", "1", "--output-dir", str(output_dir), "--no-seasons"]
+    assert main(arguments) == 0
+    assert pd.read_csv(output_dir / "summary.csv")["bad_year_probability"].unique().tolist() == [0.2]
+
+
+def test_cli_rejects_unknown_stations(climate_file, capsys):
+    with pytest.raises(SystemExit):
+        main(["--climate-file", str(climate_file), "--station", "7"])
+    assert "station '7' not in" in capsys.readouterr().err
@@ -0,0 +1,42 @@
+import json
+import math
+
+import pytest
+
+from farming.config import load_config, validate_config
+
+
+def test_valid_config_keeps_only_parameters(raw_params):
+    assert validate_config({**raw_params, "unrelated": "value"}) == raw_params
+
+
+@pytest.mark.parametrize("key, value", [
+    ("insurance_premium", -1),
+    ("insurance_premium", "15"),
+    ("insurance_premium", None),
+    ("insurance_premium", True),
+    ("loan_interest_rate", math.nan),
+    ("loan_interest_rate", math.inf),
+])
+def test_invalid_values_are_rejected(raw_params, key, value):
+    with pytest.raises(ValueError, match=key):
+        validate_config({**raw_params, key: value})
+
+
+def test_missing_parameters_are_rejected(raw_params):
+    del raw_params["insurance_payout"]
+    with pytest.raises(ValueError, match="missing parameters: insurance_payout"):
+        validate_config(raw_params, source="run log")
+
+
+@pytest.mark.parametrize("raw", [[], "config", None])
+def test_non_objects_are_rejected(raw):
+    with pytest.raises(ValueError, match="^settings.json must be an object"):
+        validate_config(raw, source="settings.json")
+
+
+def test_load_config_rejects_invalid_files(tmp_path, raw_params):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({**raw_params, "insurance_premium": -5}))
+    with pytest.raises(ValueError, match="config.json parameter 'insurance_premium'"):
+        load_config(path)
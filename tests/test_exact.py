@@ -0,0 +1,45 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+from farming.exact import PERCENTILES, exact_profit_distribution, summarize_distribution
+
+
+def brute_force_distribution(normal_profit, bad_profit, n_seasons, bad_year_probability):
+    # Cumulative profit of every possible weather sequence, weighted by its probability
+    probabilities = {}
+    for sequence in itertools.product((False, True), repeat=n_seasons):
+        n_bad = sum(sequence)
+        total = sum(bad_profit if bad else normal_profit for bad in sequence)
+        weight = bad_year_probability ** n_bad * (1 - bad_year_probability) ** (n_seasons - n_bad)
+        probabilities[total] = probabilities.get(total, 0.0) + weight
+    values = np.array(sorted(probabilities))
+    return values, np.array([probabilities[value] for value in values])
+
+
+@pytest.mark.parametrize("normal_profit, bad_profit", [(70, -80), (55, 25), (-10, 40)])
+@pytest.mark.parametrize("bad_year_probability", [0.1, 0.5, 0.8])
+def test_exact_matches_enumeration(normal_profit, bad_profit, bad_year_probability):
+    n_seasons = 10
+    exact = exact_profit_distribution(normal_profit, bad_profit, n_seasons, bad_year_probability)
+    values, pmf = brute_force_distribution(normal_profit, bad_profit, n_seasons, bad_year_probability)
+    expected = summarize_distribution(n_seasons, values, pmf)
+
+    np.testing.assert_allclose(exact.values, values)
+    np.testing.assert_allclose(exact.pmf, pmf, rtol=1e-9, atol=1e-15)
+    assert exact.mean == pytest.approx(expected.mean)
+    assert exact.std == pytest.approx(expected.std)
+    assert exact.prob_loss == pytest.approx(expected.prob_loss)
+    assert exact.percentiles == {q: expected.percentiles[q] for q in PERCENTILES}
+
+
+@pytest.mark.parametrize("bad_year_probability, n_bad", [(0.0, 0), (1.0, 5)])
+def test_exact_certain_weather(bad_year_probability, n_bad):
+    distribution = exact_profit_distribution(70, -80, 5, bad_year_probability)
+    total = 70 * (5 - n_bad) - 80 * n_bad
+    assert distribution.values.tolist() == [total]
+    assert distribution.pmf.tolist() == [1.0]
+    assert distribution.std == 0
+    assert math.isclose(distribution.mean, total)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from farming.parallel import iter_unit_draws, plan_units, run_monte_carlo
+
+# Small work units, so a short run still spans several units and both workers
+CHUNK_DRAWS = 500
+
+
+@pytest.mark.parametrize("n_seasons, n_paths", [(40, 200), (1200, 3)])
+def test_workers_do_not_change_results(n_seasons, n_paths):
+    assert len(plan_units(n_paths, n_seasons, CHUNK_DRAWS)) > 2
+    serial = run_monte_carlo(0.2, n_seasons, n_paths, seed=1234, workers=1, chunk_draws=CHUNK_DRAWS)
+    parallel = run_monte_carlo(0.2, n_seasons, n_paths, seed=1234, workers=2, chunk_draws=CHUNK_DRAWS)
+
+    assert parallel.n_paths == serial.n_paths == n_paths
+    np.testing.assert_array_equal(parallel.bad_year_values, serial.bad_year_values)
+    np.testing.assert_array_equal(parallel.bad_year_counts, serial.bad_year_counts)
+
+
+def test_unit_draws_match_statistics():
+    n_seasons, n_paths = 1200, 3
+    stats = run_monte_carlo(0.2, n_seasons, n_paths, seed=99, chunk_draws=CHUNK_DRAWS)
+    bad_years = np.zeros(n_paths, dtype=np.int64)
+    for (path_start, unit_paths, _, _), is_bad in iter_unit_draws(0.2, n_seasons, n_paths, seed=99,
+                                                                   chunk_draws=CHUNK_DRAWS):
+        bad_years[path_start:path_start + unit_paths] += is_bad.sum(axis=1)
+
+    values, counts = np.unique(bad_years, return_counts=True)
+    np.testing.assert_array_equal(stats.bad_year_values, values)
+    np.testing.assert_array_equal(stats.bad_year_counts, counts)
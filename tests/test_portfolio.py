@@ -0,0 +1,65 @@
+from statistics import NormalDist
+
+import numpy as np
+import pytest
+
+from farming.portfolio import (
+    PortfolioResult, conditional_thresholds, min_years, portfolio_risk, region_sizes, simulate_portfolio
+)
+
+
+def test_region_sizes():
+    np.testing.assert_array_equal(region_sizes(23, 5), [5, 5, 5, 4, 4])
+
+
+def test_conditional_thresholds_average_to_the_bad_year_probability():
+    factors = np.random.default_rng(0).standard_normal(20_000)
+    chances = NormalDist().cdf
+    thresholds = conditional_thresholds(0.1, 0.4, factors)
+    assert np.mean([chances(value) for value in thresholds]) == pytest.approx(0.1, abs=0.005)
+
+
+def test_simulated_claims(params):
+    result = simulate_portfolio(params, 0.1, n_farms=2_000, n_years=400, correlation=0.3, n_regions=4,
+                                chunk_cells=50_000, rng=np.random.default_rng(3))
+    assert result.n_years == 400
+    assert result.premiums == 2_000 * 15
+    np.testing.assert_array_equal(result.claims, result.bad_farms * 120)
+    assert result.bad_farms.mean() / 2_000 == pytest.approx(0.1, abs=0.01)
+    # Shared regional weather spreads the yearly claims well beyond independent farms
+    assert result.claims.std() > 3 * result.independent_claims_std
+
+
+def test_no_correlation_is_binomial(params):
+    result = simulate_portfolio(params, 0.2, n_farms=1_000, n_years=2_000, correlation=0.0,
+                                rng=np.random.default_rng(4))
+    assert result.claims.std() == pytest.approx(result.independent_claims_std, rel=0.08)
+
+
+def test_certain_weather(params):
+    assert simulate_portfolio(params, 0.0, 50, 3).bad_farms.tolist() == [0, 0, 0]
+    assert simulate_portfolio(params, 1.0, 50, 3).bad_farms.tolist() == [50, 50, 50]
+
+
+def portfolio(claims):
+    claims = np.asarray(claims, dtype=float)
+    return PortfolioResult(100, 1, 0.0, 0.1, 1.0, premiums=50.0, bad_farms=claims.astype(np.int64), claims=claims)
+
+
+def test_portfolio_risk():
+    risk = portfolio_risk(portfolio(np.arange(1, 101)), confidence=0.9)
+    assert risk.value_at_risk == 90
+    assert risk.tail_value_at_risk == pytest.approx(95)
+    assert risk.expected_claims == pytest.approx(50.5)
+    assert risk.reserve == pytest.approx(45)
+    assert risk.prob_shortfall == pytest.approx(0.5)
+    assert risk.tail_years == 10
+
+
+@pytest.mark.parametrize("confidence, years", [(0.9, 100), (0.95, 200), (0.99, 1_000), (0.995, 2_000)])
+def test_min_years(confidence, years):
+    assert min_years(confidence) == years
+    assert portfolio_risk(portfolio(np.arange(years)), confidence).enough_years
+    short = portfolio_risk(portfolio(np.arange(years - 1)), confidence)
+    assert not short.enough_years
+    assert short.tail_years < 10
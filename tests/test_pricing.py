@@ -0,0 +1,37 @@
+from dataclasses import replace
+
+import pytest
+
+from farming.pricing import SCHEDULE_COLUMNS, premium_schedule
+from farming.simulation import RETURN_PERIOD_OPTIONS, persona_profits
+
+
+def test_expected_claims_are_the_break_even_premium(params):
+    row = premium_schedule(params, {"1 in 5": 20}, 0.8, 0.25)[0]
+    fair = replace(params, insurance_premium=row["Expected Claims ($)"])
+    normal, bad = persona_profits(fair)
+    expected = normal + 0.2 * (bad - normal)
+    # Insured and uninsured farmers expect the same profit for either seed type
+    assert expected[1] == pytest.approx(expected[0])
+    assert expected[3] == pytest.approx(expected[2])
+
+
+def test_premium_schedule(params):
+    rows = premium_schedule(params, RETURN_PERIOD_OPTIONS, 0.8, 0.25)
+
+    assert [row["Return Period"] for row in rows] == list(RETURN_PERIOD_OPTIONS)
+    assert tuple(rows[1]) == SCHEDULE_COLUMNS
+    assert rows[1]["Expected Claims ($)"] == 24.0  # 20% of a $120 payout
+    assert rows[1]["Target Loss Ratio Premium ($)"] == 30.0
+    assert rows[1]["Target Margin Premium ($)"] == 32.0
+    assert rows[1]["Loss Ratio at Current Premium"] == "160%"
+
+
+def test_premium_schedule_rows_are_not_shared(params):
+    premium_schedule(params, RETURN_PERIOD_OPTIONS, 0.8, 0.25)[0]["Expected Claims ($)"] = -1
+    assert premium_schedule(params, RETURN_PERIOD_OPTIONS, 0.8, 0.25)[0]["Expected Claims ($)"] == 60.0
+
+
+def test_free_insurance_has_no_loss_ratio(params):
+    rows = premium_schedule(replace(params, insurance_premium=0), {"1 in 10": 10}, 0.8, 0.25)
+    assert rows[0]["Loss Ratio at Current Premium"] == "n/a"
@@ -0,0 +1,104 @@
+import json
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from farming.replay import RaceLog, ReplayLog
+from farming.simulation import PERSONAS, persona_profit_matrix
+
+
+@pytest.fixture
+def log(params):
+    log = ReplayLog(seed=2**100 + 7)
+    log.run(params, "Traditional", False, 0.1, 25)
+    log.run(replace(params, insurance_premium=20), "High Quality", True, 0.5, 1)
+    log.run(params, "High Quality", False, 0.02, 40)
+    return log
+
+
+def assert_same_seasons(first, second):
+    for column, other in zip(first, second):
+        np.testing.assert_array_equal(column, other)
+
+
+def test_round_trip_is_bit_exact(log):
+    restored = ReplayLog.from_json(log.to_json())
+
+    assert restored.seed == log.seed
+    assert restored.events == log.events
+    assert len(restored) == len(log) == 66
+    assert_same_seasons(restored.replay(), log.replay())
+    assert_same_seasons(restored.replay(20, 30), log.replay(20, 30))
+    assert restored.to_json() == log.to_json()
+
+
+def test_round_trip_continues_the_stream(log, params):
+    restored = ReplayLog.from_json(log.to_json())
+    assert_same_seasons(
+        restored.run(params, "Traditional", True, 0.3, 10),
+        log.run(params, "Traditional", True, 0.3, 10),
+    )
+
+
+def test_rebuild_matches_replay(log):
+    history, summary = log.rebuild()
+    is_bad, revenue, costs, profit = log.replay()
+
+    assert len(history) == summary.seasons == len(log)
+    np.testing.assert_array_equal(history.column("year_type"), is_bad.astype(np.uint8))
+    np.testing.assert_array_equal(history.column("net_profit"), profit.astype(np.float32))
+    assert summary.total_profit == pytest.approx(profit.sum())
+
+
+@pytest.mark.parametrize("change", [
+    lambda data: data.update(seed=-1),
+    lambda data: data.update(events={}),
+    lambda data: data["events"][0].update(count=0),
+    lambda data: data["events"][1].update(start=0),
+    lambda data: data["events"][0].update(bad_year_probability=1.5),
+    lambda data: data["events"][0].update(seed_type="Magic"),
+    lambda data: data["events"][0].update(insurance="yes"),
+    lambda data: data["events"][0]["params"].update(insurance_payout=-1),
+    lambda data: data["events"][0].pop("params"),
+])
+def test_invalid_logs_are_rejected(log, change):
+    data = json.loads(log.to_json())
+    change(data)
+    with pytest.raises(ValueError):
+        ReplayLog.from_json(json.dumps(data))
+
+
+@pytest.mark.parametrize("start, stop", [(-1, 5), (10, 5), (3, 2)])
+def test_replay_rejects_reversed_windows(log, start, stop):
+    with pytest.raises(ValueError):
+        log.replay(start, stop)
+
+
+@pytest.mark.parametrize("start, stop", [(5, 5), (66, 80), (100, None)])
+def test_replay_of_empty_windows(log, start, stop):
+    is_bad, revenue, costs, profit = log.replay(start, stop)
+    assert len(is_bad) == len(revenue) == len(costs) == len(profit) == 0
+
+
+def test_race_log_round_trip(params):
+    race_log = RaceLog(seed=42)
+    for season, probability in enumerate([0.1, 0.2, 0.3, 0.9]):
+        is_bad, profits = race_log.run(replace(params, insurance_premium=10 + season), probability)
+        assert profits.shape == (1, len(PERSONAS))
+        np.testing.assert_array_equal(profits, persona_profit_matrix(race_log.events[-1].params, is_bad))
+
+    restored = RaceLog.from_json(race_log.to_json())
+    assert restored.events == race_log.events
+    assert_same_seasons(restored.replay(), race_log.replay())
+
+    history = restored.rebuild()
+    is_bad, profits = race_log.replay()
+    np.testing.assert_array_equal(history.column("year_type"), is_bad.astype(np.uint8))
+    for column, persona in enumerate(PERSONAS):
+        np.testing.assert_array_equal(history.column(persona["name"]), profits[:, column])
+
+
+def test_logs_of_the_other_page_are_rejected(log):
+    with pytest.raises(ValueError, match="exactly the fields"):
+        RaceLog.from_json(log.to_json())
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from farming.ruin import simulate_ruin
+
+
+def test_every_year_bad(params):
+    # Without income, uninsured farmers borrow their costs each year until debt passes the credit limit
+    result = simulate_ruin(params, 1.0, n_farmers=4, n_years=5, starting_capital=0.0)
+
+    np.testing.assert_array_equal(result.ruin_probability, [1, 0, 1, 0])
+    np.testing.assert_array_equal(result.mean_years_to_ruin[[0, 2]], [3, 2])
+    assert np.isnan(result.mean_years_to_ruin[[1, 3]]).all()
+    np.testing.assert_array_equal(result.survival[:, 0], [1, 1, 1, 0, 0, 0])
+    # Net worth is frozen at bankruptcy: two years of traditional seeds plus interest, then a third
+    expected_debt = ((80 * 1.07 + 80) * 1.07 + 80) * 1.07
+    np.testing.assert_allclose(result.final_net_worth[:, 0], -expected_debt)
+
+
+def test_no_bad_years(params):
+    result = simulate_ruin(params, 0.0, n_farmers=3, n_years=5, starting_capital=1000.0)
+
+    np.testing.assert_array_equal(result.ruin_probability, 0)
+    np.testing.assert_array_equal(result.survival, 1)
+    # With enough capital nothing is borrowed except the high-quality seed loans
+    np.testing.assert_allclose(result.final_net_worth[0], 1000 + 5 * np.array([70, 55, 221.6, 206.6]))
+
+
+def test_credit_limit(params):
+    strict = simulate_ruin(params, 1.0, n_farmers=2, n_years=5, starting_capital=0.0, credit_limit=100)
+    assert strict.mean_years_to_ruin[0] == pytest.approx(2)
+    assert strict.mean_years_to_ruin[2] == pytest.approx(1)
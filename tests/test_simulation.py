@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from farming.simulation import PERSONAS, persona_profit_matrix, season_outcomes, simulate_seasons
+
+
+@pytest.mark.parametrize("seed_type, insurance, expected", [
+    ("Traditional", False, (150, 0, 80)),
+    ("Traditional", True, (150, 120, 95)),
+    ("High Quality", False, (350, 0, 128.4)),
+    ("High Quality", True, (350, 120, 143.4)),
+])
+def test_season_outcomes(params, seed_type, insurance, expected):
+    assert season_outcomes(params, seed_type, insurance) == pytest.approx(expected)
+
+
+def test_persona_profit_matrix(params):
+    is_bad = np.array([False, True, False])
+    matrix = persona_profit_matrix(params, is_bad)
+
+    normal = [70, 55, 221.6, 206.6]
+    bad = [-80, 25, -128.4, -23.4]
+    assert matrix.shape == (3, len(PERSONAS))
+    np.testing.assert_allclose(matrix, [normal, bad, normal])
+
+
+def test_persona_profit_matrix_matches_simulate_seasons(params):
+    is_bad = np.random.default_rng(0).random(50) < 0.3
+    matrix = persona_profit_matrix(params, is_bad)
+    for index, persona in enumerate(PERSONAS):
+        _, _, profit = simulate_seasons(params, persona["seed_type"], persona["insurance"], is_bad)
+        np.testing.assert_array_equal(matrix[:, index], profit)
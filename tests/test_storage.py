@@ -0,0 +1,54 @@
+import gc
+
+import numpy as np
+import pytest
+
+from farming.storage import SpillingHistory
+
+
+def season_columns(start, stop):
+    seasons = np.arange(start, stop)
+    return {
+        "year_type": (seasons % 3 == 0).astype(np.uint8),
+        "revenue": seasons * 1.5,
+        "costs": np.full(len(seasons), 80.0),
+        "net_profit": seasons * 1.5 - 80,
+    }
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = SpillingHistory(recent_rows=10, chunk_rows=20, directory=tmp_path)
+    for start, stop in [(0, 7), (7, 8), (8, 45), (45, 75)]:
+        history.append(**season_columns(start, stop))
+    return history
+
+
+def test_old_seasons_are_spilled(history):
+    assert len(history) == 75
+    assert history.spilled_rows == 60
+    assert len(list(history.directory.glob("*.arrow"))) == 3
+
+
+def test_columns_read_back_exactly(history):
+    expected = season_columns(0, 75)
+    for name, values in expected.items():
+        np.testing.assert_array_equal(history.column(name), values.astype(history.column(name).dtype))
+        np.testing.assert_array_equal(np.concatenate(list(history.column_chunks(name))), history.column(name))
+
+
+@pytest.mark.parametrize("start, stop", [(0, 75), (15, 25), (19, 21), (55, 70), (60, 61), (70, 200), (40, 40)])
+def test_column_slice_across_chunks(history, start, stop):
+    np.testing.assert_array_equal(
+        history.column_slice("net_profit", start, stop), history.column("net_profit")[start:stop]
+    )
+
+
+def test_directory_is_removed_with_the_history(tmp_path):
+    history = SpillingHistory(recent_rows=1, chunk_rows=2, directory=tmp_path)
+    history.append(**season_columns(0, 5))
+    directory = history.directory
+    assert directory.exists()
+    del history
+    gc.collect()
+    assert not directory.exists()
@@ -0,0 +1,28 @@
+import numpy as np
+
+from farming import sweep
+from farming.sweep import run_sweep, sweep_axis
+from farming.simulation import persona_profits
+
+
+def test_sweep_matches_expected_profit(params):
+    axes = {"insurance_premium": sweep_axis("insurance_premium", 5), "loan_interest_rate": [0.0, 10.0]}
+    result = run_sweep(params, axes, bad_year_probabilities=[0.1, 0.5])
+
+    assert result.expected_profit.shape == (2, 5, 2, 4)
+    for p_index, p in enumerate(result.bad_year_probabilities):
+        for i, premium in enumerate(axes["insurance_premium"]):
+            for j, rate in enumerate(axes["loan_interest_rate"]):
+                point = type(params)(**{**params.to_dict(), "insurance_premium": premium, "loan_interest_rate": rate})
+                normal, bad = persona_profits(point)
+                np.testing.assert_allclose(result.expected_profit[p_index, i, j], normal + p * (bad - normal))
+    np.testing.assert_array_equal(result.winner, result.expected_profit.argmax(axis=-1))
+
+
+def test_process_pool_gives_the_same_grid(params, monkeypatch):
+    axes = {"traditional_seed_cost": sweep_axis("traditional_seed_cost", 9), "insurance_payout": [0.0, 120.0, 500.0]}
+    serial = run_sweep(params, axes)
+
+    monkeypatch.setattr(sweep, "POOL_THRESHOLD", 20)
+    pooled = run_sweep(params, axes, max_workers=2)
+    np.testing.assert_array_equal(pooled.expected_profit, serial.expected_profit)
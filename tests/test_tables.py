@@ -0,0 +1,31 @@
+import pytest
+
+from farming.history import SeasonHistory
+from farming.tables import page_bounds, page_count, season_history_window
+
+
+@pytest.mark.parametrize("n_rows, page, expected", [
+    (120, 1, (0, 50)),
+    (120, 3, (100, 120)),
+    (120, 4, (100, 120)),  # Past the last page: the last page is shown
+    (100, 3, (50, 100)),
+    (0, 1, (0, 0)),
+])
+def test_page_bounds(n_rows, page, expected):
+    assert page_bounds(n_rows, page, page_size=50) == expected
+
+
+def test_page_count():
+    assert [page_count(n, page_size=50) for n in (0, 1, 50, 51)] == [1, 1, 1, 2]
+
+
+def test_season_history_window():
+    history = SeasonHistory()
+    for season in range(5):
+        history.append(year_type=[season % 2], revenue=[150.0 * (season % 2 == 0)], costs=[80.0],
+                       net_profit=[150.0 * (season % 2 == 0) - 80])
+
+    window = season_history_window(history, 3, 5)
+    assert window["Farming Season"].tolist() == ["Sim 4", "Sim 5"]
+    assert window["Year Type"].tolist() == ["🌩️ Bad", "🌞 Normal"]
+    assert window["Net Profit ($)"].tolist() == [-80.0, 70.0]
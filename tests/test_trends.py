@@ -0,0 +1,76 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from farming.exact import exact_persona_distributions, poisson_binomial_distribution
+from farming.trends import (
+    ClimateTrend, expected_season_profits, leader_shares, rank_changes, trend_bad_year_distribution,
+    trend_persona_distributions, trend_profit_paths
+)
+
+
+@pytest.mark.parametrize("kind, expected", [
+    ("None", [0.1, 0.1, 0.1, 0.1, 0.1, 0.1]),
+    ("Linear", [0.1, 0.2, 0.3, 0.4, 0.4, 0.4]),
+    ("Exponential", [0.1, 0.1 * 4 ** (1 / 3), 0.1 * 4 ** (2 / 3), 0.4, 0.4, 0.4]),
+    ("Step", [0.1, 0.1, 0.1, 0.4, 0.4, 0.4]),
+])
+def test_probabilities(kind, expected):
+    np.testing.assert_allclose(ClimateTrend(0.1, 0.4, 3, kind).probabilities(0, 6), expected)
+
+
+def test_invalid_trends():
+    with pytest.raises(ValueError):
+        ClimateTrend(0.1, 1.5, 3)
+    with pytest.raises(ValueError):
+        ClimateTrend(0.1, 0.2, 0)
+    with pytest.raises(ValueError):
+        ClimateTrend(0.1, 0.2, 3, "Sideways")
+
+
+def test_poisson_binomial_matches_enumeration():
+    probabilities = [0.1, 0.5, 0.7, 0.2]
+    _, pmf = poisson_binomial_distribution(probabilities)
+    expected = np.zeros(len(probabilities) + 1)
+    for sequence in itertools.product((0, 1), repeat=len(probabilities)):
+        expected[sum(sequence)] += np.prod([p if bad else 1 - p for p, bad in zip(probabilities, sequence)])
+    np.testing.assert_allclose(pmf, expected)
+
+
+@pytest.mark.parametrize("n_seasons", [2, 5, 40])
+def test_trend_distribution_matches_the_per_season_probabilities(n_seasons):
+    trend = ClimateTrend(0.05, 0.5, 5, "Exponential")
+    k, pmf = trend_bad_year_distribution(trend, n_seasons)
+    expected_k, expected_pmf = poisson_binomial_distribution(trend.probabilities(0, n_seasons))
+    np.testing.assert_allclose(np.interp(expected_k, k, pmf, left=0, right=0), expected_pmf, atol=1e-15)
+
+
+def test_trend_odds(params):
+    trend = ClimateTrend(0.1, 0.3, 20, "Linear")
+    distributions = trend_persona_distributions(params, trend, 50)
+    expected_totals = expected_season_profits(params, trend, 50).sum(axis=0)
+    assert [distribution.mean for distribution in distributions.values()] == pytest.approx(expected_totals.tolist())
+
+    # Without a trend the odds are the constant-probability ones
+    flat = trend_persona_distributions(params, ClimateTrend(0.2, 0.2, 1, "None"), 50)
+    for name, distribution in exact_persona_distributions(params, 50, 0.2).items():
+        assert flat[name].percentiles == distribution.percentiles
+        assert flat[name].std == pytest.approx(distribution.std)
+
+
+def test_profit_paths_follow_the_expected_profits(params):
+    trend = ClimateTrend(0.1, 0.5, 10, "Step")
+    totals = trend_profit_paths(params, trend, 20_000, 15, rng=np.random.default_rng(2))
+    expected = np.cumsum(expected_season_profits(params, trend, 15), axis=0)
+    np.testing.assert_allclose(totals.mean(axis=0), expected, rtol=0.02)
+
+    shares = leader_shares(totals)
+    np.testing.assert_allclose(shares.sum(axis=1), 1)
+
+
+def test_rank_changes():
+    scores = np.array([[3, 2, 1], [3, 2, 1], [1, 2, 3], [1, 2, 3]])
+    changes = rank_changes(scores)
+    assert [season for season, _ in changes] == [2]
+    assert changes[0][1].tolist() == [2, 1, 0]
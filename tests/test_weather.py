@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from farming.simulation import RETURN_PERIOD_OPTIONS, persona_profits
+from farming.weather import NORMAL, SEVERE, longest_drought, persistent_weather, state_profits
+
+
+@pytest.mark.parametrize("label", list(RETURN_PERIOD_OPTIONS))
+@pytest.mark.parametrize("persistence, severe_share", [(0.0, 1.0), (0.5, 0.5), (0.9, 0.2)])
+def test_drought_share_matches_the_return_period(label, persistence, severe_share):
+    weather = persistent_weather(RETURN_PERIOD_OPTIONS[label] / 100, persistence, severe_share)
+    assert weather.drought_probability() == pytest.approx(RETURN_PERIOD_OPTIONS[label] / 100)
+
+
+def test_persistence_lengthens_droughts():
+    lengths = [persistent_weather(0.2, persistence).mean_drought_length() for persistence in (0.0, 0.5, 0.9)]
+    # A drought ends with probability 1 - (p + rho * (1 - p))
+    assert lengths == pytest.approx([1 / 0.8, 1 / 0.4, 1 / 0.08])
+
+
+def test_independent_severe_droughts_are_the_two_state_model(params):
+    weather = persistent_weather(0.3)
+    normal, bad = persona_profits(params)
+    profits = state_profits(params, weather)
+    np.testing.assert_allclose(profits[NORMAL], normal)
+    np.testing.assert_allclose(profits[SEVERE], bad)
+
+
+def test_sampled_paths_follow_the_chain():
+    states = persistent_weather(0.2, 0.6, 0.5).sample_paths(20_000, 30, np.random.default_rng(1))
+    assert (states != NORMAL).mean() == pytest.approx(0.2, abs=0.01)
+
+
+def test_longest_drought():
+    states = np.array([[0, 1, 2, 0, 2, 2, 2], [0, 0, 0, 0, 0, 0, 0]])
+    np.testing.assert_array_equal(longest_drought(states), [3, 0])